@@ -1,20 +1,21 @@
+import copy
+from collections import deque
 from datetime import datetime
 # from besser.BUML.metamodel.structural import (
 #     StringType, IntegerType, FloatType, TimeDeltaType
 # ) # TODO: Check if necessary (for attr type validation)
 from utils.policy_tree import PolicyNode
 from utils.exceptions import (
-    UndefinedAttributeException, DuplicateAttributeException
+    UndefinedAttributeException, DuplicateAttributeException, CyclicReferenceException
 )
+from utils.validation import report
 from utils.chp_extension import (
-    Label, PullRequest, Repository, Issue,
-    CheckCiCd, LabelCondition, MinTime, MemberLifecycle, Patch
-)
-from utils.attribute_converters import (
-    str_to_status_enum, str_to_action_enum, deadline_to_timedelta, str_to_member_action_enum
+    Label, PullRequest, Repository,
+    CheckCiCd, LabelCondition, MinTime, Patch
 )
+from utils.attribute_converters import deadline_to_timedelta
 from metamodel.governance import (
-    AppealRight, CommunicationChannel, Human, MinDecisionTime, SinglePolicy, Project, Activity, Task, Role, Individual,
+    AppealRight, CommunicationChannel, Human, MinDecisionTime, VotingPolicy, Project, Activity, Task, Role, Individual,
     Deadline, MajorityPolicy, AbsoluteMajorityPolicy, LeaderDrivenPolicy,
     ComposedPolicy, hasRole, ParticipantExclusion, LazyConsensusPolicy,
     ConsensusPolicy, MinimumParticipant, VetoRight, Agent, BooleanDecision,
@@ -22,14 +23,37 @@ from metamodel.governance import (
 )
 from .govdslParser import govdslParser
 from .govdslListener import govdslListener
+from .scope_builder import ScopeBuilder
+from .tree_index import iter_descendants
+from .ir import (
+    PolicyIR, OrderIR, DecisionIR, ParametersIR, TimeConditionIR, ParticipantExclusionIR, MinParticipantsIR,
+    VetoRightIR, AppealRightIR, CheckCiCdIR, MinTimeIR, LabelConditionIR, iter_policy_events,
+    lower_order, lower_decision, lower_participants, lower_time_condition, lower_appeal_right,
+    lower_check_ci_cd, lower_min_time, lower_label_condition, lower_parameters, lower_target
+)
 
+# Class of each single policy type, with the parameter it takes besides the SinglePolicy attributes
+_SINGLE_POLICY_CLASSES = {
+    "ConsensusPolicy": (ConsensusPolicy, "fallback"),
+    "LazyConsensusPolicy": (LazyConsensusPolicy, "fallback"),
+    "VotingPolicy": (VotingPolicy, "ratio"),
+    "MajorityPolicy": (MajorityPolicy, "ratio"),
+    "AbsoluteMajorityPolicy": (AbsoluteMajorityPolicy, "ratio"),
+    "LeaderDrivenPolicy": (LeaderDrivenPolicy, "default"),
+}
 
 
 class PolicyCreationListener(govdslListener):
     """
        This listener class generates a governance object model from a parsed DSL file.
+
+       The scopes, participants and profiles maps can be given up front (e.g., taken from a
+       previous listener with get_scopes(), get_participants() and get_profiles()) to build
+       policies against already constructed objects without walking their sections again.
+       A SymbolTable (see grammar.symbols) provides all three; explicit maps are added to it.
     """
-    def __init__(self):
+    def __init__(self, scopes: dict = None, participants: dict = None, profiles: dict = None,
+                 symbols: 'SymbolTable' = None):
         super().__init__()
         self.__policies = []
 
@@ -45,9 +69,15 @@ class PolicyCreationListener(govdslListener):
         self.__appeal_policy_map = {}
 
         # Maps to track scopes and participants predefined
-        self.__scopes_map = {}
-        self.__participants_map = {}
-        self.__profiles_map = {}
+        self.__scopes_map = dict(symbols.scopes) if symbols else {}
+        self.__participants_map = dict(symbols.participants) if symbols else {}
+        self.__profiles_map = dict(symbols.profiles) if symbols else {}
+        self.__scopes_map.update(scopes or {})
+        self.__participants_map.update(participants or {})
+        self.__profiles_map.update(profiles or {})
+        self.__scope_children = {}   # Parent scope name -> its activities or tasks
+        self.__implicit_participants = {}   # Name -> Individual standing for an undeclared vetoer, PRAuthor or RepoOwner
+        self.__shared_participants = symbols.participants if symbols else {}   # Never modified, see _own_participant
 
         # Policy tree structure
         self.policy_tree = {}  # Maps policy ID to PolicyNode
@@ -58,251 +88,201 @@ class PolicyCreationListener(govdslListener):
     def get_policies(self):
         """Policies: Retrieves the Policy instances."""
         return self.__policies
+
+    def get_scopes(self) -> dict:
+        """Scopes: Retrieves the defined scopes, by name."""
+        return self.__scopes_map
+
+    def get_scope_children(self) -> dict:
+        """Scopes: Retrieves the activities or tasks defined in each scope, by parent name."""
+        return self.__scope_children
+
+    def get_participants(self) -> dict:
+        """Participants: Retrieves the defined roles and individuals, by name."""
+        return self.__participants_map
+
+    def get_profiles(self) -> dict:
+        """Profiles: Retrieves the defined profiles, by name."""
+        return self.__profiles_map
     
     def find_descendant_nodes_by_type(self, node, target_type):
         """
-        Recursively finds and returns all descendant nodes of a specified type.
+        Finds and returns all descendant nodes of a specified type, in document order.
 
         Args:
             node: The node to search for descendants. This can be any node in the parse tree.
-            target_type: The type of node to match against. This should be a class type that 
+            target_type: The type of node to match against. This should be a class type that
                         the nodes are expected to be instances of.
 
         Returns:
-            A list of nodes that are instances of the specified target type. 
+            A list of nodes that are instances of the specified target type.
             If no matching nodes are found, an empty list is returned.
         """
-        matching_nodes = []
+        return list(iter_descendants(node, target_type))
 
-        if isinstance(node, target_type):
-            matching_nodes.append(node)
+    def iter_descendant_nodes_by_type(self, node, target_type):
+        """
+        Lazily yields the descendant nodes of a specified type, in document order. The tree is
+        walked iteratively, so arbitrarily deep trees are supported. To query the same tree for
+        several types, build a ParseTreeIndex (see grammar.tree_index) once instead.
+        """
+        return iter_descendants(node, target_type)
+    
+    def _policy_dependencies(self, node: PolicyNode, undefined: list = None) -> list:
+        """
+        Returns the nodes whose policy objects are needed to build the policy of the given node:
+        the phases of a composed policy, and the default, fallback and appeal policies of a
+        single policy.
 
-        for i in range(node.getChildCount()):
-            child = node.getChild(i)
-            matching_nodes.extend(self.find_descendant_nodes_by_type(child, target_type))
+        Args:
+            node: The node of the policy.
+            undefined: If given, the IDs of referenced policies that are not (yet) defined are
+                appended to it instead of raising.
+
+        Raises:
+            UndefinedAttributeException: If a default, fallback or appeal policy is not defined
+                (only without undefined).
+        """
+        if node.policy_type == "composed":
+            return [self.policy_tree.get(child.policy_id, child) for child in node.children]
+
+        dependencies = []
+        references = []  # (policy ID, attribute type, description of the error if it is undefined)
+        parameters = self.__policy_parameters_map.get(node.policy_id, {})
+        match node.policy_type:
+            case "ConsensusPolicy" | "LazyConsensusPolicy":
+                fallback_policy_id = parameters.get('fallback')
+                if fallback_policy_id:
+                    references.append((fallback_policy_id, "fallback",
+                                       f"fallback policy '{fallback_policy_id}' not found in policy tree."))
+            case "LeaderDrivenPolicy":
+                default_policy_id = parameters.get('default')
+                if default_policy_id:
+                    references.append((default_policy_id, "default",
+                                       f"Default policy '{default_policy_id}' not found in policy tree."))
+        for _, target_id in self.__appeal_policy_map.get(node.policy_id, []):
+            references.append((target_id, "policy", f"AppealRight references an undefined policy '{target_id}'."))
+
+        for policy_id, attribute_type, description in references:
+            if policy_id in self.policy_tree:
+                dependencies.append(self.policy_tree[policy_id])
+            elif undefined is not None:
+                undefined.append(policy_id)
+            else:
+                raise UndefinedAttributeException(attribute_type, description)
+        return dependencies
 
-        return matching_nodes
-    
     def _construct_policy_objects(self):
-        """Construct policy objects from leaves to root using the new scope propagation approach"""
-        # First identify all default policies that need to be processed first
-        default_policies = set()
-        for _, parameters in self.__policy_parameters_map.items():
-            if 'default' in parameters:
-                default_policy_id = parameters['default']
-                if default_policy_id in self.policy_tree:
-                    default_policies.add(default_policy_id)
-        
-        # Same with fallback policies
-        fallback_policies = set()
-        for _, parameters in self.__policy_parameters_map.items():
-            if 'fallback' in parameters:
-                fallback_policy_id = parameters['fallback']
-                if fallback_policy_id in self.policy_tree:
-                    fallback_policies.add(fallback_policy_id)
-        
-        # Identify leaf nodes (no children)
-        leaves = [node for node in self.policy_tree.values() if not node.children]
-                
-        # Process nodes in dependency order (defaults first, then leaves, then up the tree)
-        processed = set()
-        
-        # First process all default policies
-        to_process = [self.policy_tree[pid] for pid in default_policies if pid in self.policy_tree]
-        # Then all fallback policies
-        to_process.extend([self.policy_tree[pid] for pid in fallback_policies if pid in self.policy_tree])
-        # Then any inline appeal policies (those present in policy_tree as nested nodes)
-        appeal_inline_ids = set()
-        for _, pairs in self.__appeal_policy_map.items():
-            for _, target_id in pairs:
-                if target_id in self.policy_tree and self.policy_tree[target_id].is_nested:
-                    appeal_inline_ids.add(target_id)
-        to_process.extend([self.policy_tree[pid] for pid in appeal_inline_ids if pid in self.policy_tree])
-        
-        # Then add leaf nodes that aren't default, fallback or appeal (inline) policies
-        not_default_nor_fallback = [node for node in leaves if node.policy_id not in default_policies and node.policy_id not in fallback_policies and node.policy_id not in appeal_inline_ids]
-        to_process.extend(not_default_nor_fallback)
+        """
+        Constructs the policy objects in dependency order: each policy is built exactly once, after
+        the policies it refers to (phases, default, fallback and appeal policies). The order is a
+        topological sort of the policy tree (Kahn's algorithm), linear in the number of policies.
+
+        Raises:
+            CyclicReferenceException: If policies refer to each other in a cycle.
+        """
+        nodes = list(self.policy_tree.values())
+        dependencies = {}
+        dependents = {}
+        pending = {}
+        for node in nodes:
+            dependencies[node] = self._policy_dependencies(node)
+            pending[node] = len(dependencies[node])
+            for dependency in dependencies[node]:
+                dependents.setdefault(dependency, []).append(node)
+
+        ready = deque(node for node in nodes if pending[node] == 0)
+        built = 0
+        while ready:
+            node = ready.popleft()
+            self._construct_policy_object(node)
+            built += 1
+            for dependent in dependents.get(node, ()):
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    ready.append(dependent)
+
+        if built < len(nodes):
+            raise CyclicReferenceException(self._find_reference_cycle(dependencies, pending))
 
-        while to_process:
-            node = to_process.pop(0)
-            
-            # Skip if already processed
-            if node.policy_id in processed:
-                continue
-            
-            # Get scope 
-            scope = self.__policy_scopes_map.get(node.policy_id)
-            
-            # composed policies
-            if node.policy_type == "composed":
-                # Check if all children are processed
-                if not all(child.policy_id in processed for child in node.children):
-                    # Put back in queue and process later
-                    to_process.append(node)
-                    continue
-                
-                # Get phases (child policies) and create composed policy
-                phases = [child.policy_object for child in node.children]
-                order = self.__policy_order_map.get(node.policy_id)
-                
-                node.policy_object = ComposedPolicy(name=node.policy_id,
-                                            phases=phases,
-                                            sequential=order.get('sequential'),
-                                            require_all=order.get('require_all'),
-                                            carry_over=order.get('carry_over'),
-                                            scope=scope)
-                
-                # Scope will be automatically propagated to children by the ComposedPolicy class
-            
-            else: # single policy
-                decision_type = self.__policy_decision_type_map.get(node.policy_id)
-                channel = self.__communication_channels_map.get(node.policy_id)
-                participants = self.__policy_participants_map.get(node.policy_id, set())
-                conditions = self.__policy_conditions_map.get(node.policy_id, set())
-                base_policy = SinglePolicy(name=node.policy_id,
-                                            conditions=conditions,
-                                            participants=participants,
-                                            decision_type=decision_type,
-                                            channel=channel,
-                                            scope=scope)
-                
-                match node.policy_type:
-                    case "ConsensusPolicy":
-                        parameters = self.__policy_parameters_map.get(node.policy_id, {})
-                        fallback_policy_id = parameters.get('fallback')
-                        
-                        fallback_policy = None
-                        if fallback_policy_id:
-                            # Check if it's a root policy reference
-                            if fallback_policy_id in [n.policy_id for n in not_default_nor_fallback]:
-                                if fallback_policy_id not in processed:
-                                    # Process the referenced root policy first
-                                    continue
-                                # Find the already-processed root policy
-                                fallback_node = next(n for n in not_default_nor_fallback if n.policy_id == fallback_policy_id)
-                                default_policy = fallback_node.policy_object
-                            else:
-                                fallback_node = self.policy_tree.get(fallback_policy_id)
-                                if not fallback_node:
-                                    raise UndefinedAttributeException("fallback", 
-                                                                f"fallback policy '{fallback_policy_id}' not found in policy tree.")
-                            
-                                # If the fallback policy hasn't been processed yet, prioritize it
-                                if fallback_policy_id not in processed:
-                                    # Move the fallback policy to the front of the processing queue
-                                    to_process.insert(0, fallback_node)
-                                    # Re-add the current node to process after the fallback
-                                    to_process.append(node)
-                                    continue
-                            
-                            fallback_policy = fallback_node.policy_object
-                        node.policy_object = ConsensusPolicy.from_policy(base_policy, fallback=fallback_policy)
-                    case "LazyConsensusPolicy":
-                        parameters = self.__policy_parameters_map.get(node.policy_id, {})
-                        fallback_policy_id = parameters.get('fallback')
-                        
-                        fallback_policy = None
-                        if fallback_policy_id:
-                            # Check if it's a root policy reference
-                            if fallback_policy_id in [n.policy_id for n in not_default_nor_fallback]:
-                                if fallback_policy_id not in processed:
-                                    # Process the referenced root policy first
-                                    continue
-                                # Find the already-processed root policy
-                                fallback_node = next(n for n in not_default_nor_fallback if n.policy_id == fallback_policy_id)
-                                default_policy = fallback_node.policy_object
-                            else:
-                                fallback_node = self.policy_tree.get(fallback_policy_id)
-                                if not fallback_node:
-                                    raise UndefinedAttributeException("fallback", 
-                                                                f"fallback policy '{fallback_policy_id}' not found in policy tree.")
-                            
-                                # If the fallback policy hasn't been processed yet, prioritize it
-                                if fallback_policy_id not in processed:
-                                    # Move the fallback policy to the front of the processing queue
-                                    to_process.insert(0, fallback_node)
-                                    # Re-add the current node to process after the fallback
-                                    to_process.append(node)
-                                    continue
-                            
-                            fallback_policy = fallback_node.policy_object
-                        node.policy_object = LazyConsensusPolicy.from_policy(base_policy, fallback=fallback_policy)
-                    case "MajorityPolicy":
-                        parameters = self.__policy_parameters_map.get(node.policy_id, {})
-                        node.policy_object = MajorityPolicy.from_policy(base_policy,  
-                                                                       ratio=parameters.get('ratio'))
-                    
-                    case "AbsoluteMajorityPolicy":
-                        parameters = self.__policy_parameters_map.get(node.policy_id, {})
-                        node.policy_object = AbsoluteMajorityPolicy.from_policy(base_policy, 
-                                                                               ratio=parameters.get('ratio'))
-                    
-                    case "LeaderDrivenPolicy":
-                        parameters = self.__policy_parameters_map.get(node.policy_id, {})
-                        default_policy_id = parameters.get('default')
-                        
-                        default_policy = None
-                        if default_policy_id:
-                            # Check if it's a root policy reference
-                            if default_policy_id in [n.policy_id for n in not_default_nor_fallback]:
-                                if default_policy_id not in processed:
-                                    # Process the referenced root policy first
-                                    continue
-                                # Find the already-processed root policy
-                                default_node = next(n for n in not_default_nor_fallback if n.policy_id == default_policy_id)
-                                default_policy = default_node.policy_object
-                            else:
-                                default_node = self.policy_tree.get(default_policy_id)
-                                if not default_node:
-                                    raise UndefinedAttributeException("default", 
-                                                                f"Default policy '{default_policy_id}' not found in policy tree.")
-                        
-                                # If the default policy hasn't been processed yet, prioritize it
-                                if default_policy_id not in processed:
-                                    # Move the default policy to the front of the processing queue
-                                    to_process.insert(0, default_node)
-                                    # Re-add the current node to process after the default
-                                    to_process.append(node)
-                                    continue
-                                
-                                default_policy = default_node.policy_object
-
-                        node.policy_object = LeaderDrivenPolicy.from_policy(base_policy, default=default_policy)
-                        
-                        # Scope will be automatically propagated to inline default policy by the LeaderDrivenPolicy class. 
-                    
-                # Resolve AppealRight targets for this node (if any)
-                refs = self.__appeal_policy_map.get(node.policy_id, [])
-                if refs:
-                    requeue = False
-                    for cond_obj, target_id in refs:
-                        target_node = self.policy_tree.get(target_id)
-                        if not target_node:
-                            raise UndefinedAttributeException("policy", f"AppealRight references an undefined policy '{target_id}'.")
-                        if target_node.policy_id not in processed:
-                            # Ensure target is processed first
-                            to_process.insert(0, target_node)
-                            to_process.append(node)
-                            requeue = True
-                            break
-                        # Target is ready; attach it
-                        cond_obj.policy = target_node.policy_object
-                    if requeue:
-                        # Defer current node until target(s) are built
-                        continue
-            
-            # Mark as processed
-            processed.add(node.policy_id)
-            
-            # Add parent to processing queue if exists and not processed
-            if node.parent and node.parent.policy_id not in processed:
-                to_process.append(node.parent)
-        
         # Validate all policies to ensure scopes are set correctly
-        for node in self.policy_tree.values():
-            if hasattr(node, 'policy_object') and node.policy_object:
+        for node in nodes:
+            if node.policy_object:
                 node.policy_object.validate()
-    
+
+    @staticmethod
+    def _find_reference_cycle(dependencies: dict, pending: dict) -> list[str]:
+        """Returns the IDs of policies forming a cycle among the nodes that could not be built."""
+        node = next(n for n, count in pending.items() if count > 0)
+        path = []
+        position = {}
+        # Every unbuilt node waits on at least one unbuilt dependency, so following them must loop
+        while node not in position:
+            position[node] = len(path)
+            path.append(node)
+            node = next(d for d in dependencies[node] if pending.get(d, 0) > 0)
+        return [n.policy_id for n in path[position[node]:]] + [node.policy_id]
+
+    def _construct_policy_object(self, node: PolicyNode):
+        """Builds the policy object of a node whose dependencies are already built."""
+        # Get scope 
+        scope = self.__policy_scopes_map.get(node.policy_id)
+
+        # composed policies
+        if node.policy_type == "composed":
+            # Get phases (child policies) and create composed policy
+            phases = [child.policy_object for child in node.children]
+            order = self.__policy_order_map.get(node.policy_id)
+
+            node.policy_object = ComposedPolicy(name=node.policy_id,
+                                        phases=phases,
+                                        sequential=order.get('sequential'),
+                                        require_all=order.get('require_all'),
+                                        carry_over=order.get('carry_over'),
+                                        scope=scope)
+
+            # Scope will be automatically propagated to children by the ComposedPolicy class
+            return
+
+        # single policy
+        decision_type = self.__policy_decision_type_map.get(node.policy_id)
+        channel = self.__communication_channels_map.get(node.policy_id)
+        participants = self.__policy_participants_map.get(node.policy_id, set())
+        conditions = self.__policy_conditions_map.get(node.policy_id, set())
+        parameters = self.__policy_parameters_map.get(node.policy_id, {})
+
+        # Build the concrete policy class directly: going through a SinglePolicy and from_policy()
+        # would run every setter's validation and the scope propagation twice
+        policy_class, parameter = _SINGLE_POLICY_CLASSES[node.policy_type]
+        if parameter == "ratio":
+            argument = parameters.get("ratio")
+        else:
+            argument = self._referenced_policy_object(parameters.get(parameter))
+        # Scope is automatically propagated to inline default and fallback policies by their setters
+        node.policy_object = policy_class(name=node.policy_id,
+                                          conditions=conditions,
+                                          participants=participants,
+                                          decision_type=decision_type,
+                                          channel=channel,
+                                          scope=scope,
+                                          **{parameter: argument})
+
+        # Resolve AppealRight targets for this node (if any)
+        for cond_obj, target_id in self.__appeal_policy_map.get(node.policy_id, []):
+            cond_obj.policy = self.policy_tree[target_id].policy_object
+
+    def _release_policy_attributes(self, policy_id: str):
+        """Drops the attributes collected for a policy, once its object is built and validated."""
+        for attributes in (self.__policy_rules_map, self.__policy_scopes_map, self.__policy_participants_map,
+                           self.__policy_conditions_map, self.__policy_order_map, self.__policy_parameters_map,
+                           self.__policy_decision_type_map, self.__communication_channels_map,
+                           self.__appeal_policy_map):
+            attributes.pop(policy_id, None)
+
+    def _referenced_policy_object(self, policy_id: str):
+        """Returns the already built policy of a default or fallback reference, or None without reference."""
+        return self.policy_tree[policy_id].policy_object if policy_id else None
+
     def _current_policy_id(self) -> str:
         """
         Retrieves the policy ID of the current policy context.
@@ -397,6 +377,72 @@ class PolicyCreationListener(govdslListener):
         # Associate the participant with the current policy
         self.__policy_participants_map[current_policy_id].add(participant_obj)
 
+    def _participant(self, name: str, create: bool = False):
+        """
+        Returns the declared participant (role, individual or agent) with the given name, or None.
+        With create, an undeclared name gets an Individual instead, the same one for every
+        condition of the document that mentions it.
+        """
+        participant = self.__participants_map.get(name)
+        if participant is None and create:
+            participant = self.__implicit_participants.get(name)
+            if participant is None:
+                participant = self.__implicit_participants[name] = Individual(name=name)
+        return participant
+
+    def _own_participant(self, participant):
+        """
+        Returns the participant to modify for this document. A participant of the SymbolTable is
+        shared with other documents, so it is copied once and the copy replaces it for the rest
+        of this document. The table participants connected to it through roles (the members of a
+        role, the roles of an individual, and so on) are copied along, so that the roles of the
+        copied individuals and the members of the copied roles still point to each other.
+        The policies of the document already listing one of them are given the copy.
+        """
+        if self.__shared_participants.get(participant.name) is not participant:
+            return participant
+        copies = {}
+        pending = [participant]
+        while pending:
+            shared = pending.pop()
+            if id(shared) in copies:
+                continue
+            copies[id(shared)] = (shared, copy.copy(shared))
+            if isinstance(shared, Role):
+                pending.extend(shared.individuals or ())
+            if isinstance(shared, Individual):
+                pending.extend(shared.roles or ())
+        for shared, own in copies.values():
+            if isinstance(own, Role):
+                own.individuals = {copies[id(i)][1] if id(i) in copies else i for i in shared.individuals or ()}
+            if isinstance(own, Individual):
+                own.roles = {copies[id(r)][1] if id(r) in copies else r for r in shared.roles or ()}
+            if self.__participants_map.get(own.name) is shared:
+                self.__participants_map[own.name] = own
+        # Policies already listing one of them get the copy as well
+        for participants in self.__policy_participants_map.values():
+            for shared in [p for p in participants if id(p) in copies and copies[id(p)][0] is p]:
+                participants.discard(shared)
+                participants.add(copies[id(shared)][1])
+        return copies[id(participant)][1]
+
+    def _assign_roles(self, individual: Individual, with_role: govdslParser.WithRoleContext):
+        """Assigns the roles of a 'role : ...' attribute to an individual, and the individual to the roles."""
+        roles = set()
+        for role_id in with_role.ID():
+            role_name = role_id.getText()
+            role = self._participant(role_name)
+            if not role:
+                report(UndefinedAttributeException, "role", None, f"Role {role_name} not defined.")
+                continue
+            if not isinstance(role, Role):
+                report(UndefinedAttributeException, "role", None, f"{role_name} is not a Role.")
+                continue
+            role = self._own_participant(role)
+            roles.add(role)
+            role.individuals.add(individual)
+        individual.roles = roles
+
     def _register_condition_with_current_policy(self, condition_obj):
         """
         Registers a condition object (VotingCondition, Deadline) with the current policy.
@@ -477,356 +523,128 @@ class PolicyCreationListener(govdslListener):
         # Associate the decision type with the current policy
         self.__policy_decision_type_map[current_policy_id] = decision_obj
 
-    def enterTopLevelSinglePolicy(self, ctx:govdslParser.TopLevelSinglePolicyContext):
-        """When entering a top-level single policy, create a node"""
-        policy_id = ctx.ID().getText()
-        node = PolicyNode(policy_id, ctx.policyType().getText(), is_nested=False)
-        self.policy_tree[policy_id] = node
-        self.policy_stack.append(node)
-        
-    def enterNestedSinglePolicy(self, ctx:govdslParser.NestedSinglePolicyContext):
-        """When entering a nested single policy, create a node and establish parent-child relationship"""
-        policy_id = ctx.ID().getText()
-        node = PolicyNode(policy_id, ctx.policyType().getText(), is_nested=True)
+    def _enter_policy(self, policy_id: str, policy_type: str, nested: bool):
+        """When entering a policy, create a node; for nested policies, establish the parent-child relationship"""
+        node = PolicyNode(policy_id, policy_type, is_nested=nested)
         self.policy_tree[policy_id] = node
-        
+
         # For nested policies, always establish parent-child relationship
-        if self.policy_stack:
+        if nested and self.policy_stack:
             self.policy_stack[-1].add_child(node)
-            
+
         self.policy_stack.append(node)
-    
+        if policy_type == "composed":
+            self.composed_policy_stack.append(node)
+
+    def enterTopLevelSinglePolicy(self, ctx:govdslParser.TopLevelSinglePolicyContext):
+        self._enter_policy(ctx.ID().getText(), ctx.policyType().getText(), nested=False)
+
+    def enterNestedSinglePolicy(self, ctx:govdslParser.NestedSinglePolicyContext):
+        self._enter_policy(ctx.ID().getText(), ctx.policyType().getText(), nested=True)
+
     def enterTopLevelComposedPolicy(self, ctx:govdslParser.TopLevelComposedPolicyContext):
-        """When entering a top-level composed policy, create a node"""
-        policy_id = ctx.ID().getText()
-        node = PolicyNode(policy_id, "composed", is_nested=False)
-        self.policy_tree[policy_id] = node
-        self.policy_stack.append(node)
-        self.composed_policy_stack.append(node)
-        
+        self._enter_policy(ctx.ID().getText(), "composed", nested=False)
+
     def enterNestedComposedPolicy(self, ctx:govdslParser.NestedComposedPolicyContext):
-        """When entering a nested composed policy, create a node and establish parent-child relationship"""
-        policy_id = ctx.ID().getText()
-        node = PolicyNode(policy_id, "composed", is_nested=True)
-        self.policy_tree[policy_id] = node
-        
-        # For nested policies, always establish parent-child relationship
-        if self.policy_stack:
-            self.policy_stack[-1].add_child(node)
-            
-        self.policy_stack.append(node)
-        self.composed_policy_stack.append(node)
+        self._enter_policy(ctx.ID().getText(), "composed", nested=True)
 
     def enterOrder(self, ctx:govdslParser.OrderContext):
-        sequential = ctx.orderType().orderTypeValue().getText().lower() == "sequential"
-        require_all = ctx.orderMode().booleanValue().getText().lower() == "true"
-        carry_over = False  # Default value
-        if ctx.carryOver():
-            carry_over = ctx.carryOver().booleanValue().getText().lower() == "true"
-                
+        self._order(lower_order(ctx))
+
+    def _order(self, order: OrderIR):
         # Register with current composed policy
         current_policy_id = self.policy_stack[-1].policy_id if self.policy_stack else None
         if current_policy_id:
             self.__policy_order_map[current_policy_id] = {
-                "sequential": sequential, 
-                "require_all": require_all,
-                "carry_over": carry_over
+                "sequential": order.sequential,
+                "require_all": order.require_all,
+                "carry_over": order.carry_over
             }
         else:
             raise Exception("Handling of policy_stack is incorrect.")
 
     def enterScope(self, ctx:govdslParser.ScopeContext):
+        self._scope(ctx.ID().getText())
+
+    def _scope(self, name: str):
         try:
-            self._register_scope_with_current_policy(self.__scopes_map[ctx.ID().getText()])
+            self._register_scope_with_current_policy(self.__scopes_map[name])
         except KeyError:
-            raise UndefinedAttributeException("scope", message=f"Scope {ctx.ID().getText()} not defined.")
-
-    def enterProject(self, ctx:govdslParser.ProjectContext):
-        project_name = ctx.ID().getText()
-        project = Project(name=project_name, status=None)
-
-        if ctx.platform():
-            platform_str = ctx.platform().getText() # This will be used when we define further platforms
-            id_tokens = ctx.repoID().ID().getText()
-            repo_id = id_tokens
-            if '/' in id_tokens:
-                owner, repo = id_tokens.split('/', 1)
-                repo_id = f"{owner}/{repo}"
-            project = Repository.from_project(project=project, repo_id=repo_id)
-        if ctx.activity():
-            activities = set()
-            for act in ctx.activity():
-                activity = Activity(name=act.ID().getText(), status=None)
-                tasks = set()
-                if act.task():
-                    for t in act.task():
-                        task_name = t.ID().getText()
-                        # Extract status if present
-                        status = None
-
-                        if t.patchTask():
-                            if t.patchTask().patchTaskContent() and t.patchTask().patchTaskContent().status():
-                                status = str_to_status_enum(t.patchTask().patchTaskContent().status().statusEnum().getText())
-
-                            task = None
-                            
-                            # Handle CHP extension elements
-                            if t.patchTask().patchTaskType():
-                                task_type_str = t.patchTask().patchTaskType().getText().lower()
-                                
-                                # Create the CHP element (PullRequest or Issue)
-                                chp_element = None
-                                labels = None
-                                
-                                # Process labels if present
-                                if t.patchTask().patchTaskContent().actionWithLabels():
-                                    label_count = len(t.patchTask().patchTaskContent().actionWithLabels().labels().ID())
-                                    labels = set()
-                                    for i in range(label_count):
-                                        l_id = t.patchTask().patchTaskContent().actionWithLabels().labels().ID(i).getText()
-                                        labels.add(Label(name=l_id))
-                                
-                                # Create the appropriate CHP element based on task type
-                                if task_type_str == "pull request":
-                                    chp_element = PullRequest(name=task_name, labels=labels)
-                                elif task_type_str == "issue":
-                                    chp_element = Issue(name=task_name, labels=labels)
-                                
-                                # Extract action for Patch
-                                action = None
-                                if t.patchTask().patchTaskContent().patchAction():
-                                    action = str_to_action_enum(t.patchTask().patchTaskContent().patchAction().patchActionEnum().getText())
-                                elif t.patchTask().patchTaskContent().actionWithLabels():
-                                    action = str_to_action_enum(t.patchTask().patchTaskContent().actionWithLabels().patchAction().patchActionEnum().getText())
-                                else:
-                                    raise UndefinedAttributeException("action", "This task must have an action defined.")
-                                
-                                # Create the Patch object that references the CHP element
-                                if chp_element:
-                                    task = Patch(name=task_name, status=status, action=action, element=chp_element)
-                                else:
-                                    # Fallback if no matching CHP element type
-                                    task = Task(name=task_name, status=status)
-                        elif t.memberTask():
-                            # MemberLifecycle task
-                            action = None
-                            if t.memberTask().memberTaskContent():
-                                action = t.memberTask().memberTaskContent().memberAction().memberActionEnum().getText()
-                                action = str_to_member_action_enum(action)
-                            task = MemberLifecycle(name=task_name, status=status, action=action)
-                        else:
-                            # For regular tasks
-                            task = Task(name=task_name, status=status)
-                        task.activity = activity
-                        tasks.add(task)
-                        self.__scopes_map[task_name] = task
-                            
-                    activity.tasks = tasks
-                activity.project = project
-                activities.add(activity)
-                self.__scopes_map[activity.name] = activity
-            project.activities = activities         
-        
-        self.__scopes_map[project_name] = project
-
-    def enterActivities(self, ctx:govdslParser.ActivitiesContext):
-        activities = set()
-        for act in ctx.activity():
-            activity = Activity(name=act.ID().getText(), status=None)
-            tasks = set()
-            if act.task():
-                for t in act.task():
-                    task_name = t.ID().getText()
-                    # Extract status if present
-
-                    status = None
-                    if t.patchTask():
-                        if t.patchTask().patchTaskContent() and t.patchTask().patchTaskContent().status():
-                            status = str_to_status_enum(t.patchTask().patchTaskContent().status().statusEnum().getText())
-
-                        task = None
-                        
-                        # Handle CHP extension elements
-                        if t.patchTask().patchTaskType():
-                            task_type_str = t.patchTaskType().getText().lower()
-                            
-                            # Create the CHP element (PullRequest or Issue)
-                            chp_element = None
-                            labels = None
-                            
-                            # Process labels if present
-                            if t.patchTask().patchTaskContent().actionWithLabels():
-                                label_count = len(t.patchTask().patchTaskContent().actionWithLabels().labels().ID())
-                                labels = set()
-                                for i in range(label_count):
-                                    l_id = t.patchTask().patchTaskContent().actionWithLabels().labels().ID(i).getText()
-                                    labels.add(Label(name=l_id))
-                            
-                            # Create the appropriate CHP element based on task type
-                            if task_type_str == "pull request":
-                                chp_element = PullRequest(name=task_name, labels=labels)
-                            elif task_type_str == "issue":
-                                chp_element = Issue(name=task_name, labels=labels)
-                            
-                            # Extract action for Patch
-                            action = None
-                            if t.patchTask().patchTaskContent().patchAction():
-                                action = str_to_action_enum(t.patchTask().patchTaskContent().patchAction().patchActionEnum().getText())
-                            elif t.patchTask().patchTaskContent().actionWithLabels():
-                                action = str_to_action_enum(t.patchTask().patchTaskContent().actionWithLabels().patchAction().patchActionEnum().getText())
-                            else:
-                                raise UndefinedAttributeException("action", "This task must have an action defined.")
-                            
-                            # Create the Patch object that references the CHP element
-                            if chp_element:
-                                task = Patch(name=task_name, status=status, action=action, element=chp_element)
-                            else:
-                                # Fallback if no matching CHP element type
-                                task = Task(name=task_name, status=status)
-                    elif t.memberTask():
-                        # MemberLifecycle task
-                        action = None
-                        if t.memberTask().memberTaskContent():
-                            action = t.memberTask().memberTaskContent().memberAction().memberActionEnum().getText()
-                            action = str_to_member_action_enum(action)
-                        task = MemberLifecycle(name=task_name, status=status, action=action)
-                    else:
-                        # For regular tasks
-                        task = Task(name=task_name, status=status)
-                    task.activity = activity
-                    tasks.add(task)
-                    self.__scopes_map[task_name] = task
-                        
-                activity.tasks = tasks
-            activities.add(activity)
-            self.__scopes_map[activity.name] = activity
-
-    def enterTasks(self, ctx:govdslParser.TasksContext):
-        for t in ctx.task():
-            task_name = t.ID().getText()
-            # Extract status if present
-            status = None
-
-            if t.patchTask():
-                if t.patchTask().patchTaskContent() and t.patchTask().patchTaskContent().status():
-                    status = str_to_status_enum(t.patchTask().patchTaskContent().status().statusEnum().getText())
-
-                task = None
-                
-                # Handle CHP extension elements
-                if t.patchTask().patchTaskType():
-                    task_type_str = t.patchTask().patchTaskType().getText().lower()
-
-                    # Create the CHP element (PullRequest or Issue)
-                    chp_element = None
-                    labels = None
-                    
-                    # Process labels if present
-                    if t.patchTask().patchTaskContent().actionWithLabels():
-                        label_count = len(t.patchTask().patchTaskContent().actionWithLabels().labels().ID())
-                        labels = set()
-                        for i in range(label_count):
-                            l_id = t.patchTask().patchTaskContent().actionWithLabels().labels().ID(i).getText()
-                            labels.add(Label(name=l_id))
-
-                    # Create the appropriate CHP element based on task type
-                    if task_type_str == "pull request":
-                        chp_element = PullRequest(name=task_name, labels=labels)
-                    elif task_type_str == "issue":
-                        chp_element = Issue(name=task_name, labels=labels)
-                    
-                    # Extract action for Patch
-                    action = None
-                    if t.patchTask().patchTaskContent().patchAction():
-                        action = str_to_action_enum(t.patchTask().patchTaskContent().patchAction().patchActionEnum().getText())
-                    elif t.patchTask().patchTaskContent().actionWithLabels():
-                        action = str_to_action_enum(t.patchTask().patchTaskContent().actionWithLabels().patchAction().patchActionEnum().getText())
-                    else:
-                        raise UndefinedAttributeException("action", "This task must have an action defined.")
-                    
-                    # Create the Patch object that references the CHP element
-                    if chp_element:
-                        task = Patch(name=task_name, status=status, action=action, element=chp_element)
-                    else:
-                        # Fallback if no matching CHP element type
-                        task = Task(name=task_name, status=status)
-            elif t.memberTask():
-                # MemberLifecycle task
-                action = None
-                if t.memberTask().memberTaskContent():
-                    action = t.memberTask().memberTaskContent().memberAction().memberActionEnum().getText()
-                    action = str_to_member_action_enum(action)
-                task = MemberLifecycle(name=task_name, status=status, action=action)
-            else:
-                # For regular tasks
-                task = Task(name=task_name, status=status)
-            self.__scopes_map[task_name] = task
+            raise UndefinedAttributeException("scope", message=f"Scope {name} not defined.")
+
+    def enterScopes(self, ctx:govdslParser.ScopesContext):
+        builder = ScopeBuilder(self.__scopes_map)
+        builder.build(ctx)
+        for parent, children in builder.children.items():
+            self.__scope_children.setdefault(parent, []).extend(children)
 
     def enterCommunicationChannel(self, ctx:govdslParser.CommunicationChannelContext):
-        channel = CommunicationChannel(name=ctx.ID().getText())
+        self._channel(ctx.ID().getText())
+
+    def _channel(self, name: str):
+        channel = CommunicationChannel.intern(name=name)
         self._register_communication_channel_with_current_policy(channel)
 
     def enterPolicyParticipants(self, ctx:govdslParser.PolicyParticipantsContext):
-        participants_list = ctx.partID()
+        self._policy_participants(lower_participants(ctx))
 
-        for p in participants_list:
-            participant = self.__participants_map.get(p.ID().getText())
+    def _policy_participants(self, participants: tuple):
+        for participant_name, role_name in participants:
+            participant = self._participant(participant_name)
             if not participant:
-                raise UndefinedAttributeException("participant", message="Participant not defined.")
-            if p.hasRole():
+                report(UndefinedAttributeException, "participant", None, f"Participant {participant_name} not defined.")
+                continue
+            if role_name is not None:
                 if not isinstance(participant, Individual):
-                    raise UndefinedAttributeException("role", message="hasRole attribute can only be applied to individual.")
-                role_name = p.hasRole().ID().getText()
+                    report(UndefinedAttributeException, "role", None, "hasRole attribute can only be applied to individual.")
+                    continue
                 # Find the role object, has to be already defined
-                role_obj = self.__participants_map.get(role_name)
+                role_obj = self._participant(role_name)
                 if role_obj:
                     # Create hasRole relationship
                     current_policy_id = self.policy_stack[-1].policy_id
                     scope = self.__policy_scopes_map.get(current_policy_id)
                     if scope:
+                        participant = self._own_participant(participant)
                         role_assignment = hasRole(f"{participant.name}_{role_name}", role_obj, participant, scope)
                         participant.role_assignement = role_assignment
                     else:
-                        raise UndefinedAttributeException("scope", message="No scope defined for role assignment (Hint: Might be a parsing error).")
+                        report(UndefinedAttributeException, "scope", None, "No scope defined for role assignment (Hint: Might be a parsing error).")
+                        continue
                 else:
-                    raise UndefinedAttributeException("role", message="No role defined for this role assignment.")
+                    report(UndefinedAttributeException, "role", None, "No role defined for this role assignment.")
+                    continue
             self._register_participant_with_current_policy(participant)
-                
+
     def enterRoles(self, ctx:govdslParser.RolesContext): 
 
         for role in ctx.role():
             roleID = role.ID().getText()
             role_instance = Role(name=roleID)
-            if role.voteValue():
-                role_instance.vote_value = float(role.voteValue().FLOAT().getText())
+            vote_value = role.voteValue()
+            if vote_value:
+                role_instance.vote_value = float(vote_value.FLOAT().getText())
             self.__participants_map[roleID] = role_instance
 
     def enterIndividual(self, ctx:govdslParser.IndividualContext):
         name = ctx.ID().getText()
         individual = Human(name=name)
                 
-        if ctx.voteValue():
-            individual.vote_value = float(ctx.voteValue().FLOAT().getText())
+        vote_value = ctx.voteValue()
+        if vote_value:
+            individual.vote_value = float(vote_value.FLOAT().getText())
         
-        if ctx.withProfile():
-            profile_name = ctx.withProfile().ID().getText()
+        with_profile = ctx.withProfile()
+        if with_profile:
+            profile_name = with_profile.ID().getText()
             profile = self.__profiles_map.get(profile_name)
             if not profile:
                 raise UndefinedAttributeException("profile", message=f"Profile {profile_name} not defined.")
             individual.profile = profile
         
-        if ctx.withRole():
-            role_names = [role.getText() for role in ctx.withRole().ID()]
-            roles = set()
-            for role_name in role_names:
-                role = self.__participants_map.get(role_name)
-                if not role:
-                    raise UndefinedAttributeException("role", message=f"Role {role_name} not defined.")
-                if not isinstance(role, Role):
-                    raise UndefinedAttributeException("role", message=f"{role_name} is not a Role.")
-                roles.add(role)
-                role.individuals.add(individual)
-            individual.roles = roles
+        with_role = ctx.withRole()
+        if with_role:
+            self._assign_roles(individual, with_role)
             
         self.__participants_map[name] = individual
 
@@ -846,43 +664,43 @@ class PolicyCreationListener(govdslListener):
         for attr in ctx.profileAttr():
             if attr.gender():
                 if 'gender' in seen_attrs:
-                    raise DuplicateAttributeException("profile", profile_name, "gender")
+                    report(DuplicateAttributeException, "profile", profile_name, "gender")
                 seen_attrs.add('gender')
                 gender = attr.gender().ID().getText()
             elif attr.race():
                 if 'race' in seen_attrs:
-                    raise DuplicateAttributeException("profile", profile_name, "race")
+                    report(DuplicateAttributeException, "profile", profile_name, "race")
                 seen_attrs.add('race')
                 race = attr.race().ID().getText()
             elif attr.language():
                 if 'language' in seen_attrs:
-                    raise DuplicateAttributeException("profile", profile_name, "language")
+                    report(DuplicateAttributeException, "profile", profile_name, "language")
                 seen_attrs.add('language')
                 language = attr.language().ID().getText()
             elif attr.ethnicity():
                 if 'ethnicity' in seen_attrs:
-                    raise DuplicateAttributeException("profile", profile_name, "ethnicity")
+                    report(DuplicateAttributeException, "profile", profile_name, "ethnicity")
                 seen_attrs.add('ethnicity')
                 ethnicity = attr.ethnicity().ID().getText()
             elif attr.disability():
                 if 'disability' in seen_attrs:
-                    raise DuplicateAttributeException("profile", profile_name, "disability")
+                    report(DuplicateAttributeException, "profile", profile_name, "disability")
                 seen_attrs.add('disability')
                 disability = attr.disability().ID().getText()
             elif attr.religion():
                 if 'religion' in seen_attrs:
-                    raise DuplicateAttributeException("profile", profile_name, "religion")
+                    report(DuplicateAttributeException, "profile", profile_name, "religion")
                 seen_attrs.add('religion')
                 religion = attr.religion().ID().getText()
             elif attr.age():
                 if 'age' in seen_attrs:
-                    raise DuplicateAttributeException("profile", profile_name, "age")
+                    report(DuplicateAttributeException, "profile", profile_name, "age")
                 seen_attrs.add('age')
                 age = int(attr.age().SIGNED_INT().getText())
         # Validate that at least one attribute is provided
         if not (gender or race or language or ethnicity or disability or religion or age):
-            raise UndefinedAttributeException("profile", 
-                message=f"Profile '{profile_name}' must have at least one attribute (gender, race, language, ethnicity, disability, religion, or age)")
+            report(UndefinedAttributeException, "profile", None,
+                   f"Profile '{profile_name}' must have at least one attribute (gender, race, language, ethnicity, disability, religion, or age)")
         
         profile = Profile(name=profile_name,
                             gender=gender,
@@ -898,101 +716,115 @@ class PolicyCreationListener(govdslListener):
         name = ctx.ID().getText()
         agent = Agent(name=name)
                 
-        if ctx.voteValue():
-            agent.vote_value = float(ctx.voteValue().FLOAT().getText())
-        if ctx.confidence():
-            agent.confidence = float(ctx.confidence().FLOAT().getText())
-        if ctx.autonomyLevel():
-            agent.autonomy_level = float(ctx.autonomyLevel().FLOAT().getText())
-        if ctx.explainability():
-            agent.explainability = float(ctx.explainability().FLOAT().getText())
-        if ctx.withRole():
-            role_names = [role.getText() for role in ctx.withRole().ID()]
-            roles = set()
-            for role_name in role_names:
-                role = self.__participants_map.get(role_name)
-                if not role:
-                    raise UndefinedAttributeException("role", message=f"Role {role_name} not defined.")
-                if not isinstance(role, Role):
-                    raise UndefinedAttributeException("role", message=f"{role_name} is not a Role.")
-                roles.add(role)
-                role.individuals.add(agent)
-            agent.roles = roles
+        vote_value = ctx.voteValue()
+        if vote_value:
+            agent.vote_value = float(vote_value.FLOAT().getText())
+        confidence = ctx.confidence()
+        if confidence:
+            agent.confidence = float(confidence.FLOAT().getText())
+        autonomy_level = ctx.autonomyLevel()
+        if autonomy_level:
+            agent.autonomy_level = float(autonomy_level.FLOAT().getText())
+        explainability = ctx.explainability()
+        if explainability:
+            agent.explainability = float(explainability.FLOAT().getText())
+        with_role = ctx.withRole()
+        if with_role:
+            self._assign_roles(agent, with_role)
             
         self.__participants_map[name] = agent
 
     def enterBooleanDecision(self, ctx:govdslParser.BooleanDecisionContext):
-        decision = BooleanDecision(name="booleanDecision")
-        self._register_decision_type_with_current_policy(decision)
-    
+        self._decision(lower_decision(ctx))
+
     def enterStringList(self, ctx:govdslParser.StringListContext):
-        ids = ctx.ID()
-        string_list = set()
-        for i in ids:
-            string_list.add(i.getText())
-        decision = StringList(name="stringList", options=string_list)
-        self._register_decision_type_with_current_policy(decision)
-    
+        self._decision(lower_decision(ctx))
+
     def enterElementList(self, ctx:govdslParser.ElementListContext):
-        ids = ctx.ID()
-        element_list = set()
-        for i in ids:
-            element = self.__participants_map.get(i.getText())
-            if not element or not isinstance(element, Individual):
-                raise UndefinedAttributeException("element", message="Individual not defined.")
-            element_list.add(element)
-        decision = ElementList(name="elementList", elements=element_list)
+        self._decision(lower_decision(ctx))
+
+    def _decision(self, decision_type: DecisionIR):
+        match decision_type.kind:
+            case "strings":
+                decision = StringList(name="stringList", options=set(decision_type.options))
+            case "elements":
+                element_list = set()
+                for name in decision_type.options:
+                    element = self._participant(name)
+                    if not element or not isinstance(element, Individual):
+                        report(UndefinedAttributeException, "element", None, "Individual not defined.")
+                        continue
+                    element_list.add(element)
+                decision = ElementList(name="elementList", elements=element_list)
+            case _:
+                decision = BooleanDecision.intern(name="booleanDecision")
         self._register_decision_type_with_current_policy(decision)
 
+    @staticmethod
+    def _evaluation_mode(mode: str, default: EvaluationMode = None) -> EvaluationMode:
+        match mode:
+            case "pre":
+                return EvaluationMode.PRE
+            case "post":
+                return EvaluationMode.POST
+            case "concurrent":
+                return EvaluationMode.CONCURRENT
+        return default
+
+    def _condition(self, condition):
+        """Builds the condition of a condition IR and registers it with the current policy."""
+        match condition:
+            case TimeConditionIR():
+                self._time_condition(condition)
+            case ParticipantExclusionIR():
+                self._participant_exclusion(condition)
+            case MinParticipantsIR():
+                self._register_condition_with_current_policy(
+                    MinimumParticipant(name="minParticipantsCondition", min_participants=condition.count))
+            case VetoRightIR():
+                self._veto_right(condition)
+            case AppealRightIR():
+                self._appeal_right(condition)
+            case CheckCiCdIR():
+                self._register_condition_with_current_policy(
+                    CheckCiCd(name="checkCiCdCondition", evaluation_mode=self._evaluation_mode(condition.evaluation_mode)))
+            case MinTimeIR():
+                # TODO: We might want to check this condition is applied only on MemberLifecycle task
+                offset = deadline_to_timedelta(value=condition.amount, unit=condition.unit)
+                self._register_condition_with_current_policy(
+                    MinTime(name="minTimeCondition", evaluation_mode=self._evaluation_mode(condition.evaluation_mode),
+                            activity=condition.activity, offset=offset))
+            case LabelConditionIR():
+                self._label_condition(condition)
+
     def enterDeadline(self, ctx:govdslParser.DeadlineContext):
-        name = ctx.deadlineID().ID().getText() if ctx.deadlineID() else "deadline"
-        offset = None
-        date = None
-        
-        # Check for offset
-        if ctx.offset():
-            amount = int(ctx.offset().SIGNED_INT().getText())
-            time_unit = ctx.offset().timeUnit().getText()
-            offset = deadline_to_timedelta(value=amount, unit=time_unit)
-        
-        # Check for date
-        if ctx.date():
-            day = int(ctx.date().SIGNED_INT(0).getText())    # First SIGNED_INT is day
-            month = int(ctx.date().SIGNED_INT(1).getText())  # Second SIGNED_INT is month
-            year = int(ctx.date().SIGNED_INT(2).getText())   # Third SIGNED_INT is year
-            date = datetime(year=year, month=month, day=day)
-        
-        deadline = Deadline(name=name, offset=offset, date=date)
-        self._register_condition_with_current_policy(deadline)
-        
+        self._condition(lower_time_condition(ctx))
+
     def enterMinDecisionTime(self, ctx:govdslParser.MinDecisionTimeContext):
-        name = ctx.ID().getText() if ctx.ID() else "minDecisionTime"
+        self._condition(lower_time_condition(ctx))
+
+    def _time_condition(self, condition: TimeConditionIR):
         offset = None
         date = None
-
-        # Check for offset
-        if ctx.offset():
-            amount = int(ctx.offset().SIGNED_INT().getText())
-            time_unit = ctx.offset().timeUnit().getText()
-            offset = deadline_to_timedelta(value=amount, unit=time_unit)
-
-        # Check for date
-        if ctx.date():
-            day = int(ctx.date().SIGNED_INT(0).getText())    # First SIGNED_INT is day
-            month = int(ctx.date().SIGNED_INT(1).getText())  # Second SIGNED_INT is month
-            year = int(ctx.date().SIGNED_INT(2).getText())   # Third SIGNED_INT is year
+        if condition.amount is not None:
+            offset = deadline_to_timedelta(value=condition.amount, unit=condition.unit)
+        if condition.date is not None:
+            day, month, year = condition.date    # DD/MM/YYYY
             date = datetime(year=year, month=month, day=day)
 
-        min_decision_time = MinDecisionTime(name=name, offset=offset, date=date)
-        self._register_condition_with_current_policy(min_decision_time)
+        condition_class = Deadline if condition.kind == "deadline" else MinDecisionTime
+        self._register_condition_with_current_policy(condition_class(name=condition.name, offset=offset, date=date))
+
+    def enterParticipantExclusion(self, ctx:govdslParser.ParticipantExclusionContext):
+        self._condition(ParticipantExclusionIR(tuple(e.getText() for e in ctx.ID())))
 
-    def enterParticipantExclusion(self, ctx:govdslParser.ParticipantExclusionContext):        
-        excluded_ids = [e.getText() for e in ctx.ID()]
+    def _participant_exclusion(self, condition: ParticipantExclusionIR):
+        excluded_ids = condition.names
         scope = self._get_current_policy_scope()
         if scope is None:
-            raise UndefinedAttributeException("scope", 
+            raise UndefinedAttributeException("scope",
                                               message="No scope defined for policy of ParticipantExclusion (check parsing order).")
-        
+
         if "PRAuthor" in excluded_ids:
             if not isinstance(scope, Patch) or not isinstance(getattr(scope, "element", None), PullRequest):
                 raise UndefinedAttributeException(
@@ -1006,96 +838,78 @@ class PolicyCreationListener(govdslListener):
                     "ParticipantExclusion",
                     message="Constraint violation: RepoOwner only valid when policy scope is associated with a Repository, now: {}.".format(type(scope).__name__)
                 )
-        
+
         excluded_set = set()
         for excluded_name in excluded_ids:
-            participant = self.__participants_map.get(excluded_name)
-            if participant:
-                excluded_set.add(participant)
-                continue
             # We create an Individual if complies with default values, for now:
             # PRAuthor, RepoOwner
-            if excluded_name in ["PRAuthor", "RepoOwner"]:
-                excluded_set.add(Individual(name=excluded_name))
+            participant = self._participant(excluded_name, create=excluded_name in ("PRAuthor", "RepoOwner"))
+            if participant:
+                excluded_set.add(participant)
             else:
-                raise UndefinedAttributeException("participant",
-                                                    message="Participant {} not defined. Default values allowed: PRAuthor, RepoOwner".format(excluded_name))
+                report(UndefinedAttributeException, "participant", None,
+                       "Participant {} not defined. Default values allowed: PRAuthor, RepoOwner".format(excluded_name))
 
         # we just put a name by default
         cond = ParticipantExclusion(name="partExcl", excluded=excluded_set)
         self._register_condition_with_current_policy(cond)
 
     def enterMinParticipant(self, ctx:govdslParser.MinParticipantContext):
-        min_participants_value = int(ctx.SIGNED_INT().getText())
-        condition = MinimumParticipant(name="minParticipantsCondition",
-                                    min_participants=min_participants_value)
-        self._register_condition_with_current_policy(condition)
+        self._condition(MinParticipantsIR(int(ctx.SIGNED_INT().getText())))
 
     def enterVetoRight(self, ctx:govdslParser.VetoRightContext):
-        
-        vetoer_obj = set()
-        # Vetoers might not be participants of the current policy
-        for v in ctx.ID():
-            # Check if the vetoer is already registered
-            vetoer_name = v.getText()
-            vetoer = None
-            if vetoer_name in self.__policy_participants_map:
-                # Get the existing participant object
-                vetoer = next(p for p in self.__policy_participants_map if p.name == vetoer_name)
-            else:
-                # We create a Individual by default
-                vetoer = Individual(name=vetoer_name)
-            vetoer_obj.add(vetoer)
-        
+        self._condition(VetoRightIR(tuple(v.getText() for v in ctx.ID())))
+
+    def _veto_right(self, condition: VetoRightIR):
+        # Vetoers might not be participants of the current policy, nor declared at all:
+        # undeclared vetoers are Individuals created by default
+        vetoer_obj = {self._participant(name, create=True) for name in condition.names}
+
         # Create the VetoRight object
         veto_right_obj = VetoRight(name="VetoRightCondition", vetoers=vetoer_obj)
-        
+
         # Register with current policy
         self._register_condition_with_current_policy(veto_right_obj)
 
     def enterAppealRight(self, ctx:govdslParser.AppealRightContext):
-        
+        self._condition(lower_appeal_right(ctx))
+
+    def _appeal_right(self, condition: AppealRightIR):
         # Ensure we’re inside a policy
         if not self.policy_stack:
             raise RuntimeError("Attempting to access policy stack, but it is empty.")
         current_policy_id = self.policy_stack[-1].policy_id
 
         # Exclude the policyReference ID (if present) from appealer IDs
-        ref_id_text = ctx.policyReference().ID().getText() if ctx.policyReference() else None
+        ref_id_text = condition.policy if isinstance(condition.policy, str) else None
         appealers_set = set()
 
-        for a in ctx.ID():
+        for appealer_name in condition.appealers:
             # Appealers must be declared in the participants block
-            appealer_name = a.getText()
             # Can it happen that the policyReference ID is captured here? If so, we skip it.
             if ref_id_text and appealer_name == ref_id_text:
                 continue
-            appealer = self.__participants_map.get(appealer_name)
+            appealer = self._participant(appealer_name)
             if not appealer:
-                raise UndefinedAttributeException("participant", message="Participant {} not defined.".format(appealer_name))
+                report(UndefinedAttributeException, "participant", None, "Participant {} not defined.".format(appealer_name))
+                continue
             appealers_set.add(appealer)
 
         # Create the AppealRight (policy resolved later in _construct_policy_objects)
         appeal_right_obj = AppealRight(name="AppealRightCondition", appealers=appealers_set, policy=None)
         self._register_condition_with_current_policy(appeal_right_obj)
-        
+
         # Determine target policy (reference or inline)
         target_policy_id = None
-        policy_type = None
 
-        if ctx.policyReference():
+        if ref_id_text:
             target_policy_id = ref_id_text
-        elif ctx.nestedPolicy():
-            if ctx.nestedPolicy().nestedSinglePolicy():
-                target_policy_id = ctx.nestedPolicy().nestedSinglePolicy().ID().getText()
-                policy_type = ctx.nestedPolicy().nestedSinglePolicy().policyType().getText()
-            elif ctx.nestedPolicy().nestedComposedPolicy():
-                target_policy_id = ctx.nestedPolicy().nestedComposedPolicy().ID().getText()
-                policy_type = "composed"
+        elif condition.policy is not None:
+            target_policy_id = condition.policy.name
 
             # Create a node for this inline (nested) appeal policy (scope inheritance)
-            if target_policy_id and target_policy_id not in self.policy_tree:
-                node = PolicyNode(target_policy_id, policy_type, is_nested=True)
+            if target_policy_id not in self.policy_tree:
+                node = PolicyNode(target_policy_id, condition.policy.kind, is_nested=True)
                 self.policy_tree[target_policy_id] = node
                 self.referenced_policies.add(target_policy_id)
                 parent_node = self.policy_stack[-1]
@@ -1109,193 +923,84 @@ class PolicyCreationListener(govdslListener):
             self.__appeal_policy_map.setdefault(current_policy_id, []).append((appeal_right_obj, target_policy_id))
 
     def enterCheckCiCd(self, ctx:govdslParser.CheckCiCdContext):
-        
-        if ctx.booleanValue().getText().lower() == "true":
-            evaluation_mode = None
-            if ctx.evaluationMode():
-                evaluation_mode = ctx.evaluationMode().getText()
-                match evaluation_mode:
-                    case "pre":
-                        evaluation_mode = EvaluationMode.PRE
-                    case "post":
-                        evaluation_mode = EvaluationMode.POST
-                    case "concurrent":
-                        evaluation_mode = EvaluationMode.CONCURRENT
-            # Create the CheckCiCd object
-            test_condition = CheckCiCd(name="checkCiCdCondition", evaluation_mode=evaluation_mode)
-            self._register_condition_with_current_policy(test_condition)
+        condition = lower_check_ci_cd(ctx)
+        if condition is not None:
+            self._condition(condition)
 
     def enterMinTime(self, ctx:govdslParser.MinTimeContext):
-        # TODO: We might want to check this condition is applied only on MemberLifecycle task
-        offset_amount = int(ctx.offset().SIGNED_INT().getText())
-        time_unit = ctx.offset().timeUnit().getText()
-        offset = deadline_to_timedelta(value=offset_amount, unit=time_unit)
-
-        evaluation_mode = None
-        if ctx.evaluationMode():
-            evaluation_mode = ctx.evaluationMode().getText()
-            match evaluation_mode:
-                case "pre":
-                    evaluation_mode = EvaluationMode.PRE
-                case "post":
-                    evaluation_mode = EvaluationMode.POST
-                case "concurrent":
-                    evaluation_mode = EvaluationMode.CONCURRENT
-
-        act_bool = True if ctx.activityBool().getText() == "Activity" else False
-
-        min_time_condition = MinTime(name="minTimeCondition", evaluation_mode=evaluation_mode, activity=act_bool,  offset=offset)
-        self._register_condition_with_current_policy(min_time_condition)
+        self._condition(lower_min_time(ctx))
 
     def enterLabelsCondition(self, ctx:govdslParser.LabelsConditionContext):
+        self._condition(lower_label_condition(ctx))
+
+    def _label_condition(self, condition: LabelConditionIR):
+        labels = {Label.intern(name=name) for name in condition.labels}
+        evaluation_mode = self._evaluation_mode(condition.evaluation_mode, EvaluationMode.CONCURRENT)
 
-        evaluation_mode = EvaluationMode.CONCURRENT
-        if ctx.evaluationMode():
-            ev_mode = ctx.evaluationMode().getText()
-            match ev_mode:
-                case "pre":
-                    evaluation_mode = EvaluationMode.PRE
-                case "post":
-                    evaluation_mode = EvaluationMode.POST
-                case "concurrent":
-                    evaluation_mode = EvaluationMode.CONCURRENT
-
-        labels = set()
-        for l in ctx.ID():
-            label = Label(name=l.getText())
-            labels.add(label)
-        
-        # Check if inclusion is specified
-        inclusion = True
-        if ctx.include():
-            inclusion = ctx.include().getText().lower() == "include"
-        
         # Create the LabelCondition object
-        label_condition = LabelCondition(name="labelCondition", evaluation_mode=evaluation_mode, labels=labels, inclusion=inclusion)
-        
+        label_condition = LabelCondition(name="labelCondition", evaluation_mode=evaluation_mode, labels=labels,
+                                         inclusion=condition.include)
+
         # Register with current policy
         self._register_condition_with_current_policy(label_condition)
 
     def enterParameters(self, ctx:govdslParser.ParametersContext):
+        self._parameters(lower_parameters(ctx))
+
+    def _parameters(self, parameters: ParametersIR):
         # Get the current policy context
         current_policy_id = self._current_policy_id()
-        
+
         # Initialize the parameters map for this policy if needed
         if current_policy_id not in self.__policy_parameters_map:
             self.__policy_parameters_map[current_policy_id] = {}
-        
-        # Extract voting parameters if present
-        if ctx.votParams():
-            vot_params = ctx.votParams()
-            
-            # I had here minVotes. Since we created the minParticipants condition, it is no longer necessary.
-            # However, I keep this structure for if we want to add more parameters in the future.
-            
-            # Extract ratio if present
-            if vot_params.ratio():
-                self.__policy_parameters_map[current_policy_id]['ratio'] = float(vot_params.ratio().FLOAT().getText())
-        
-        # Extract default policy if present (for LeaderDrivenPolicy)
-        if ctx.default():
-            default_ctx = None
-            if ctx.default().nestedPolicy():
-                if ctx.default().nestedPolicy().nestedSinglePolicy():
-                    default_ctx = ctx.default().nestedPolicy().nestedSinglePolicy().ID().getText()
-                elif ctx.default().nestedPolicy().nestedComposedPolicy():
-                    default_ctx = ctx.default().nestedPolicy().nestedComposedPolicy().ID().getText()
-            elif ctx.default().policyReference():
-                default_ctx = ctx.default().policyReference().ID().getText()
-            self.__policy_parameters_map[current_policy_id]['default'] = default_ctx
-
-        # Extract fallback policy if present (for ConsensusPolicy)
-        if ctx.fallback():
-            fallback_ctx = None
-            if ctx.fallback().nestedPolicy():
-                if ctx.fallback().nestedPolicy().nestedSinglePolicy():
-                    fallback_ctx = ctx.fallback().nestedPolicy().nestedSinglePolicy().ID().getText()
-                elif ctx.fallback().nestedPolicy().nestedComposedPolicy():
-                    fallback_ctx = ctx.fallback().nestedPolicy().nestedComposedPolicy().ID().getText()
-            elif ctx.fallback().policyReference():
-                fallback_ctx = ctx.fallback().policyReference().ID().getText()
-            self.__policy_parameters_map[current_policy_id]['fallback'] = fallback_ctx
+
+        # I had here minVotes. Since we created the minParticipants condition, it is no longer necessary.
+        # However, I keep this structure for if we want to add more parameters in the future.
+        if parameters.ratio is not None:
+            self.__policy_parameters_map[current_policy_id]['ratio'] = parameters.ratio
+
+        # Default policy (for LeaderDrivenPolicy) and fallback policy (for ConsensusPolicy), inline or by reference
+        for name in ("default", "fallback"):
+            target = getattr(parameters, name)
+            if target is not None:
+                self.__policy_parameters_map[current_policy_id][name] = target if isinstance(target, str) else target.name
 
     def enterDefault(self, ctx:govdslParser.DefaultContext):
-        # Only for inline policies
-        if ctx.policyReference():
-            return
-        # Get the current policy context (the LeaderDrivenPolicy)
-        if not self.policy_stack:
-            raise RuntimeError("Attempting to access policy stack, but it is empty.")
-        
-        # Extract the default policy ID
-        default_policy_id = None
-        policy_type = None
-        if ctx.nestedPolicy().nestedSinglePolicy():
-            default_policy_id = ctx.nestedPolicy().nestedSinglePolicy().ID().getText()
-            policy_type = ctx.nestedPolicy().nestedSinglePolicy().policyType().getText()
-        elif ctx.nestedPolicy().nestedComposedPolicy():
-            default_policy_id = ctx.nestedPolicy().nestedComposedPolicy().ID().getText()
-            policy_type = "composed"
-        
-        # Create a node for this default policy
-        if default_policy_id and default_policy_id not in self.policy_tree:
-            # Create the default policy node with is_nested=True to ensure scope inheritance
-            node = PolicyNode(default_policy_id, policy_type, is_nested=True)
-            # Add the is_default attribute to distinguish from phases
-            node.is_default = True
-            self.policy_tree[default_policy_id] = node
-            
-            # Mark this policy as referenced so it's not considered a root policy
-            self.referenced_policies.add(default_policy_id)
-            
-            # Set up parent-child relationship with the current policy
-            if self.policy_stack:
-                current_policy = self.policy_stack[-1]
-                current_policy.add_child(node)
-                
-                # Share the scope from parent to default policy
-                if current_policy.policy_id in self.__policy_scopes_map:
-                    parent_scope = self.__policy_scopes_map[current_policy.policy_id]
-                    self.__policy_scopes_map[default_policy_id] = parent_scope
-    
+        self._inline_parameter_policy(lower_target(ctx), "default")
+
     def enterFallback(self, ctx:govdslParser.FallbackContext):
+        self._inline_parameter_policy(lower_target(ctx), "fallback")
+
+    def _inline_parameter_policy(self, target: 'PolicyIR | str', parameter: str):
+        """Creates the node of an inline default or fallback policy (nothing to do for references)."""
         # Only for inline policies
-        if ctx.policyReference():
+        if target is None or isinstance(target, str):
             return
-        # Get the current policy context (the ConsensusPolicy)
+        # Get the current policy context (the LeaderDrivenPolicy or ConsensusPolicy)
         if not self.policy_stack:
             raise RuntimeError("Attempting to access policy stack, but it is empty.")
-        
-        # Extract the default policy ID
-        fallback_policy_id = None
-        policy_type = None
-        if ctx.nestedPolicy().nestedSinglePolicy():
-            fallback_policy_id = ctx.nestedPolicy().nestedSinglePolicy().ID().getText()
-            policy_type = ctx.nestedPolicy().nestedSinglePolicy().policyType().getText()
-        elif ctx.nestedPolicy().nestedComposedPolicy():
-            fallback_policy_id = ctx.nestedPolicy().nestedComposedPolicy().ID().getText()
-            policy_type = "composed"
-        
-        # Create a node for this fallback policy
-        if fallback_policy_id and fallback_policy_id not in self.policy_tree:
-            # Create the fallback policy node with is_nested=True to ensure scope inheritance
-            node = PolicyNode(fallback_policy_id, policy_type, is_nested=True)
-            # Add the fallback attribute to distinguish from phases
-            node.is_fallback = True
-            self.policy_tree[fallback_policy_id] = node
-            
+
+        # Create a node for this default or fallback policy
+        if target.name not in self.policy_tree:
+            # Create the policy node with is_nested=True to ensure scope inheritance
+            node = PolicyNode(target.name, target.kind, is_nested=True)
+            # Add the is_default or is_fallback attribute to distinguish from phases
+            node.is_default = parameter == "default"
+            node.is_fallback = parameter == "fallback"
+            self.policy_tree[target.name] = node
+
             # Mark this policy as referenced so it's not considered a root policy
-            self.referenced_policies.add(fallback_policy_id)
-            
+            self.referenced_policies.add(target.name)
+
             # Set up parent-child relationship with the current policy
-            if self.policy_stack:
-                current_policy = self.policy_stack[-1]
-                current_policy.add_child(node)
-                
-                # Share the scope from parent to default policy
-                if current_policy.policy_id in self.__policy_scopes_map:
-                    parent_scope = self.__policy_scopes_map[current_policy.policy_id]
-                    self.__policy_scopes_map[fallback_policy_id] = parent_scope
+            current_policy = self.policy_stack[-1]
+            current_policy.add_child(node)
+
+            # Share the scope from parent to default policy
+            if current_policy.policy_id in self.__policy_scopes_map:
+                parent_scope = self.__policy_scopes_map[current_policy.policy_id]
+                self.__policy_scopes_map[target.name] = parent_scope
 
     def exitGovernance(self, ctx:govdslParser.GovernanceContext):
         """When exiting the governance context, construct the policy tree"""
@@ -1314,20 +1019,48 @@ class PolicyCreationListener(govdslListener):
         if len(self.__policies) < len(root_policy_nodes):
             raise Exception("Some policies were not constructed correctly. Check the policy tree.")
     
+    def _exit_policy(self, composed: bool, nested: bool):
+        """When exiting a policy, pop it from the stacks (top-level composed policies stay on the policy stack)"""
+        if composed:
+            self.composed_policy_stack.pop()
+        if nested or not composed:
+            self.policy_stack.pop()
+
     def exitNestedSinglePolicy(self, ctx:govdslParser.NestedSinglePolicyContext):
-        """When exiting a nested single policy, pop from stack"""
-        self.policy_stack.pop()
+        self._exit_policy(composed=False, nested=True)
 
     def exitNestedComposedPolicy(self, ctx:govdslParser.NestedComposedPolicyContext):
-        """When exiting a nested composed policy, clear current and pop stack"""
-        self.composed_policy_stack.pop()
-        self.policy_stack.pop()
+        self._exit_policy(composed=True, nested=True)
 
     def exitTopLevelSinglePolicy(self, ctx:govdslParser.TopLevelSinglePolicyContext):
-        """When exiting a top-level single policy, pop from stack"""
-        self.policy_stack.pop()
+        self._exit_policy(composed=False, nested=False)
 
     def exitTopLevelComposedPolicy(self, ctx:govdslParser.TopLevelComposedPolicyContext):
-        """When exiting a top-level composed policy, clear current and pop stack"""
-        self.composed_policy_stack.pop()
-        self.policy_stack.pop()
\ No newline at end of file
+        self._exit_policy(composed=True, nested=False)
+
+    def build_ir(self, policies: list[PolicyIR]) -> list:
+        """
+        Builds the policies of a document from their IR (see grammar.ir) instead of a parse tree,
+        and returns the root policies. The scopes and participants they refer to must be known
+        already (given to the constructor, or built from the Scopes and Participants sections).
+        The handlers run in the same order as when walking the parse tree, so the objects and
+        errors are the same.
+        """
+        handlers = {
+            "enter": lambda policy: self._enter_policy(policy.name, policy.kind, policy.nested),
+            "exit": lambda policy: self._exit_policy(policy.composed, policy.nested),
+            "scope": self._scope,
+            "order": self._order,
+            "decision": self._decision,
+            "participants": self._policy_participants,
+            "channel": self._channel,
+            "condition": self._condition,
+            "parameters": self._parameters,
+            "default": lambda target: self._inline_parameter_policy(target, "default"),
+            "fallback": lambda target: self._inline_parameter_policy(target, "fallback"),
+        }
+        for policy in policies:
+            for event, value in iter_policy_events(policy):
+                handlers[event](value)
+        self.exitGovernance(None)
+        return self.get_policies()
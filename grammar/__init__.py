@@ -1,4 +1,19 @@
 from .PolicyCreationListener import *
+from .policy_builder import *
 from .govdslListener import *
 from .govdslLexer import *
-from .govdslParser import *
\ No newline at end of file
+from .fast_lexer import *
+from .govdslParser import *
+from .parsing import *
+from .batch import *
+from .incremental import *
+from .streaming import *
+from .diagnostics import *
+from .symbols import *
+from .tree_index import *
+from .ir import *
+from .modules import *
+from .dfa_cache import *
+from .result_cache import *
+from .scope_index import *
+from .model import *
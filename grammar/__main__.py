@@ -0,0 +1,4 @@
+import sys
+from .batch import batch_cli
+
+sys.exit(batch_cli())
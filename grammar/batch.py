@@ -0,0 +1,128 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Iterable, Iterator
+from .parsing import get_default_pool, parse_governance
+from .streaming import parse_with_diagnostics
+
+
+class DocumentResult:
+    """
+    Outcome of parsing one document of a batch: either its root policies, or the type and
+    message of the error that prevented building them (policies is then None). When every
+    error is collected, policies are those that could be built, and diagnostics lists the errors.
+    """
+    def __init__(self, index: int, path: str = None, policies: list = None,
+                 error_type: str = None, error_message: str = None, diagnostics: list = None):
+        self.index = index
+        self.path = path
+        self.policies = policies
+        self.error_type = error_type
+        self.error_message = error_message
+        self.diagnostics = diagnostics or []
+
+    @property
+    def ok(self) -> bool:
+        return self.error_type is None and not self.diagnostics
+
+    @property
+    def name(self) -> str:
+        """The document path, or its position in the batch when it was given as text."""
+        return self.path if self.path is not None else f"<document {self.index}>"
+
+    def __str__(self):
+        if self.diagnostics:
+            return f"{self.name}: {len(self.diagnostics)} errors" + "".join(f"\n    {d}" for d in self.diagnostics)
+        if self.ok:
+            return f"{self.name}: {len(self.policies)} policies ({', '.join(p.name for p in self.policies)})"
+        return f"{self.name}: {self.error_type}: {self.error_message}"
+
+
+def _init_worker():
+    # Build and warm the worker's parser pool once, before it receives any document
+    get_default_pool()
+
+def _parse_chunk(chunk: list, two_stage: bool, fast_lexer: bool, all_errors: bool) -> list[DocumentResult]:
+    results = []
+    for index, source in chunk:
+        path = os.fspath(source) if isinstance(source, os.PathLike) else None
+        if all_errors:
+            policies, diagnostics = parse_with_diagnostics(source, two_stage=two_stage, fast_lexer=fast_lexer)
+            results.append(DocumentResult(index, path, policies=policies, diagnostics=diagnostics))
+            continue
+        try:
+            policies = parse_governance(source, two_stage=two_stage, fast_lexer=fast_lexer)
+        except Exception as e:
+            # Exceptions of the metamodel do not all survive pickling, so only their description is sent back
+            results.append(DocumentResult(index, path, error_type=type(e).__name__, error_message=str(e)))
+        else:
+            results.append(DocumentResult(index, path, policies=policies))
+    return results
+
+def parse_batch(sources: Iterable[str | os.PathLike], workers: int = None, chunk_size: int = 1,
+                two_stage: bool = True, fast_lexer: bool = False, all_errors: bool = False) -> Iterator[DocumentResult]:
+    """
+    Parses many governance documents across a pool of worker processes.
+
+    Each worker warms up its own parser once (and loads the DFA cache named by GOVDSL_DFA_CACHE,
+    if set). Paths are read by the workers, so only their name is sent to them.
+
+    Args:
+        sources: DSL texts and/or paths (pathlib.Path / os.PathLike) to .gov files.
+        workers: Number of worker processes. Defaults to the number of CPUs.
+        chunk_size: Number of documents sent to a worker at once. Larger chunks lower the
+            inter-process overhead for many small documents.
+        two_stage: Whether to use the two-stage SLL/LL parse.
+        fast_lexer: Whether to tokenize with govdslFastLexer.
+        all_errors: Whether to collect every error of each document (see parse_with_diagnostics)
+            instead of stopping at the first one.
+
+    Returns:
+        An iterator over one DocumentResult per source, in completion order. DocumentResult.index
+        gives the position of the document in sources.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, but got {chunk_size}.")
+    documents = list(enumerate(sources))
+    chunks = [documents[i:i + chunk_size] for i in range(0, len(documents), chunk_size)]
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+    try:
+        futures = [executor.submit(_parse_chunk, chunk, two_stage, fast_lexer, all_errors) for chunk in chunks]
+        for future in as_completed(futures):
+            yield from future.result()
+    finally:
+        # Do not parse the remaining documents if the caller stops iterating early
+        executor.shutdown(cancel_futures=True)
+
+
+def _collect_paths(paths: list[str]) -> list[Path]:
+    """Expands directories into the .gov files they contain."""
+    collected = []
+    for path in map(Path, paths):
+        collected.extend(sorted(path.rglob("*.gov")) if path.is_dir() else [path])
+    return collected
+
+def batch_cli(argv: list[str] = None) -> int:
+    """Command line entry point of `python -m grammar`. Returns 1 if any document failed."""
+    arg_parser = argparse.ArgumentParser(
+        prog="python -m grammar",
+        description="Parse governance documents in parallel and report their policies or errors.")
+    arg_parser.add_argument("paths", nargs="+", help=".gov files, or directories to search for them")
+    arg_parser.add_argument("-w", "--workers", type=int, default=None,
+                            help="number of worker processes (default: number of CPUs)")
+    arg_parser.add_argument("-c", "--chunk-size", type=int, default=1,
+                            help="documents sent to a worker at once (default: 1)")
+    arg_parser.add_argument("--ll-only", action="store_true", help="always parse with full LL prediction")
+    arg_parser.add_argument("--fast-lexer", action="store_true", help="tokenize with the hand-written lexer")
+    arg_parser.add_argument("--all-errors", action="store_true",
+                            help="report every error of each document instead of the first one")
+    args = arg_parser.parse_args(argv)
+
+    failures = 0
+    for result in parse_batch(_collect_paths(args.paths), workers=args.workers, chunk_size=args.chunk_size,
+                              two_stage=not args.ll_only, fast_lexer=args.fast_lexer, all_errors=args.all_errors):
+        print(("OK    " if result.ok else "ERROR ") + str(result), flush=True)
+        failures += not result.ok
+    return 1 if failures else 0
+
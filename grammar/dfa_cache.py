@@ -0,0 +1,299 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from antlr4.PredictionContext import (
+    PredictionContext, SingletonPredictionContext, ArrayPredictionContext
+)
+from antlr4.atn.ATNConfig import ATNConfig, LexerATNConfig
+from antlr4.atn.ATNConfigSet import ATNConfigSet, OrderedATNConfigSet
+from antlr4.atn.LexerATNSimulator import LexerATNSimulator
+from antlr4.atn.ParserATNSimulator import ParserATNSimulator
+from antlr4.atn.LexerActionExecutor import LexerActionExecutor
+from antlr4.atn.SemanticContext import SemanticContext
+from antlr4.dfa.DFAState import DFAState
+from .govdslLexer import govdslLexer, serializedATN as lexer_serialized_atn
+from .govdslParser import govdslParser, serializedATN as parser_serialized_atn
+
+# Bump when the layout of the cache file changes
+CACHE_FORMAT_VERSION = 1
+
+GRAMMAR_FILE = Path(__file__).parent / "govdsl.g4"
+
+# Edge targets that are not DFA state numbers
+_NO_EDGE = -1
+_ERROR_EDGE = -2
+
+
+class _UnsupportedDFAState(Exception):
+    """Raised while encoding a DFA that holds constructs the cache cannot restore (e.g., predicates)."""
+
+
+def grammar_hash() -> str:
+    """
+    Returns the key identifying the current grammar: a hash of govdsl.g4 together with the
+    ATNs of the generated lexer and parser, so that a cache is also discarded when the
+    recognizers are regenerated.
+    """
+    digest = hashlib.sha256()
+    if GRAMMAR_FILE.exists():
+        digest.update(GRAMMAR_FILE.read_bytes())
+    digest.update(str(lexer_serialized_atn()).encode("utf-8"))
+    digest.update(str(parser_serialized_atn()).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class _ContextTable:
+    """Numbers the PredictionContext graphs referenced by DFA configurations (parents first)."""
+    def __init__(self):
+        self.entries = []
+        self.__ids = {}
+
+    def encode(self, context):
+        if context is None:
+            return None
+        # Iterative post-order walk, so parents always get a lower number than their children
+        stack = [(context, False)]
+        while stack:
+            ctx, expanded = stack.pop()
+            if ctx is None or id(ctx) in self.__ids:
+                continue
+            parents = [] if ctx is PredictionContext.EMPTY else \
+                [ctx.getParent(i) for i in range(len(ctx))]
+            if not expanded:
+                stack.append((ctx, True))
+                stack.extend((p, False) for p in parents if p is not None and id(p) not in self.__ids)
+                continue
+            if ctx is PredictionContext.EMPTY:
+                entry = ["E"]
+            elif isinstance(ctx, SingletonPredictionContext):
+                entry = ["S", self.__ids.get(id(ctx.parentCtx)), ctx.returnState]
+            elif isinstance(ctx, ArrayPredictionContext):
+                entry = ["A", [self.__ids.get(id(p)) if p is not None else None for p in ctx.parents],
+                         list(ctx.returnStates)]
+            else:
+                raise _UnsupportedDFAState(type(ctx).__name__)
+            self.__ids[id(ctx)] = len(self.entries)
+            self.entries.append(entry)
+        return self.__ids[id(context)]
+
+    @staticmethod
+    def decode(entries: list) -> list:
+        contexts = []
+        for entry in entries:
+            match entry[0]:
+                case "E":
+                    contexts.append(PredictionContext.EMPTY)
+                case "S":
+                    parent = contexts[entry[1]] if entry[1] is not None else None
+                    contexts.append(SingletonPredictionContext.create(parent, entry[2]))
+                case "A":
+                    parents = [contexts[p] if p is not None else None for p in entry[1]]
+                    contexts.append(ArrayPredictionContext(parents, entry[2]))
+        return contexts
+
+
+def _encode_actions(executor, atn) -> list:
+    if executor is None:
+        return None
+    indexes = []
+    for action in executor.lexerActions:
+        try:
+            indexes.append(atn.lexerActions.index(action))
+        except ValueError:
+            # Position-dependent (indexed) actions are bound to a match and cannot be shared
+            raise _UnsupportedDFAState(type(action).__name__)
+    return indexes
+
+def _encode_configs(configs: ATNConfigSet, atn, contexts: _ContextTable) -> dict:
+    items = []
+    for c in configs:
+        if c.semanticContext is not SemanticContext.NONE:
+            raise _UnsupportedDFAState("semantic context")
+        item = [c.state.stateNumber, c.alt, contexts.encode(c.context),
+                c.reachesIntoOuterContext, c.precedenceFilterSuppressed]
+        if isinstance(c, LexerATNConfig):
+            item += [_encode_actions(c.lexerActionExecutor, atn), c.passedThroughNonGreedyDecision]
+        items.append(item)
+    return {
+        "ordered": isinstance(configs, OrderedATNConfigSet),
+        "full_ctx": configs.fullCtx,
+        "readonly": configs.readonly,
+        "unique_alt": configs.uniqueAlt,
+        "conflicting_alts": sorted(configs.conflictingAlts) if configs.conflictingAlts is not None else None,
+        "dips": configs.dipsIntoOuterContext,
+        "items": items,
+    }
+
+def _encode_dfa(dfa, atn, error_state: DFAState, contexts: _ContextTable) -> dict:
+    if dfa.precedenceDfa:
+        raise _UnsupportedDFAState("precedence DFA")
+    states = []
+    for state in list(dfa._states):
+        if state.predicates is not None:
+            raise _UnsupportedDFAState("predicated DFA state")
+        edges = None
+        if state.edges is not None:
+            edges = [_NO_EDGE if t is None else _ERROR_EDGE if t is error_state else t.stateNumber
+                     for t in state.edges]
+        states.append({
+            "number": state.stateNumber,
+            "configs": _encode_configs(state.configs, atn, contexts),
+            "edges": edges,
+            "accept": state.isAcceptState,
+            "prediction": state.prediction,
+            "actions": _encode_actions(state.lexerActionExecutor, atn),
+            "requires_full_ctx": state.requiresFullContext,
+        })
+    return {
+        "decision": dfa.decision,
+        "s0": dfa.s0.stateNumber if dfa.s0 is not None else None,
+        "states": states,
+    }
+
+
+class _Decoder:
+    """Rebuilds DFA states for one recognizer from their encoded form."""
+    def __init__(self, atn, error_state: DFAState, contexts: list):
+        self.__atn = atn
+        self.__error_state = error_state
+        self.__contexts = contexts
+        self.__executors = {}
+
+    def executor(self, indexes: list):
+        if indexes is None:
+            return None
+        key = tuple(indexes)
+        if key not in self.__executors:
+            self.__executors[key] = LexerActionExecutor([self.__atn.lexerActions[i] for i in indexes])
+        return self.__executors[key]
+
+    def configs(self, data: dict) -> ATNConfigSet:
+        configs = OrderedATNConfigSet() if data["ordered"] else ATNConfigSet(data["full_ctx"])
+        for item in data["items"]:
+            state = self.__atn.states[item[0]]
+            context = self.__contexts[item[2]] if item[2] is not None else None
+            if len(item) > 5:
+                config = LexerATNConfig(state, alt=item[1], context=context,
+                                        lexerActionExecutor=self.executor(item[5]))
+                config.passedThroughNonGreedyDecision = item[6]
+            else:
+                config = ATNConfig(state=state, alt=item[1], context=context)
+            config.reachesIntoOuterContext = item[3]
+            config.precedenceFilterSuppressed = item[4]
+            # The stored set is already merged, so its configurations are kept as they are
+            configs.configs.append(config)
+        configs.fullCtx = data["full_ctx"]
+        configs.uniqueAlt = data["unique_alt"]
+        conflicting = data["conflicting_alts"]
+        configs.conflictingAlts = set(conflicting) if conflicting is not None else None
+        configs.dipsIntoOuterContext = data["dips"]
+        if data["readonly"]:
+            configs.setReadonly(True)
+        else:
+            for config in configs.configs:
+                configs.getOrAdd(config)
+        return configs
+
+    def restore(self, dfa, data: dict):
+        states = {}
+        for s in data["states"]:
+            state = DFAState(s["number"], self.configs(s["configs"]))
+            state.isAcceptState = s["accept"]
+            state.prediction = s["prediction"]
+            state.lexerActionExecutor = self.executor(s["actions"])
+            state.requiresFullContext = s["requires_full_ctx"]
+            states[state.stateNumber] = state
+        # Edges are linked once every state exists, since they may point forward or to themselves
+        for s in data["states"]:
+            if s["edges"] is not None:
+                states[s["number"]].edges = [None if t == _NO_EDGE else self.__error_state if t == _ERROR_EDGE
+                                             else states[t] for t in s["edges"]]
+        dfa._states = {state: state for state in states.values()}
+        dfa.s0 = states[data["s0"]] if data["s0"] is not None else None
+
+
+class DFACache:
+    """
+    On-disk cache of the DFA learned by govdslLexer and govdslParser.
+
+    The ANTLR runtime builds its prediction DFA lazily, so every new process starts slow.
+    This cache stores the DFA states of the generated recognizers in a JSON file whose name
+    and content carry a hash of the grammar (see grammar_hash). A cache written for another
+    version of the grammar is never loaded, which invalidates it automatically.
+    """
+    # Recognizer classes and the ATN simulator whose ERROR state marks failed DFA edges
+    recognizers = {"lexer": (govdslLexer, LexerATNSimulator), "parser": (govdslParser, ParserATNSimulator)}
+
+    def __init__(self, directory: str | os.PathLike):
+        self.__directory = Path(directory)
+        self.__key = grammar_hash()
+
+    @property
+    def key(self) -> str:
+        return self.__key
+
+    @property
+    def path(self) -> Path:
+        return self.__directory / f"govdsl-dfa-{self.__key[:16]}.json"
+
+    @staticmethod
+    def dfa_size() -> int:
+        """Returns the number of DFA states currently learned by the lexer and parser."""
+        return sum(len(dfa._states) for cls, _ in DFACache.recognizers.values() for dfa in cls.decisionsToDFA)
+
+    def load(self) -> bool:
+        """
+        Restores the cached DFA into the generated recognizers. Decisions that already have
+        DFA states in this process are left untouched.
+
+        Returns:
+            True if a cache for the current grammar was found and loaded, False otherwise.
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return False
+        if data.get("format") != CACHE_FORMAT_VERSION or data.get("grammar") != self.__key:
+            return False
+
+        for name, (cls, simulator) in self.recognizers.items():
+            section = data["recognizers"][name]
+            decoder = _Decoder(cls.atn, simulator.ERROR, _ContextTable.decode(section["contexts"]))
+            for dfa_data in section["dfas"]:
+                dfa = cls.decisionsToDFA[dfa_data["decision"]]
+                if dfa.s0 is None and not dfa._states:
+                    decoder.restore(dfa, dfa_data)
+        return True
+
+    def save(self) -> bool:
+        """
+        Writes the DFA learned so far to the cache file. It should be called while no parse
+        is running, as the runtime grows the DFA without locking.
+
+        Returns:
+            True if the cache was written, False if the DFA holds states that cannot be cached.
+        """
+        data = {"format": CACHE_FORMAT_VERSION, "grammar": self.__key, "recognizers": {}}
+        try:
+            for name, (cls, simulator) in self.recognizers.items():
+                contexts = _ContextTable()
+                dfas = [_encode_dfa(dfa, cls.atn, simulator.ERROR, contexts)
+                        for dfa in cls.decisionsToDFA if dfa._states]
+                data["recognizers"][name] = {"contexts": contexts.entries, "dfas": dfas}
+        except _UnsupportedDFAState:
+            return False
+
+        self.__directory.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so concurrent readers never see a partial cache
+        fd, tmp_path = tempfile.mkstemp(dir=self.__directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(data, file, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return True
@@ -0,0 +1,36 @@
+class Diagnostic:
+    """
+    A problem found in a governance document: a syntax error reported by the lexer or parser,
+    or a semantic error raised while building the policy objects (error_type is then the name
+    of the exception). Line and column locate the error, or the start of the policy block for
+    semantic errors; policy is the name of the top-level policy it belongs to, if any. Syntax
+    errors have the value of their SyntaxErrorCode as code.
+    """
+    SYNTAX = "syntax"
+    SEMANTIC = "semantic"
+
+    def __init__(self, kind: str, message: str, line: int = None, column: int = None,
+                 policy: str = None, symbol: str = None, error_type: str = None, code: str = None):
+        self.kind = kind
+        self.message = message
+        self.line = line
+        self.column = column
+        self.policy = policy
+        self.symbol = symbol
+        self.error_type = error_type
+        self.code = code
+
+    @classmethod
+    def from_exception(cls, e: Exception, line: int = None, column: int = None, policy: str = None):
+        """Creates the semantic diagnostic of an exception raised while building the model."""
+        return cls(cls.SEMANTIC, str(e), line, column, policy, error_type=type(e).__name__)
+
+    def sort_key(self) -> tuple:
+        """Orders diagnostics by position, those without a position last."""
+        return (self.line is None, self.line or 0, self.column or 0)
+
+    def __str__(self):
+        location = f"line {self.line}:{self.column} " if self.line is not None else ""
+        policy = f"in policy '{self.policy}' " if self.policy is not None else ""
+        kind = self.error_type if self.error_type is not None else f"{self.kind} error"
+        return f"{location}{policy}{kind}: {self.message}"
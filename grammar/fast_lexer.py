@@ -0,0 +1,158 @@
+import re
+import sys
+from typing import TextIO
+from antlr4 import InputStream, Token
+from antlr4.error.Errors import LexerNoViableAltException
+from .govdslLexer import govdslLexer
+
+# Lexer rules of govdsl.g4 other than the implicit literal tokens
+_ID = re.compile(r"[a-zA-Z_][a-zA-Z0-9_/-]*")
+_NUMBER = re.compile(r"-?[0-9]+(\.[0-9]+)?")     # SIGNED_INT, or FLOAT when the fraction is present
+_WS = re.compile(r"(?:[ \t]|\r?\n)+")
+
+_ID_START = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_")
+_NUMBER_START = frozenset("-0123456789")
+_WS_START = frozenset(" \t\r\n")
+
+
+def _build_literal_tables():
+    """
+    Splits the literal tokens of the generated lexer in keywords (literals that the ID rule
+    also matches, resolved by a dict lookup on the ID text) and phrases (any other literal,
+    such as 'Pull request', '(Agent)' or '{', tried by first character, longest first).
+    """
+    keywords = {}
+    phrases = {}
+    for ttype, name in enumerate(govdslLexer.literalNames):
+        if not (name.startswith("'") and name.endswith("'")):
+            continue
+        literal = name[1:-1]
+        if _ID.fullmatch(literal):
+            keywords[literal] = ttype
+        else:
+            phrases.setdefault(literal[0], []).append((literal, ttype))
+    for candidates in phrases.values():
+        candidates.sort(key=lambda entry: len(entry[0]), reverse=True)
+    return keywords, phrases
+
+_KEYWORDS, _PHRASES = _build_literal_tables()
+
+
+class govdslFastLexer(govdslLexer):
+    """
+    Drop-in replacement for govdslLexer that matches tokens with regular expressions and
+    a keyword table instead of simulating the lexer ATN.
+
+    It follows the ANTLR lexer semantics for govdsl.g4: the longest match wins and ties go
+    to the rule defined first (literals, then ID, SIGNED_INT, FLOAT and WS). Tokens have
+    the same types, text, indexes, lines and columns as those of govdslLexer, and lexical
+    errors are reported to the error listeners with the same messages and recovery.
+    """
+
+    def __init__(self, input: InputStream = None, output: TextIO = sys.stdout):
+        super().__init__(input, output)
+        self._pos = 0
+        self._line = 1
+        self._column = 0
+
+    def reset(self):
+        super().reset()
+        self._pos = 0
+        self._line = 1
+        self._column = 0
+
+    @property
+    def line(self):
+        return self._line
+
+    @line.setter
+    def line(self, line: int):
+        self._line = line
+
+    @property
+    def column(self):
+        return self._column
+
+    @column.setter
+    def column(self, column: int):
+        self._column = column
+
+    def _advance(self, text: str, end: int):
+        """Moves the position to end, updating line and column as the ATN simulator would."""
+        start = self._pos
+        newlines = text.count("\n", start, end)
+        if newlines:
+            self._line += newlines
+            self._column = end - text.rfind("\n", start, end) - 1
+        else:
+            self._column += end - start
+        self._pos = end
+
+    def _match(self, text: str, pos: int):
+        """Returns (token type, end index) of the longest match at pos, or None if nothing matches."""
+        char = text[pos]
+        ttype, end = None, pos
+        if char in _ID_START:
+            end = _ID.match(text, pos).end()
+            ttype = _KEYWORDS.get(text[pos:end], self.ID)
+        elif char in _NUMBER_START:
+            match = _NUMBER.match(text, pos)
+            if match:
+                ttype, end = (self.FLOAT if match.group(1) else self.SIGNED_INT), match.end()
+        elif char in _WS_START:
+            match = _WS.match(text, pos)
+            if match:
+                ttype, end = self.WS, match.end()
+        # Literals are defined first, so they also win ties (an identifier is never tied, see above)
+        for literal, literal_type in _PHRASES.get(char, ()):
+            if pos + len(literal) < end:
+                break
+            if text.startswith(literal, pos):
+                return literal_type, pos + len(literal)
+        return (ttype, end) if ttype is not None else None
+
+    def _viable_prefix(self, text: str, pos: int) -> int:
+        """Length of the longest prefix at pos that some rule could still extend into a token."""
+        length = 1 if text[pos] in "-\r" else 0
+        for literal, _ in _PHRASES.get(text[pos], ()):
+            common = 0
+            for a, b in zip(literal, text[pos:pos + len(literal)]):
+                if a != b:
+                    break
+                common += 1
+            length = max(length, common)
+        return length
+
+    def _recover(self, text: str, start: int):
+        """Reports a token recognition error at start and skips the offending characters."""
+        failed_at = start + self._viable_prefix(text, start)
+        line, column = self._line, self._column
+        self._advance(text, min(failed_at, len(text)))
+        self._input.seek(self._pos)
+        e = LexerNoViableAltException(self, self._input, start, None)
+        message = "token recognition error at: '" + self.getErrorDisplay(text[start:failed_at + 1]) + "'"
+        self.getErrorListenerDispatch().syntaxError(self, None, line, column, message, e)
+        # Like Lexer.recover: drop the character that could not be matched
+        if self._pos < len(text):
+            self._advance(text, self._pos + 1)
+
+    def nextToken(self):
+        text = self._input.strdata
+        size = len(text)
+        while self._pos < size:
+            start = self._pos
+            line, column = self._line, self._column
+            match = self._match(text, start)
+            if match is None:
+                self._recover(text, start)
+                continue
+            ttype, end = match
+            self._advance(text, end)
+            if ttype == self.WS:
+                continue
+            self._input.seek(end)
+            return self._factory.create(self._tokenFactorySourcePair, ttype, None, Token.DEFAULT_CHANNEL,
+                                        start, end - 1, line, column)
+        self._input.seek(size)
+        return self._factory.create(self._tokenFactorySourcePair, Token.EOF, None, Token.DEFAULT_CHANNEL,
+                                    size, size - 1, self._line, self._column)
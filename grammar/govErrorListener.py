@@ -1,27 +1,246 @@
-import sys
-from antlr4 import *
-from .govdslParser import govdslParser
-from .govdslListener import govdslListener
+from enum import Enum
+from antlr4 import Token
+from antlr4.IntervalSet import IntervalSet
 from antlr4.error.ErrorListener import *
-import io
+from antlr4.error.ErrorStrategy import DefaultErrorStrategy
+from antlr4.error.Errors import NoViableAltException, InputMismatchException, FailedPredicateException
+
+
+class SyntaxErrorCode(Enum):
+    """Kind of a syntax error, derived from the exception (or message) the ANTLR runtime reports."""
+    TOKEN_RECOGNITION = "token-recognition"
+    NO_VIABLE_ALTERNATIVE = "no-viable-alternative"
+    INPUT_MISMATCH = "input-mismatch"
+    FAILED_PREDICATE = "failed-predicate"
+    MISSING_TOKEN = "missing-token"
+    EXTRANEOUS_INPUT = "extraneous-input"
+    OTHER = "other"
+
+
+class _DeferredMessage:
+    """
+    An error message that is only formatted when converted with str(). The tokens the parser
+    expected are captured when the error is reported, as the runtime recomputes them from
+    state that recovery can still change.
+    """
+    __slots__ = ("code", "expected", "_format", "_args", "_text")
+
+    def __init__(self, code: SyntaxErrorCode, expected: tuple, format, *args):
+        self.code = code
+        self.expected = expected
+        self._format = format
+        self._args = args
+        self._text = None
+
+    def __str__(self):
+        if self._text is None:
+            self._text = self._format(self._expected_set(), *self._args)
+            self._format = self._args = None
+        return self._text
+
+    def _expected_set(self) -> IntervalSet:
+        expected = IntervalSet()
+        expected.intervals = list(self.expected)
+        return expected
+
+
+def _intervals(expected: IntervalSet) -> tuple:
+    # The ranges are immutable, while the set itself may be a cached one the runtime adds to later
+    return tuple(expected.intervals) if expected.intervals else ()
+
+
+class LazyErrorStrategy(DefaultErrorStrategy):
+    """
+    DefaultErrorStrategy that reports syntax errors without formatting their messages: the
+    message given to the error listeners is only built (with the same text as the default
+    strategy) when they convert it with str(), which govErrorListener only does on demand.
+    Recovery is unchanged.
+
+    Only govErrorListener accepts such a deferred message: when any other listener (e.g.
+    ANTLR's ConsoleErrorListener) is attached, the message is formatted before notifying the
+    listeners, as by DefaultErrorStrategy.
+    """
+    @staticmethod
+    def _notify(recognizer, message: _DeferredMessage, token, e):
+        if not all(isinstance(listener, govErrorListener) for listener in recognizer._listeners):
+            message = str(message)
+        recognizer.notifyErrorListeners(message, token, e)
+
+    def reportNoViableAlternative(self, recognizer, e:NoViableAltException):
+        self._notify(recognizer, _DeferredMessage(SyntaxErrorCode.NO_VIABLE_ALTERNATIVE, _intervals(e.getExpectedTokens()),
+                                                  self._no_viable_alternative_message, recognizer.getTokenStream(), e),
+                     e.offendingToken, e)
+
+    def reportInputMismatch(self, recognizer, e:InputMismatchException):
+        self._notify(recognizer, _DeferredMessage(SyntaxErrorCode.INPUT_MISMATCH, _intervals(e.getExpectedTokens()),
+                                                  self._input_mismatch_message, recognizer, e.offendingToken),
+                     e.offendingToken, e)
+
+    def reportUnwantedToken(self, recognizer):
+        if self.inErrorRecoveryMode(recognizer):
+            return
+        self.beginErrorCondition(recognizer)
+        t = recognizer.getCurrentToken()
+        self._notify(recognizer, _DeferredMessage(SyntaxErrorCode.EXTRANEOUS_INPUT, _intervals(self.getExpectedTokens(recognizer)),
+                                                  self._unwanted_token_message, recognizer, t), t, None)
+
+    def reportMissingToken(self, recognizer):
+        if self.inErrorRecoveryMode(recognizer):
+            return
+        self.beginErrorCondition(recognizer)
+        t = recognizer.getCurrentToken()
+        self._notify(recognizer, _DeferredMessage(SyntaxErrorCode.MISSING_TOKEN, _intervals(self.getExpectedTokens(recognizer)),
+                                                  self._missing_token_message, recognizer, t), t, None)
+
+    def _no_viable_alternative_message(self, expecting, tokens, e) -> str:
+        if tokens is None:
+            input = "<unknown input>"
+        elif e.startToken.type == Token.EOF:
+            input = "<EOF>"
+        else:
+            input = tokens.getText(e.startToken, e.offendingToken)
+        return "no viable alternative at input " + self.escapeWSAndQuote(input)
+
+    def _input_mismatch_message(self, expecting, recognizer, t) -> str:
+        return "mismatched input " + self.getTokenErrorDisplay(t) \
+            + " expecting " + expecting.toString(recognizer.literalNames, recognizer.symbolicNames)
+
+    def _unwanted_token_message(self, expecting, recognizer, t) -> str:
+        return "extraneous input " + self.getTokenErrorDisplay(t) \
+            + " expecting " + expecting.toString(recognizer.literalNames, recognizer.symbolicNames)
+
+    def _missing_token_message(self, expecting, recognizer, t) -> str:
+        return "missing " + expecting.toString(recognizer.literalNames, recognizer.symbolicNames) \
+            + " at " + self.getTokenErrorDisplay(t)
+
+
+class SyntaxErrorRecord:
+    """
+    A syntax error reported by the lexer or the parser.
+
+    Only what the runtime hands to the listener is kept: the error code and the formatted
+    message are derived from it on demand, so recording an error is cheap. The expected tokens
+    come with the message when LazyErrorStrategy reports the error, otherwise they are looked
+    up when the error is recorded.
+    """
+    __slots__ = ("line", "column", "_description", "_token", "_symbol", "_exception", "_intervals", "_expected")
+
+    def __init__(self, recognizer, offendingSymbol, line, column, msg, e):
+        self.line = line
+        self.column = column
+        self._description = msg
+        self._token = offendingSymbol
+        self._exception = e
+        self._expected = None
+        if offendingSymbol is None:
+            # Lexer errors have no token; use the characters that could not be matched (the input moves on)
+            self._symbol = e.input.getText(e.startIndex, e.input.index) if e else ''
+            self._intervals = ()
+        else:
+            self._symbol = None
+            if isinstance(msg, _DeferredMessage):
+                self._intervals = msg.expected
+            elif e is not None:
+                self._intervals = _intervals(e.getExpectedTokens()) if e.offendingState >= 0 else ()
+            else:
+                self._intervals = _intervals(recognizer.getExpectedTokens())
+
+    @property
+    def code(self) -> SyntaxErrorCode:
+        e = self._exception
+        if self._token is None:
+            return SyntaxErrorCode.TOKEN_RECOGNITION
+        if isinstance(e, NoViableAltException):
+            return SyntaxErrorCode.NO_VIABLE_ALTERNATIVE
+        if isinstance(e, InputMismatchException):
+            return SyntaxErrorCode.INPUT_MISMATCH
+        if isinstance(e, FailedPredicateException):
+            return SyntaxErrorCode.FAILED_PREDICATE
+        if isinstance(self._description, _DeferredMessage):
+            return self._description.code
+        if self.description.startswith("missing "):
+            return SyntaxErrorCode.MISSING_TOKEN
+        if self.description.startswith("extraneous input "):
+            return SyntaxErrorCode.EXTRANEOUS_INPUT
+        return SyntaxErrorCode.OTHER
+
+    @property
+    def description(self) -> str:
+        """The message of the runtime, without the position."""
+        return str(self._description)
+
+    @property
+    def token_index(self) -> int:
+        """Index of the offending token in the token stream, or -1 for lexer errors."""
+        return self._token.tokenIndex if self._token is not None else -1
+
+    @property
+    def token_type(self) -> int:
+        """Type of the offending token, or None for lexer errors."""
+        return self._token.type if self._token is not None else None
+
+    @property
+    def symbol(self) -> str:
+        return self._token.text if self._token is not None else self._symbol
+
+    @property
+    def expected(self) -> frozenset:
+        """Types of the tokens the parser could have accepted instead (empty for lexer errors)."""
+        if self._expected is None:
+            self._expected = frozenset(t for interval in self._intervals for t in interval)
+        return self._expected
+
+    @property
+    def message(self) -> str:
+        return f"line {self.line}:{self.column} {self.description}"
+
+    def __str__(self):
+        return self.message
+
 
 class govErrorListener(ErrorListener):
+    """
+    Collects the syntax errors reported by a lexer and/or parser as SyntaxErrorRecord objects.
+
+    At most max_errors records are kept (None for no limit); further errors are only counted,
+    apart from the last one, which error_message and symbol describe. If an output stream is
+    given, the message of every error is also written to it.
+    """
+    def __init__(self, output=None, max_errors: int = 100):
+        self.output = output
+        self.max_errors = max_errors
+        self._errors = []
+        self._error_count = 0
+        self._last = None
 
-    def __init__(self, output):
-        self.output = output        
-        self._symbol = ''
-        self._error_message = ''
-    
-    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):        
-        error_message = f"line {line}:{column} {msg}"
-        self.output.write(error_message)
-        self._symbol = offendingSymbol.text
-        self._error_message = error_message
-
-    @property        
+    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+        record = SyntaxErrorRecord(recognizer, offendingSymbol, line, column, msg, e)
+        self._last = record
+        self._error_count += 1
+        if self.max_errors is None or len(self._errors) < self.max_errors:
+            self._errors.append(record)
+        if self.output is not None:
+            self.output.write(record.message)
+
+    @property
     def symbol(self):
-        return self._symbol
-    
+        return self._last.symbol if self._last is not None else ''
+
     @property
     def error_message(self):
-        return self._error_message
\ No newline at end of file
+        return self._last.message if self._last is not None else ''
+
+    @property
+    def errors(self) -> list[SyntaxErrorRecord]:
+        """The recorded errors, in the order they were reported (at most max_errors)."""
+        return self._errors
+
+    @property
+    def error_count(self) -> int:
+        """Number of errors reported, including those beyond max_errors."""
+        return self._error_count
+
+    @property
+    def truncated(self) -> bool:
+        """Whether errors were reported beyond max_errors and not recorded."""
+        return self._error_count > len(self._errors)
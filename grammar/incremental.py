@@ -0,0 +1,261 @@
+import os
+from antlr4 import InputStream, Token
+from antlr4.error.ErrorListener import ErrorListener
+from .govdslParser import govdslParser
+from .fast_lexer import govdslFastLexer
+from .parsing import ParserPool, get_default_pool, read_source
+from .policy_builder import PolicyBuilder
+from .symbols import SymbolTable
+
+
+def _literal_type(literal: str) -> int:
+    return govdslFastLexer.literalNames.index(f"'{literal}'")
+
+_SCOPES = _literal_type("Scopes")
+_PARTICIPANTS = _literal_type("Participants")
+_OPEN = _literal_type("{")
+_CLOSE = _literal_type("}")
+_AS = _literal_type("as")
+_POLICY_KEYWORDS = frozenset(_literal_type(k) for k in (
+    "MajorityPolicy", "LeaderDrivenPolicy", "AbsoluteMajorityPolicy", "ConsensusPolicy",
+    "LazyConsensusPolicy", "VotingPolicy", "ComposedPolicy"))
+
+# Graph node linking every policy that assigns roles ('participant as role'): they all update the shared
+# Individual.role_assignement, so they are rebuilt together to keep the full-parse result
+_ROLE_ASSIGNMENTS = "\0as"
+
+
+class _LexicalErrorFlag(ErrorListener):
+    def __init__(self):
+        self.failed = False
+
+    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+        self.failed = True
+
+
+class _Region:
+    """
+    A top-level section of a document: the Scopes or Participants section, or one policy block.
+    The kind is also the parser rule for the region. For policy blocks, name is the policy
+    name, declared the names of every policy defined in the block (nested ones included)
+    and identifiers every ID the block mentions.
+    """
+    def __init__(self, kind: str, text: str, name: str = None, declared: list = None,
+                 identifiers: frozenset = frozenset(), assigns_roles: bool = False):
+        self.kind = kind
+        self.text = text
+        self.name = name
+        self.declared = declared or []
+        self.identifiers = identifiers
+        self.assigns_roles = assigns_roles
+        self.tree = None
+        self.references = set()
+
+
+def split_regions(text: str) -> list[_Region]:
+    """
+    Splits a document in its top-level regions using only the lexer. Returns None if the
+    text has lexical errors or is not laid out as Scopes, Participants and policy blocks,
+    in which case it can only be handled by a regular full parse.
+    """
+    lexer = govdslFastLexer(InputStream(text))
+    errors = _LexicalErrorFlag()
+    lexer.removeErrorListeners()
+    lexer.addErrorListener(errors)
+    tokens = []
+    token = lexer.nextToken()
+    while token.type != Token.EOF:
+        tokens.append(token)
+        token = lexer.nextToken()
+    if errors.failed or not tokens or tokens[0].type != _SCOPES:
+        return None
+
+    # Token index where each region starts: Scopes, Participants, then each policy keyword at depth 0
+    starts = [0]
+    depth = 0
+    for i, token in enumerate(tokens):
+        if token.type == _OPEN:
+            depth += 1
+        elif token.type == _CLOSE:
+            depth -= 1
+            if depth < 0:
+                return None
+        elif depth == 0 and (token.type == _PARTICIPANTS if len(starts) == 1 else token.type in _POLICY_KEYWORDS):
+            starts.append(i)
+    if depth != 0 or len(starts) < 3:
+        return None
+
+    regions = []
+    for number, (first, end) in enumerate(zip(starts, starts[1:] + [len(tokens)])):
+        region_text = text[tokens[first].start:tokens[end - 1].stop + 1]
+        if number == 0:
+            regions.append(_Region("scopes", region_text))
+            continue
+        if number == 1:
+            regions.append(_Region("participants", region_text))
+            continue
+        block = tokens[first:end]
+        if len(block) < 2 or block[1].type != govdslFastLexer.ID:
+            return None
+        declared = [block[j + 1].text for j in range(len(block) - 1)
+                    if block[j].type in _POLICY_KEYWORDS and block[j + 1].type == govdslFastLexer.ID]
+        identifiers = frozenset(t.text for t in block if t.type == govdslFastLexer.ID)
+        regions.append(_Region("policy", region_text, name=block[1].text, declared=declared,
+                               identifiers=identifiers, assigns_roles=any(
+                                   block[j].type == _AS and block[j - 1].type == govdslFastLexer.ID
+                                   for j in range(1, len(block)))))
+    return regions
+
+
+class IncrementalParser:
+    """
+    Re-parses successive versions of one governance document incrementally.
+
+    Each version is split in top-level regions (the Scopes and Participants sections and each
+    policy block). Only regions whose text changed since the previous version are parsed again,
+    and only the policies connected to a changed region through references (default, fallback,
+    appeal policies) are rebuilt; the other policies are returned as they were. A change to the
+    Scopes or Participants section rebuilds every policy, still reusing unchanged parse trees.
+
+    The result is the same as parse_governance on the whole text. Any syntax or model error
+    triggers a full parse, so errors are reported exactly as parse_governance would. An
+    IncrementalParser keeps the state of a single document and is not thread-safe.
+    """
+    def __init__(self, pool: ParserPool = None, fast_lexer: bool = True):
+        self.__pool = pool
+        self.__fast_lexer = fast_lexer
+        self.__regions = None
+        self.__policies = {}
+        self.__symbols = None
+        self.__reparsed_regions = 0
+        self.__rebuilt_policies = []
+
+    @property
+    def reparsed_regions(self) -> int:
+        """Number of regions parsed by the last call to parse (0 when it needed a full parse)."""
+        return self.__reparsed_regions
+
+    @property
+    def rebuilt_policies(self) -> list[str]:
+        """Names of the top-level policies built by the last call to parse."""
+        return self.__rebuilt_policies
+
+    def reset(self):
+        """Forgets the previous version, so the next parse starts from scratch."""
+        self.__regions = None
+        self.__policies = {}
+        self.__symbols = None
+
+    def parse(self, source: str | os.PathLike) -> list:
+        """
+        Parses a new version of the document and returns its root policies.
+
+        Raises:
+            InvalidSyntaxException: If the document is not syntactically valid.
+        """
+        text = read_source(source)
+        pool = self.__pool or get_default_pool()
+        regions = split_regions(text)
+        if regions is None or not self._parse_regions(pool, regions):
+            return self._full_parse(pool, text)
+        declared = [name for region in regions[2:] for name in region.declared]
+        if len(set(declared)) < len(declared):
+            # Policies defined twice override each other in the listener, which needs the whole document
+            return self._full_parse(pool, text)
+        try:
+            policies = self._build(regions)
+        except Exception:
+            # Report model errors exactly as a full parse would (outside of this handler)
+            policies = None
+        return policies if policies is not None else self._full_parse(pool, text)
+
+    def _full_parse(self, pool: ParserPool, text: str) -> list:
+        self.reset()
+        self.__reparsed_regions = 0
+        policies = pool.parse(text, fast_lexer=self.__fast_lexer)
+        self.__rebuilt_policies = [policy.name for policy in policies]
+        return policies
+
+    def _parse_regions(self, pool: ParserPool, regions: list[_Region]) -> bool:
+        """Attaches a parse tree to every region, re-using the trees of unchanged regions."""
+        previous = {region.text: region.tree for region in self.__regions or []}
+        self.__reparsed_regions = 0
+        for region in regions:
+            region.tree = previous.get(region.text)
+            if region.tree is not None:
+                continue
+            with pool.checkout(region.text, self.__fast_lexer) as pooled:
+                region.tree, _ = pooled.parse_two_stage(region.kind)
+                complete = pooled.parser.getTokenStream().LA(1) == Token.EOF
+                failed = pooled.error_listener.error_count > 0
+            self.__reparsed_regions += 1
+            if failed or not complete:
+                return False
+        return True
+
+    def _link_references(self, regions: list[_Region]):
+        """Computes, for each policy region, the other top-level policies it may refer to."""
+        owners = {}
+        for region in regions:
+            for name in region.declared:
+                owners[name] = region.name
+        for region in regions:
+            region.references = {owners[i] for i in region.identifiers if i in owners} - {region.name}
+            if region.assigns_roles:
+                region.references.add(_ROLE_ASSIGNMENTS)
+
+    def _affected_policies(self, old: list[_Region], new: list[_Region]) -> set[str]:
+        """
+        Returns the names of the policies to rebuild: those connected, through references in
+        either version of the document, to a policy block that was added, changed or removed.
+        """
+        old_texts = {region.name: region.text for region in old}
+        new_texts = {region.name: region.text for region in new}
+        dirty = {name for name, text in new_texts.items() if old_texts.get(name) != text}
+        dirty |= old_texts.keys() - new_texts.keys()
+
+        graph = {}
+        for region in old + new:
+            for reference in region.references:
+                graph.setdefault(region.name, set()).add(reference)
+                graph.setdefault(reference, set()).add(region.name)
+        affected = set(dirty)
+        pending = list(dirty)
+        while pending:
+            for neighbour in graph.get(pending.pop(), ()):
+                if neighbour not in affected:
+                    affected.add(neighbour)
+                    pending.append(neighbour)
+        return affected
+
+    def _build(self, regions: list[_Region]) -> list:
+        policy_regions = regions[2:]
+        self._link_references(policy_regions)
+        previous = self.__regions
+
+        if previous is None or [r.text for r in regions[:2]] != [r.text for r in previous[:2]]:
+            # Every policy refers to the scopes and participants
+            rebuild = policy_regions
+            builder = PolicyBuilder()
+            walked = regions
+        else:
+            affected = self._affected_policies(previous[2:], policy_regions)
+            rebuild = [region for region in policy_regions if region.name in affected]
+            builder = PolicyBuilder(symbols=self.__symbols)
+            walked = rebuild
+
+        built = {}
+        if rebuild:
+            governance = govdslParser.GovernanceContext(None)
+            for region in walked:
+                governance.addChild(region.tree)
+            built = {policy.name: policy for policy in builder.build(governance)}
+            if walked is regions:
+                self.__symbols = SymbolTable.from_listener(builder)
+
+        policies = [built[region.name] if region.name in built else self.__policies[region.name]
+                    for region in policy_regions]
+        self.__regions = regions
+        self.__policies = {region.name: policy for region, policy in zip(policy_regions, policies)}
+        self.__rebuilt_policies = [region.name for region in rebuild]
+        return policies
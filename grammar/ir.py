@@ -0,0 +1,362 @@
+from functools import partial
+from .govdslParser import govdslParser
+
+
+class PolicyIR:
+    """
+    A policy as written in a document, without its parse tree: its header (kind, name and line),
+    the names it refers to (scope, participants and their 'as' roles, communication channel),
+    its decision type, conditions and parameters, and, for composed policies, the execution
+    order and phases. The kind is the policy type, or "composed".
+
+    Inline policies (phases, default, fallback and appeal policies) are PolicyIR themselves,
+    while referenced ones are given by name.
+    """
+    __slots__ = ("kind", "name", "line", "nested", "scope", "order", "phases", "decision",
+                 "participants", "channel", "conditions", "parameters")
+
+    def __init__(self, kind: str, name: str, line: int = None, nested: bool = False):
+        self.kind = kind
+        self.name = name
+        self.line = line
+        self.nested = nested
+        self.scope = None           # Scope name
+        self.order = None           # OrderIR, composed policies only
+        self.phases = ()            # PolicyIR of each phase, composed policies only
+        self.decision = None        # DecisionIR
+        self.participants = ()      # (participant name, role name or None) of each participant
+        self.channel = None         # Communication channel name
+        self.conditions = ()        # Condition IRs, in document order
+        self.parameters = None      # ParametersIR
+
+    @property
+    def composed(self) -> bool:
+        return self.kind == "composed"
+
+    def __repr__(self):
+        return f"PolicyIR({self.kind}, {self.name})"
+
+
+class OrderIR:
+    __slots__ = ("sequential", "require_all", "carry_over")
+
+    def __init__(self, sequential: bool, require_all: bool, carry_over: bool):
+        self.sequential = sequential
+        self.require_all = require_all
+        self.carry_over = carry_over
+
+
+class DecisionIR:
+    """Decision type: kind is "boolean", "strings" or "elements", with the options or element names."""
+    __slots__ = ("kind", "options")
+
+    def __init__(self, kind: str, options: tuple = ()):
+        self.kind = kind
+        self.options = options
+
+
+class ParametersIR:
+    """Parameters of a single policy. Default and fallback policies are a PolicyIR if inline, or a name."""
+    __slots__ = ("ratio", "default", "fallback")
+
+    def __init__(self, ratio: float = None, default: 'PolicyIR | str' = None, fallback: 'PolicyIR | str' = None):
+        self.ratio = ratio
+        self.default = default
+        self.fallback = fallback
+
+
+class TimeConditionIR:
+    """A Deadline or MinDecisionTime (kind "deadline" or "minDecisionTime"): an offset, a DD/MM/YYYY date, or both."""
+    __slots__ = ("kind", "name", "amount", "unit", "date")
+
+    def __init__(self, kind: str, name: str, amount: int = None, unit: str = None, date: tuple = None):
+        self.kind = kind
+        self.name = name
+        self.amount = amount
+        self.unit = unit
+        self.date = date
+
+
+class ParticipantExclusionIR:
+    __slots__ = ("names",)
+
+    def __init__(self, names: tuple):
+        self.names = names
+
+
+class MinParticipantsIR:
+    __slots__ = ("count",)
+
+    def __init__(self, count: int):
+        self.count = count
+
+
+class VetoRightIR:
+    __slots__ = ("names",)
+
+    def __init__(self, names: tuple):
+        self.names = names
+
+
+class AppealRightIR:
+    """Appealers and the appeal policy, a PolicyIR if inline or a name."""
+    __slots__ = ("appealers", "policy")
+
+    def __init__(self, appealers: tuple, policy: 'PolicyIR | str' = None):
+        self.appealers = appealers
+        self.policy = policy
+
+
+class CheckCiCdIR:
+    __slots__ = ("evaluation_mode",)
+
+    def __init__(self, evaluation_mode: str = None):
+        self.evaluation_mode = evaluation_mode
+
+
+class MinTimeIR:
+    __slots__ = ("evaluation_mode", "activity", "amount", "unit")
+
+    def __init__(self, evaluation_mode: str, activity: bool, amount: int, unit: str):
+        self.evaluation_mode = evaluation_mode
+        self.activity = activity
+        self.amount = amount
+        self.unit = unit
+
+
+class LabelConditionIR:
+    __slots__ = ("evaluation_mode", "include", "labels")
+
+    def __init__(self, evaluation_mode: str, include: bool, labels: tuple):
+        self.evaluation_mode = evaluation_mode
+        self.include = include
+        self.labels = labels
+
+
+def _ids(ctx) -> tuple:
+    return tuple(token.getText() for token in ctx.ID())
+
+def _evaluation_mode(ctx) -> str:
+    mode = ctx.evaluationMode()
+    return mode.getText() if mode else None
+
+def lower_order(ctx: govdslParser.OrderContext) -> OrderIR:
+    carry_over = ctx.carryOver()
+    return OrderIR(ctx.orderType().orderTypeValue().getText().lower() == "sequential",
+                   ctx.orderMode().booleanValue().getText().lower() == "true",
+                   carry_over.booleanValue().getText().lower() == "true" if carry_over else False)
+
+def lower_decision(ctx) -> DecisionIR:
+    """Lowers a booleanDecision, stringList or elementList context."""
+    if isinstance(ctx, govdslParser.StringListContext):
+        return DecisionIR("strings", _ids(ctx))
+    if isinstance(ctx, govdslParser.ElementListContext):
+        return DecisionIR("elements", _ids(ctx))
+    return DecisionIR("boolean")
+
+def lower_participants(ctx: govdslParser.PolicyParticipantsContext) -> tuple:
+    participants = []
+    for part in ctx.partID():
+        has_role = part.hasRole()
+        participants.append((part.ID().getText(), has_role.ID().getText() if has_role else None))
+    return tuple(participants)
+
+def lower_time_condition(ctx) -> TimeConditionIR:
+    """Lowers a deadline or minDecisionTime context."""
+    if isinstance(ctx, govdslParser.DeadlineContext):
+        deadline_id = ctx.deadlineID()
+        condition = TimeConditionIR("deadline", deadline_id.ID().getText() if deadline_id else "deadline")
+    else:
+        name_token = ctx.ID()
+        condition = TimeConditionIR("minDecisionTime", name_token.getText() if name_token else "minDecisionTime")
+    offset = ctx.offset()
+    if offset:
+        condition.amount = int(offset.SIGNED_INT().getText())
+        condition.unit = offset.timeUnit().getText()
+    date = ctx.date()
+    if date:
+        condition.date = tuple(int(n.getText()) for n in date.SIGNED_INT())    # DD/MM/YYYY
+    return condition
+
+def lower_check_ci_cd(ctx: govdslParser.CheckCiCdContext) -> CheckCiCdIR:
+    """Returns None for 'CheckCiCd : false', which adds no condition."""
+    if ctx.booleanValue().getText().lower() != "true":
+        return None
+    return CheckCiCdIR(_evaluation_mode(ctx))
+
+def lower_min_time(ctx: govdslParser.MinTimeContext) -> MinTimeIR:
+    return MinTimeIR(_evaluation_mode(ctx), ctx.activityBool().getText() == "Activity",
+                     int(ctx.offset().SIGNED_INT().getText()), ctx.offset().timeUnit().getText())
+
+def lower_label_condition(ctx: govdslParser.LabelsConditionContext) -> LabelConditionIR:
+    include = ctx.include()
+    return LabelConditionIR(_evaluation_mode(ctx), include.getText().lower() == "include" if include else True, _ids(ctx))
+
+def policy_header(ctx) -> PolicyIR:
+    """Returns a PolicyIR with only the kind, name and line of a policy (a nestedPolicy or policy context)."""
+    ctx = ctx.getChild(0)
+    composed, nested = _POLICY_RULES[type(ctx)]
+    return PolicyIR("composed" if composed else ctx.policyType().getText(), ctx.ID().getText(), ctx.start.line, nested)
+
+def lower_target(ctx) -> 'PolicyIR | str':
+    """
+    Lowers the policy of a default, fallback or appealRight context: its name if it is a
+    reference, otherwise the header of the inline policy (see policy_header).
+    """
+    policy_reference = ctx.policyReference()
+    if policy_reference:
+        return policy_reference.ID().getText()
+    nested_policy = ctx.nestedPolicy()
+    return policy_header(nested_policy) if nested_policy else None
+
+def lower_appeal_right(ctx: govdslParser.AppealRightContext) -> AppealRightIR:
+    return AppealRightIR(_ids(ctx), lower_target(ctx))
+
+def lower_parameters(ctx: govdslParser.ParametersContext) -> ParametersIR:
+    parameters = ParametersIR()
+    vot_params = ctx.votParams()
+    if vot_params and vot_params.ratio():
+        parameters.ratio = float(vot_params.ratio().FLOAT().getText())
+    default = ctx.default()
+    if default:
+        parameters.default = lower_target(default)
+    fallback = ctx.fallback()
+    if fallback:
+        parameters.fallback = lower_target(fallback)
+    return parameters
+
+_CONDITION_LOWERINGS = {
+    govdslParser.DeadlineContext: lower_time_condition,
+    govdslParser.MinDecisionTimeContext: lower_time_condition,
+    govdslParser.ParticipantExclusionContext: lambda ctx: ParticipantExclusionIR(_ids(ctx)),
+    govdslParser.MinParticipantContext: lambda ctx: MinParticipantsIR(int(ctx.SIGNED_INT().getText())),
+    govdslParser.VetoRightContext: lambda ctx: VetoRightIR(_ids(ctx)),
+    govdslParser.AppealRightContext: lower_appeal_right,
+    govdslParser.CheckCiCdContext: lower_check_ci_cd,
+    govdslParser.MinTimeContext: lower_min_time,
+    govdslParser.LabelsConditionContext: lower_label_condition,
+}
+
+_POLICY_RULES = {
+    govdslParser.TopLevelSinglePolicyContext: (False, False),   # (composed, nested)
+    govdslParser.TopLevelComposedPolicyContext: (True, False),
+    govdslParser.NestedSinglePolicyContext: (False, True),
+    govdslParser.NestedComposedPolicyContext: (True, True),
+}
+
+
+def _lower_header(ctx, pending: list) -> PolicyIR:
+    """
+    Lowers a top-level or nested policy context, except for its inline policies: they are only
+    headers, and their contexts are appended to pending with the function that stores their IR.
+    """
+    composed, nested = _POLICY_RULES[type(ctx)]
+    policy = PolicyIR("composed" if composed else ctx.policyType().getText(), ctx.ID().getText(),
+                      ctx.start.line, nested)
+    if not nested:
+        policy.scope = ctx.scope().ID().getText()
+    if composed:
+        order = ctx.order()
+        policy.order = lower_order(order) if order else None
+        phases = ctx.phases().nestedPolicy()
+        policy.phases = [None] * len(phases)
+        pending.extend((phase, partial(policy.phases.__setitem__, i)) for i, phase in enumerate(phases))
+        return policy
+
+    policy.decision = lower_decision(ctx.decisionType().getChild(2))
+    policy.participants = lower_participants(ctx.policyParticipants())
+    channel = ctx.communicationChannel()
+    policy.channel = channel.ID().getText() if channel else None
+
+    conditions = ctx.conditions()
+    if conditions and conditions.children:
+        lowered = []
+        for condition_ctx in conditions.children:
+            lower = _CONDITION_LOWERINGS.get(type(condition_ctx))
+            condition = lower(condition_ctx) if lower else None
+            if condition is None:
+                continue
+            lowered.append(condition)
+            if isinstance(condition, AppealRightIR) and isinstance(condition.policy, PolicyIR):
+                pending.append((condition_ctx.nestedPolicy(), partial(setattr, condition, "policy")))
+        policy.conditions = tuple(lowered)
+
+    parameters = ctx.parameters()
+    if parameters:
+        policy.parameters = lower_parameters(parameters)
+        for name in ("default", "fallback"):
+            target = getattr(parameters, name)()
+            if target and isinstance(getattr(policy.parameters, name), PolicyIR):
+                pending.append((target.nestedPolicy(), partial(setattr, policy.parameters, name)))
+    return policy
+
+def lower_policy(ctx) -> PolicyIR:
+    """
+    Lowers a policy (a policy context, or a top-level or nested policy context) to its IR.
+    Inline policies are lowered iteratively, so their nesting depth is not limited.
+    """
+    root = []
+    pending = [(ctx, root.append)]
+    while pending:
+        ctx, store = pending.pop()
+        if isinstance(ctx, (govdslParser.PolicyContext, govdslParser.NestedPolicyContext)):
+            ctx = ctx.getChild(0)
+        store(_lower_header(ctx, pending))
+    return root[0]
+
+def iter_policy_events(policy: PolicyIR):
+    """
+    Yields (event, value) pairs for a policy in the order the listener visits the corresponding
+    parse tree: ("enter", policy), ("scope", name), ("order", OrderIR), ("decision", DecisionIR),
+    ("participants", tuple), ("channel", name), ("condition", condition IR), ("parameters",
+    ParametersIR), ("default", target), ("fallback", target) and ("exit", policy). Inline
+    policies are visited where they are written.
+    """
+    pending = [policy]
+    while pending:
+        item = pending.pop()
+        if not isinstance(item, PolicyIR):
+            yield item
+            continue
+        events = [("enter", item)]
+        if item.scope is not None:
+            events.append(("scope", item.scope))
+        if item.composed:
+            if item.order is not None:
+                events.append(("order", item.order))
+            events.extend(item.phases)
+        else:
+            events.append(("decision", item.decision))
+            events.append(("participants", item.participants))
+            if item.channel is not None:
+                events.append(("channel", item.channel))
+            for condition in item.conditions:
+                events.append(("condition", condition))
+                if isinstance(condition, AppealRightIR) and isinstance(condition.policy, PolicyIR):
+                    events.append(condition.policy)
+            parameters = item.parameters
+            if parameters is not None:
+                events.append(("parameters", parameters))
+                for name in ("default", "fallback"):
+                    target = getattr(parameters, name)
+                    if target is not None:
+                        events.append((name, target))
+                        if isinstance(target, PolicyIR):
+                            events.append(target)
+        events.append(("exit", item))
+        pending.extend(reversed(events))
+
+
+class DocumentIR:
+    """
+    A governance document lowered for building: the scopes, participants and profiles of its
+    Scopes and Participants sections, already built (by name), and the IR of its top-level
+    policies. It holds no parse tree (see ParserPool.lower).
+    """
+    __slots__ = ("scopes", "participants", "profiles", "policies")
+
+    def __init__(self, scopes: dict, participants: dict, profiles: dict, policies: list[PolicyIR]):
+        self.scopes = scopes
+        self.participants = participants
+        self.profiles = profiles
+        self.policies = policies
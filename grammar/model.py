@@ -0,0 +1,144 @@
+import os
+from types import MappingProxyType
+from metamodel.governance import (
+    Policy, SinglePolicy, ComposedPolicy, ConsensusPolicy, LeaderDrivenPolicy, AppealRight,
+    Condition, Participant, Individual, Scope
+)
+from .parsing import parse_governance
+from .scope_index import ScopeIndex
+
+
+class GovernanceModel:
+    """
+    The policies of a document, with indexes built once so that common queries are dictionary
+    lookups instead of walks through phases, default, fallback and appeal policies:
+    policies by name, by scope and by participant, conditions by type and the policies
+    referring to each policy.
+
+    The model does not follow changes made to the policies after it is built.
+    """
+    def __init__(self, policies: list[Policy]):
+        self.__roots = tuple(policies)
+        self.__policies = {}
+        self.__by_scope = {}
+        self.__by_participant = {}
+        self.__by_condition_type = {}
+        self.__condition_owners = {}
+        self.__referrers = {}
+        self.__scope_index = None
+
+        # Every policy reachable from the roots, in document order, each indexed once
+        pending = list(reversed(self.__roots))
+        visited = set()
+        while pending:
+            policy = pending.pop()
+            if id(policy) in visited:
+                continue
+            visited.add(id(policy))
+            self.__index(policy)
+            pending.extend(reversed([target for target, _ in self.__references(policy)]))
+
+    @staticmethod
+    def __references(policy: Policy) -> list[tuple[Policy, str]]:
+        """The policies a policy refers to, each with the kind of reference."""
+        references = []
+        if isinstance(policy, ComposedPolicy):
+            references.extend((phase, "phase") for phase in policy.phases or ())
+        if isinstance(policy, SinglePolicy):
+            if isinstance(policy, LeaderDrivenPolicy) and policy.default:
+                references.append((policy.default, "default"))
+            if isinstance(policy, ConsensusPolicy) and policy.fallback:
+                references.append((policy.fallback, "fallback"))
+            for condition in policy.conditions or ():
+                if isinstance(condition, AppealRight) and condition.policy:
+                    references.append((condition.policy, "appeal"))
+        return references
+
+    def __index(self, policy: Policy):
+        self.__policies.setdefault(policy.name, policy)
+        if policy.scope is not None:
+            self.__by_scope.setdefault(policy.scope.name, []).append(policy)
+        if isinstance(policy, SinglePolicy):
+            for participant in policy.participants or ():
+                self.__by_participant.setdefault(participant.name, []).append(policy)
+            for condition in policy.conditions or ():
+                self.__condition_owners[id(condition)] = policy
+                for condition_type in type(condition).__mro__:
+                    self.__by_condition_type.setdefault(condition_type, []).append(condition)
+                    if condition_type is Condition:
+                        break
+        for target, reference in self.__references(policy):
+            self.__referrers.setdefault(id(target), []).append((policy, reference))
+
+    @classmethod
+    def from_document(cls, source: str | os.PathLike, **options) -> 'GovernanceModel':
+        """Parses a document (see parse_governance, which takes the options) and indexes its policies."""
+        return cls(parse_governance(source, **options))
+
+    @property
+    def roots(self) -> tuple[Policy, ...]:
+        """The policies defined at the top level of the document."""
+        return self.__roots
+
+    @property
+    def policies(self) -> MappingProxyType:
+        """Every policy, nested ones included, by name."""
+        return MappingProxyType(self.__policies)
+
+    @property
+    def scope_index(self) -> ScopeIndex:
+        """The ScopeIndex of every policy, built on first use."""
+        if self.__scope_index is None:
+            self.__scope_index = ScopeIndex([policy for policies in self.__by_scope.values() for policy in policies])
+        return self.__scope_index
+
+    def policies_in_scope(self, scope: Scope | str, inherited: bool = True) -> list[Policy]:
+        """
+        Returns the policies whose scope is the given scope (or scope name). With inherited, the
+        policies of the enclosing activity and project, which also apply to it, are included;
+        the given scope must then be a Scope object.
+        """
+        if inherited and not isinstance(scope, str):
+            return list(self.scope_index.policies_for(scope))
+        return list(self.__by_scope.get(scope if isinstance(scope, str) else scope.name, ()))
+
+    def policies_of_participant(self, participant: Participant | str, through_roles: bool = True) -> list[Policy]:
+        """
+        Returns the policies listing the given participant (or participant name). With
+        through_roles, the policies listing a role of an individual are included; the given
+        participant must then be a Participant object.
+        """
+        name = participant if isinstance(participant, str) else participant.name
+        policies = list(self.__by_participant.get(name, ()))
+        if through_roles and isinstance(participant, Individual):
+            seen = {id(policy) for policy in policies}
+            for role in participant.roles or ():
+                for policy in self.__by_participant.get(role.name, ()):
+                    if id(policy) not in seen:
+                        seen.add(id(policy))
+                        policies.append(policy)
+        return policies
+
+    def conditions_of_type(self, condition_type: type) -> list[Condition]:
+        """Returns the conditions of every policy that are instances of the given Condition class."""
+        return list(self.__by_condition_type.get(condition_type, ()))
+
+    def policy_of(self, condition: Condition) -> Policy | None:
+        """Returns the policy a condition belongs to."""
+        return self.__condition_owners.get(id(condition))
+
+    def referrers(self, policy: Policy) -> list[tuple[Policy, str]]:
+        """
+        Returns the policies referring to the given one, each with the kind of reference:
+        "phase", "default", "fallback" or "appeal".
+        """
+        return list(self.__referrers.get(id(policy), ()))
+
+    def __len__(self):
+        return len(self.__policies)
+
+    def __iter__(self):
+        return iter(self.__policies.values())
+
+    def __repr__(self):
+        return f"GovernanceModel({len(self.__roots)} root policies, {len(self.__policies)} policies)"
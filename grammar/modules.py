@@ -0,0 +1,149 @@
+import hashlib
+import os
+import re
+import threading
+from pathlib import Path
+from utils.exceptions import CyclicImportException, DuplicateAttributeException, UndefinedAttributeException
+from .parsing import ParserPool, get_default_pool, parse_governance
+from .symbols import SymbolTable
+
+# An import directive: 'Import : path/to/shared.gov', alone on a line of the document header
+_IMPORT = re.compile(r"[ \t]*Import[ \t]*:[ \t]*(\S+)[ \t]*\r?\n?")
+
+
+def split_imports(text: str) -> tuple[list[str], str]:
+    """
+    Separates the import directives heading a document from its DSL text. Returns the
+    imported paths, in order, and the text with each directive replaced by an empty line,
+    so that syntax errors keep their line numbers.
+    """
+    imports = []
+    lines = text.splitlines(keepends=True)
+    for i, line in enumerate(lines):
+        match = _IMPORT.fullmatch(line)
+        if match:
+            imports.append(match.group(1))
+            lines[i] = "\n"
+        elif line.strip():
+            break
+    return imports, "".join(lines) if imports else text
+
+
+class _Module:
+    """A compiled module: the hash of its text, the tables it imported and its own table."""
+    def __init__(self, digest: str, imported: list[SymbolTable], symbols: SymbolTable):
+        self.digest = digest
+        self.imported = imported
+        self.symbols = symbols
+
+
+class ModuleLoader:
+    """
+    Parses governance documents split over several files.
+
+    A document can start with import directives, one per line, naming files whose Scopes and
+    Participants sections it uses (paths are relative to the importing file):
+
+        Import : shared/organization.gov
+        MajorityPolicy ...
+
+    Such documents may leave out their own Scopes and Participants sections. Imported files
+    are compiled once into a SymbolTable and cached by path and content hash: an imported file
+    is only parsed again when it (or a file it imports) changes, so editing a policy file only
+    re-parses that file. Imported files may import other files; policies they define are ignored.
+
+    The grammar has no import rule (the parser cannot be regenerated here), so directives are
+    handled before parsing.
+    """
+    def __init__(self, pool: ParserPool = None, two_stage: bool = True, fast_lexer: bool = False):
+        self.__pool = pool
+        self.__two_stage = two_stage
+        self.__fast_lexer = fast_lexer
+        self.__modules = {}     # Resolved path -> _Module
+        self.__lock = threading.RLock()
+        self.__compiled = 0
+
+    @property
+    def compiled(self) -> int:
+        """Number of times an imported file was parsed (cache misses)."""
+        return self.__compiled
+
+    def __len__(self):
+        return len(self.__modules)
+
+    def clear(self):
+        """Forgets every compiled module."""
+        with self.__lock:
+            self.__modules.clear()
+
+    def parse(self, source: str | os.PathLike, base: str | os.PathLike = None) -> list:
+        """
+        Parses a governance document with its imports and returns its root policies.
+
+        Args:
+            source: The DSL text, or a path (pathlib.Path / os.PathLike) to a .gov file.
+            base: Directory that imports of a text source are relative to. Defaults to the
+                directory of the file, or the current directory for texts.
+
+        Raises:
+            InvalidSyntaxException: If the document or an imported file is not syntactically valid.
+            UndefinedAttributeException: If an imported file does not exist.
+            CyclicImportException: If files import each other in a cycle.
+        """
+        if isinstance(source, os.PathLike):
+            path = Path(source).resolve()
+            text = path.read_text(encoding="utf-8")
+            base = path.parent if base is None else Path(base)
+            importing = [str(path)]
+        else:
+            text = source
+            base = Path(base) if base is not None else Path.cwd()
+            importing = []
+        imports, text = split_imports(text)
+        if not imports:
+            return parse_governance(text, self.__pool, self.__two_stage, self.__fast_lexer)
+        with self.__lock:
+            symbols = self._link([self._load(base / name, importing) for name in imports])
+        return parse_governance(text, self.__pool, self.__two_stage, self.__fast_lexer, symbols=symbols)
+
+    def symbols(self, path: str | os.PathLike) -> SymbolTable:
+        """Returns the SymbolTable of a file (including what it imports), compiling it if needed."""
+        with self.__lock:
+            return self._load(Path(path), [])
+
+    def _load(self, path: Path, importing: list[str]) -> SymbolTable:
+        path = path.resolve()
+        if str(path) in importing:
+            raise CyclicImportException(importing[importing.index(str(path)):] + [str(path)])
+        try:
+            text = path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            raise UndefinedAttributeException("import", str(path), "Imported file not found.") from None
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        imports, text = split_imports(text)
+        imported = [self._load(path.parent / name, importing + [str(path)]) for name in imports]
+
+        module = self.__modules.get(path)
+        if module is not None and module.digest == digest and \
+                len(module.imported) == len(imported) and all(a is b for a, b in zip(module.imported, imported)):
+            return module.symbols
+
+        self.__compiled += 1
+        symbols = SymbolTable.from_document(text, pool=self.__pool or get_default_pool(),
+                                            fast_lexer=self.__fast_lexer, symbols=self._link(imported))
+        self.__modules[path] = _Module(digest, imported, symbols)
+        return symbols
+
+    @staticmethod
+    def _link(tables: list[SymbolTable]) -> SymbolTable:
+        """Merges the tables of several imports. Names may only be shared by the same object."""
+        if len(tables) == 1:
+            return tables[0]
+        merged = ({}, {}, {})
+        for table in tables:
+            for kind, names, target in zip(("scope", "participant", "profile"),
+                                           (table.scopes, table.participants, table.profiles), merged):
+                for name, element in names.items():
+                    if target.setdefault(name, element) is not element:
+                        raise DuplicateAttributeException(kind, name, "name")
+        return SymbolTable(*merged)
@@ -0,0 +1,631 @@
+import atexit
+import os
+import re
+import sys
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from antlr4 import InputStream, CommonTokenStream, Token
+from antlr4.Token import CommonToken
+from antlr4.atn.PredictionMode import PredictionMode
+from antlr4.error.ErrorStrategy import BailErrorStrategy
+from antlr4.error.Errors import ParseCancellationException
+from utils.exceptions import InvalidSyntaxException
+from utils.validation import ValidationResult, collect_errors
+from .govdslLexer import govdslLexer
+from .fast_lexer import govdslFastLexer
+from .govdslParser import govdslParser
+from .govErrorListener import govErrorListener, LazyErrorStrategy
+from .policy_builder import PolicyBuilder
+from .ir import DocumentIR, lower_policy
+from .dfa_cache import DFACache
+from .result_cache import ParseResultCache
+
+# Small document touching the most common rules. Parsing it once fills the
+# DFA cache shared by every govdslLexer/govdslParser instance of the process.
+_WARMUP_DOCUMENT = """
+Scopes:
+    Projects :
+        warmupProject from GitHub : owner/repo {
+            Activities :
+                warmupActivity {
+                    Tasks :
+                        warmupTask : Pull request {
+                            Action : merge
+                        }
+                }
+        }
+Participants:
+    Roles : maintainer { vote value : 1.0 }, reviewer
+    Individuals : joe { vote value : 0.5, role : reviewer }, (Agent) bot { confidence : 0.5 }
+MajorityPolicy warmupPolicy {
+    Scope: warmupTask
+    DecisionType as BooleanDecision
+    Participant list : maintainer, joe
+    Conditions:
+        Deadline : 7 days
+        MinParticipants : 2
+        LabelCondition pre not : wip
+    Parameters:
+        ratio : 0.5
+}
+LeaderDrivenPolicy warmupLeader {
+    Scope: warmupProject
+    DecisionType as StringList : accept, reject
+    Participant list : maintainer
+    Parameters:
+        default : warmupPolicy
+}
+"""
+
+# Start rule of the top-level block beginning with a given token (any other token starts a policy)
+_SECTION_RULES = {govdslParser.literalNames.index("'Scopes'"): "scopes",
+                  govdslParser.literalNames.index("'Participants'"): "participants"}
+
+
+# The generated parser is recursive descent: every nesting level of the document (inline
+# default, fallback and appeal policies, phases, scopes) costs a few rule invocations, and
+# comparing the parser's prediction contexts recurses about as deep again.
+_FRAMES_PER_NESTING_LEVEL = 10
+_BRACES = re.compile(r"[{}]")
+_recursion_lock = threading.Lock()
+_recursion_users = 0
+_base_recursion_limit = None
+# Stack of the threads parsing deeply nested documents (see run_nested)
+_STACK_BYTES_PER_FRAME = 1024
+_MIN_THREAD_STACK = 8 * 1024 * 1024
+_stack_size_lock = threading.Lock()
+
+def nesting_depth(text: str) -> int:
+    """Returns the deepest nesting of braces in a document, an upper bound of its policy nesting."""
+    depth = deepest = 0
+    for brace in _BRACES.findall(text):
+        if brace == "{":
+            depth += 1
+            deepest = max(deepest, depth)
+        else:
+            depth -= 1
+    return deepest
+
+def _extra_frames(text: str) -> int:
+    """The frames the parser needs beyond the recursion limit for a document, or 0."""
+    extra = _FRAMES_PER_NESTING_LEVEL * nesting_depth(text)
+    base = _base_recursion_limit if _recursion_users else sys.getrecursionlimit()
+    return extra if extra > base // 2 else 0
+
+@contextmanager
+def nesting_allowance(text: str):
+    """
+    Raises the recursion limit, for as long as the context is active, so that the generated
+    parser can descend to the deepest nesting of the given document. The limit is only raised
+    for documents nested deeper than half of it allows, and restored once no thread needs it.
+
+    The recursion limit is global to the interpreter: while it is raised, every thread of the
+    process gets the higher limit. Use run_nested to parse deep documents in a thread whose
+    stack is large enough for that limit.
+    """
+    global _recursion_users, _base_recursion_limit
+    with _recursion_lock:
+        extra = _extra_frames(text)
+        if extra:
+            base = _base_recursion_limit if _recursion_users else sys.getrecursionlimit()
+            if not _recursion_users:
+                _base_recursion_limit = base
+            _recursion_users += 1
+            sys.setrecursionlimit(max(base + extra, sys.getrecursionlimit()))
+    try:
+        yield
+    finally:
+        if extra:
+            with _recursion_lock:
+                _recursion_users -= 1
+                if not _recursion_users:
+                    sys.setrecursionlimit(_base_recursion_limit)
+
+def run_nested(text: str, function, *args, **kwargs):
+    """
+    Returns function(*args, **kwargs), which parses the given text. If the text is nested too
+    deeply for the recursion limit (see nesting_allowance), the function runs in a dedicated
+    thread with a stack sized for its nesting depth, and its result or exception is handed
+    back to the calling thread, whose own stack does not have to hold the deeper recursion.
+    """
+    with _recursion_lock:
+        extra = _extra_frames(text)
+    if not extra:
+        return function(*args, **kwargs)
+
+    outcome = {}
+    def target():
+        try:
+            outcome["result"] = function(*args, **kwargs)
+        except BaseException as e:
+            outcome["error"] = e
+
+    with _stack_size_lock:
+        default = threading.stack_size()
+        threading.stack_size(max(default, _MIN_THREAD_STACK) + _STACK_BYTES_PER_FRAME * extra)
+        try:
+            thread = threading.Thread(target=target, name="govdsl-nested-parse")
+            thread.start()
+        finally:
+            threading.stack_size(default)
+    thread.join()
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
+
+
+# Stands for the tokens released from the token stream by PooledParser.iter_blocks
+_RELEASED_TOKEN = CommonToken(type=Token.INVALID_TYPE)
+
+
+class PooledParser:
+    """
+    A lexer/parser pair that can be re-targeted to a new input without being rebuilt.
+    The ATN-based govdslLexer is used by default; reset(text, fast_lexer=True) switches
+    to govdslFastLexer, which produces the same tokens.
+    """
+
+    def __init__(self):
+        self.__lexers = {govdslLexer: govdslLexer(InputStream(""))}
+        self.lexer = self.__lexers[govdslLexer]
+        self.parser = govdslParser(CommonTokenStream(self.lexer))
+        self.error_listener = None
+        self.lexer_error_listener = None
+
+    def reset(self, text: str, fast_lexer: bool = False, line: int = 1, column: int = 0):
+        """
+        Points the lexer and parser at a new document and installs fresh error listeners.
+        When the text is a part of a larger document, line and column give the position where
+        it starts, so that tokens and syntax errors are located in the whole document.
+
+        Only the parser reports to error_listener. Token recognition errors do not make the
+        document invalid (the lexer skips the offending characters and parsing carries on);
+        they are recorded in lexer_error_listener.
+        """
+        self.error_listener = govErrorListener()
+        self.lexer_error_listener = govErrorListener()
+        lexer_class = govdslFastLexer if fast_lexer else govdslLexer
+        if lexer_class not in self.__lexers:
+            self.__lexers[lexer_class] = lexer_class(InputStream(""))
+        self.lexer = self.__lexers[lexer_class]
+        self.lexer.inputStream = InputStream(text)
+        self.lexer.line, self.lexer.column = line, column
+        self.lexer.removeErrorListeners()
+        self.lexer.addErrorListener(self.lexer_error_listener)
+        self.parser.setInputStream(CommonTokenStream(self.lexer))
+        self.parser.removeErrorListeners()
+        self.parser.addErrorListener(self.error_listener)
+        self.use_ll()
+        return self.parser
+
+    def use_sll(self):
+        """Switches to SLL prediction, bailing out on the first syntax error instead of recovering."""
+        self.parser._interp.predictionMode = PredictionMode.SLL
+        self.parser._errHandler = BailErrorStrategy()
+
+    def use_ll(self):
+        """
+        Switches to full LL prediction with the default error recovery. Error messages are only
+        formatted when they are read (see LazyErrorStrategy).
+        """
+        self.parser._interp.predictionMode = PredictionMode.LL
+        self.parser._errHandler = LazyErrorStrategy()
+
+    def parse_two_stage(self, rule: str = "governance", start: int = 0):
+        """
+        Parses the current input with SLL prediction first and re-parses it with full LL
+        only if SLL bails out. Returns the parse tree and whether the fallback was needed.
+        The start rule defaults to governance, i.e., a whole document; start is the index of
+        the token to parse from, for a rule that does not begin at the start of the input.
+
+        SLL succeeds on any valid input for which it does not hit a full-context conflict,
+        and the resulting tree is the same as with LL. Syntax errors are only reported by
+        the LL stage, so error messages are identical to a plain LL parse.
+        """
+        start_rule = getattr(self.parser, rule)
+        self.use_sll()
+        # The error that makes SLL bail out is reported again by LL (or is no error at all for LL)
+        self.parser.removeErrorListeners()
+        try:
+            tree = start_rule()
+        except ParseCancellationException:
+            # Resetting rewinds the token stream; tokens are buffered, so nothing is re-lexed
+            self.parser.reset()
+            self.parser.getTokenStream().seek(start)
+            self.use_ll()
+            self.parser.addErrorListener(self.error_listener)
+            return start_rule(), True
+        self.parser.addErrorListener(self.error_listener)
+        return tree, False
+
+    def parse_blocks(self, two_stage: bool = True) -> tuple[list, bool]:
+        """
+        Parses the current input as a sequence of top-level blocks: Scopes and Participants
+        sections and policies, each optional, which is how documents relying on a SymbolTable
+        are written. Returns the parse tree of each block and whether any block needed the
+        LL fallback (see parse_two_stage).
+        """
+        trees = []
+        fallback = False
+        for tree, block_fallback in self.iter_blocks(two_stage):
+            trees.append(tree)
+            fallback = fallback or block_fallback
+        return trees, fallback
+
+    def iter_blocks(self, two_stage: bool = True, release_tokens: bool = False):
+        """
+        Like parse_blocks, but yields the parse tree of each block, with whether it needed the
+        LL fallback, as soon as it is parsed, so that the caller can drop it before the next one.
+        With release_tokens, the token stream also drops the tokens of the blocks already parsed
+        (their trees keep the tokens they contain), so that only the caller keeps them alive.
+        """
+        stream = self.parser.getTokenStream()
+        released = 0
+        while stream.LA(1) != Token.EOF:
+            if release_tokens:
+                # The parser only looks back one token, to end the rule it exits; resetting it
+                # (for the LL fallback) seeks to the first token, so keep a placeholder there
+                for i in range(released, stream.index - 1):
+                    stream.tokens[i] = _RELEASED_TOKEN
+                released = max(released, stream.index - 1)
+            start = stream.index
+            rule = _SECTION_RULES.get(stream.LA(1), "policy")
+            if two_stage:
+                yield self.parse_two_stage(rule, start)
+            else:
+                yield getattr(self.parser, rule)(), False
+            if stream.index == start:
+                # Error recovery consumed nothing; skip the token it was reported at
+                stream.consume()
+
+
+class ParseStatistics:
+    """Counters on how often the two-stage parse had to fall back from SLL to LL."""
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Sets all counters back to zero."""
+        with self.__lock:
+            self.__documents = 0
+            self.__sll_parses = 0
+            self.__ll_fallbacks = 0
+
+    def record(self, fallback: bool):
+        """Records a two-stage parse, with or without LL fallback."""
+        with self.__lock:
+            self.__documents += 1
+            if fallback:
+                self.__ll_fallbacks += 1
+            else:
+                self.__sll_parses += 1
+
+    @property
+    def documents(self) -> int:
+        return self.__documents
+
+    @property
+    def sll_parses(self) -> int:
+        return self.__sll_parses
+
+    @property
+    def ll_fallbacks(self) -> int:
+        return self.__ll_fallbacks
+
+    @property
+    def fallback_rate(self) -> float:
+        return self.__ll_fallbacks / self.__documents if self.__documents else 0.0
+
+    def __str__(self):
+        return (f"{self.documents} documents, {self.sll_parses} parsed with SLL, "
+                f"{self.ll_fallbacks} LL fallbacks ({self.fallback_rate:.1%})")
+
+
+class ParserPool:
+    """
+    Thread-safe pool of reusable govdslLexer/govdslParser instances.
+
+    The ATN and DFA cache live on the generated classes, so they are shared by every
+    instance of the process. Each pooled instance is handed to one caller at a time,
+    which keeps the per-instance simulator state isolated between threads.
+
+    With a DFACache, the DFA learned by previous processes is loaded before warming up,
+    and save_dfa_cache() persists what this process learned.
+    """
+    def __init__(self, max_size: int = None, warm_up: bool = True, dfa_cache: DFACache = None):
+        self.__max_size = max_size if max_size is not None else (os.cpu_count() or 1)
+        self.__idle = []
+        self.__lock = threading.Lock()
+        self.__statistics = ParseStatistics()
+        self.__dfa_cache = dfa_cache
+        self.__cached_dfa_size = 0
+        if dfa_cache is not None and dfa_cache.load():
+            self.__cached_dfa_size = DFACache.dfa_size()
+        if warm_up:
+            self.warm_up()
+
+    @property
+    def max_size(self) -> int:
+        return self.__max_size
+
+    @property
+    def statistics(self) -> ParseStatistics:
+        return self.__statistics
+
+    @property
+    def dfa_cache(self) -> DFACache:
+        return self.__dfa_cache
+
+    def save_dfa_cache(self) -> bool:
+        """
+        Persists the DFA to the pool's DFACache if it learned new states since it was loaded.
+        Returns True if the cache file was written.
+        """
+        if self.__dfa_cache is None or DFACache.dfa_size() <= self.__cached_dfa_size:
+            return False
+        saved = self.__dfa_cache.save()
+        if saved:
+            self.__cached_dfa_size = DFACache.dfa_size()
+        return saved
+
+    def warm_up(self, texts: list[str] = None):
+        """Parses the given documents (or a built-in sample) to populate the shared DFA cache."""
+        for text in (texts or [_WARMUP_DOCUMENT]):
+            with self.checkout(text) as pooled:
+                pooled.parser.governance()
+
+    def _acquire(self) -> PooledParser:
+        with self.__lock:
+            if self.__idle:
+                return self.__idle.pop()
+        return PooledParser()
+
+    def _release(self, pooled: PooledParser):
+        # Drop references to the document so the pool does not keep it alive.
+        pooled.reset("")
+        with self.__lock:
+            if len(self.__idle) < self.__max_size:
+                self.__idle.append(pooled)
+
+    @contextmanager
+    def checkout(self, text: str, fast_lexer: bool = False, line: int = 1, column: int = 0):
+        """
+        Yields a PooledParser whose parser is ready to parse the given text, and returns it
+        to the pool afterwards. Syntax errors are reported to its error_listener. The recursion
+        limit is raised meanwhile if the text is nested too deeply for it (see nesting_allowance).
+        The text starts at the given line and column (see PooledParser.reset).
+        """
+        pooled = self._acquire()
+        try:
+            with nesting_allowance(text):
+                pooled.reset(text, fast_lexer, line, column)
+                yield pooled
+        finally:
+            self._release(pooled)
+
+    def parse(self, text: str, two_stage: bool = True, fast_lexer: bool = False,
+              symbols: 'SymbolTable' = None, compact: bool = False) -> list:
+        """
+        Parses the governance document and builds its policy objects.
+
+        Args:
+            text: The DSL text.
+            two_stage: Whether to try SLL prediction before full LL (see PooledParser.parse_two_stage).
+                Fallbacks are counted in the pool statistics.
+            fast_lexer: Whether to tokenize with govdslFastLexer instead of the ATN-based govdslLexer.
+            symbols: A SymbolTable with the scopes and participants the document refers to. Its
+                Scopes and Participants sections are then optional, and only add to the table.
+            compact: Whether to build the policies from the document's IR (see lower) instead of
+                its parse tree, so that only the tree of one top-level block is alive at a time.
+
+        Raises:
+            InvalidSyntaxException: If the lexer or parser reports a syntax error.
+        """
+        return run_nested(text, self._parse, text, two_stage, fast_lexer, symbols, compact)
+
+    def _parse(self, text: str, two_stage: bool, fast_lexer: bool, symbols: 'SymbolTable', compact: bool) -> list:
+        if compact:
+            document = self.lower(text, two_stage, fast_lexer, symbols)
+            builder = PolicyBuilder(document.scopes, document.participants, document.profiles, symbols=symbols)
+            return builder.build_ir(document.policies)
+        if symbols is not None:
+            return self._parse_with_symbols(text, two_stage, fast_lexer, symbols)
+        with self.checkout(text, fast_lexer) as pooled:
+            if two_stage:
+                tree, fallback = pooled.parse_two_stage()
+                self.__statistics.record(fallback)
+            else:
+                tree = pooled.parser.governance()
+            error_listener = pooled.error_listener
+        if error_listener.error_count:
+            raise InvalidSyntaxException(error_listener.error_message, error_listener.symbol)
+
+        return PolicyBuilder().build(tree)
+
+    def _parse_with_symbols(self, text: str, two_stage: bool, fast_lexer: bool, symbols: 'SymbolTable') -> list:
+        with self.checkout(text, fast_lexer) as pooled:
+            trees, fallback = pooled.parse_blocks(two_stage)
+            if two_stage:
+                self.__statistics.record(fallback)
+            error_listener = pooled.error_listener
+        if error_listener.error_count:
+            raise InvalidSyntaxException(error_listener.error_message, error_listener.symbol)
+        if not any(isinstance(tree, govdslParser.PolicyContext) for tree in trees):
+            raise InvalidSyntaxException("The document defines no policy.", "<EOF>")
+
+        # The builder constructs the policies when it leaves the governance context
+        governance = govdslParser.GovernanceContext(None)
+        for tree in trees:
+            governance.addChild(tree)
+        return PolicyBuilder(symbols=symbols).build(governance)
+
+    def lower(self, text: str, two_stage: bool = True, fast_lexer: bool = False,
+              symbols: 'SymbolTable' = None) -> DocumentIR:
+        """
+        Parses the document one top-level block at a time and lowers it to a DocumentIR: the
+        Scopes and Participants sections are built as soon as they are parsed, and each policy
+        is lowered to its PolicyIR (see grammar.ir). The parse tree of a block is dropped before
+        the next block is parsed. The policies are built with PolicyBuilder.build_ir.
+
+        Documents with syntax errors are parsed again as a whole, so that the error is the one
+        parse reports. Errors in the sections are only raised once the document is known to be
+        syntactically valid, as with parse.
+
+        Raises:
+            InvalidSyntaxException: If the lexer or parser reports a syntax error.
+        """
+        builder = PolicyBuilder(symbols=symbols)
+        policies = []
+        rules = []
+        section_error = None
+        with self.checkout(text, fast_lexer) as pooled:
+            fallback = False
+            for tree, block_fallback in pooled.iter_blocks(two_stage, release_tokens=True):
+                fallback = fallback or block_fallback
+                rules.append(tree.getRuleIndex())
+                if pooled.error_listener.error_count:
+                    continue
+                if isinstance(tree, govdslParser.PolicyContext):
+                    policies.append(lower_policy(tree))
+                elif section_error is None:
+                    try:
+                        builder.build(tree)
+                    except Exception as e:
+                        section_error = e
+            error_listener = pooled.error_listener
+        if two_stage:
+            self.__statistics.record(fallback)
+
+        if symbols is None:
+            # The governance rule: both sections, in this order, then the policies
+            valid = rules[:2] == [govdslParser.RULE_scopes, govdslParser.RULE_participants] and len(rules) > 2 \
+                and all(rule == govdslParser.RULE_policy for rule in rules[2:])
+            if error_listener.error_count or not valid:
+                with self.checkout(text, fast_lexer) as pooled:
+                    if two_stage:
+                        pooled.parse_two_stage()
+                    else:
+                        pooled.parser.governance()
+                    if pooled.error_listener.error_count:
+                        error_listener = pooled.error_listener
+        elif not error_listener.error_count and not policies:
+            raise InvalidSyntaxException("The document defines no policy.", "<EOF>")
+        if error_listener.error_count:
+            raise InvalidSyntaxException(error_listener.error_message, error_listener.symbol)
+        if section_error is not None:
+            raise section_error
+        return DocumentIR(builder.get_scopes(), builder.get_participants(), builder.get_profiles(), policies)
+
+    def validate(self, text: str, two_stage: bool = True, fast_lexer: bool = False) -> ValidationResult:
+        """
+        Parses and builds the governance document like parse, but records its errors in a
+        ValidationResult instead of raising the first one (see utils.validation.collect_errors).
+        Messages are only formatted when read. Syntax errors stop the validation before the
+        model is built; errors that construction cannot carry on from end it early.
+        """
+        return run_nested(text, self._validate, text, two_stage, fast_lexer)
+
+    def _validate(self, text: str, two_stage: bool, fast_lexer: bool) -> ValidationResult:
+        result = ValidationResult()
+        with self.checkout(text, fast_lexer) as pooled:
+            if two_stage:
+                tree, fallback = pooled.parse_two_stage()
+                self.__statistics.record(fallback)
+            else:
+                tree = pooled.parser.governance()
+            error_listener = pooled.error_listener
+        if error_listener.error_count:
+            for error in error_listener.errors:
+                result.add(InvalidSyntaxException, error, error.symbol)
+            return result
+
+        with collect_errors(result):
+            try:
+                PolicyBuilder().build(tree)
+            except Exception as e:
+                result.add_exception(e)
+        return result
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+def get_default_pool() -> ParserPool:
+    """
+    Returns the process-wide ParserPool, creating (and warming) it on first use.
+
+    If the GOVDSL_DFA_CACHE environment variable names a directory, the pool uses a DFACache
+    stored there: it is loaded on creation and updated when the process exits.
+    """
+    global _default_pool
+    if _default_pool is None:
+        with _default_pool_lock:
+            if _default_pool is None:
+                cache_dir = os.environ.get("GOVDSL_DFA_CACHE")
+                dfa_cache = DFACache(cache_dir) if cache_dir else None
+                _default_pool = ParserPool(dfa_cache=dfa_cache)
+                if dfa_cache is not None:
+                    atexit.register(_default_pool.save_dfa_cache)
+    return _default_pool
+
+def read_source(source: str | os.PathLike) -> str:
+    """Returns the text of a governance document given as text or as a path."""
+    if isinstance(source, os.PathLike):
+        return Path(source).read_text(encoding="utf-8")
+    return source
+
+def parse_governance(source: str | os.PathLike, pool: ParserPool = None, two_stage: bool = True,
+                     fast_lexer: bool = False, cache: ParseResultCache = None, symbols: 'SymbolTable' = None,
+                     compact: bool = False) -> list:
+    """
+    Parses a governance document and returns its root policies.
+
+    Args:
+        source: The DSL text, or a path (pathlib.Path / os.PathLike) to a .gov file.
+        pool: The ParserPool to take the parser from. Defaults to the process-wide pool.
+        two_stage: Whether to use the two-stage SLL/LL parse. Set to False to always use full LL.
+        fast_lexer: Whether to tokenize with the hand-written govdslFastLexer, which yields the
+            same tokens and lexical errors as the generated lexer without simulating its ATN.
+        cache: A ParseResultCache returning the policies of documents that were already parsed.
+            Cached policies are shared between callers and must not be modified. It is not used
+            together with symbols.
+        symbols: A SymbolTable with scopes and participants shared by many documents (see
+            grammar.symbols). The document may then leave out its Scopes and Participants sections.
+        compact: Whether to build the policies through the compact IR of the document (see
+            ParserPool.lower), which only keeps the parse tree of one top-level block at a time.
+
+    Returns:
+        The list of Policy instances defined at the top level of the document.
+
+    Raises:
+        InvalidSyntaxException: If the document is not syntactically valid.
+
+    Documents nested too deeply for the recursion limit are parsed in a dedicated thread with
+    a larger stack, and the limit is raised meanwhile (see run_nested and nesting_allowance).
+    The recursion limit is global to the interpreter, so other threads of the process also get
+    the higher limit until the parse ends.
+    """
+    text = read_source(source)
+    pool = pool or get_default_pool()
+    if symbols is not None:
+        return pool.parse(text, two_stage=two_stage, fast_lexer=fast_lexer, symbols=symbols, compact=compact)
+    if cache is not None:
+        policies = cache.get(text)
+        if policies is not None:
+            return policies
+    policies = pool.parse(text, two_stage=two_stage, fast_lexer=fast_lexer, compact=compact)
+    if cache is not None:
+        cache.put(text, policies)
+    return policies
+
+def validate_governance(source: str | os.PathLike, pool: ParserPool = None, two_stage: bool = True,
+                        fast_lexer: bool = False) -> ValidationResult:
+    """
+    Checks a governance document without raising: returns a ValidationResult with the code
+    and arguments of each error found (see ParserPool.validate), so that many documents can be
+    counted or classified cheaply. The arguments are the same as for parse_governance.
+    """
+    pool = pool or get_default_pool()
+    return pool.validate(read_source(source), two_stage=two_stage, fast_lexer=fast_lexer)
@@ -0,0 +1,76 @@
+from antlr4 import ParserRuleContext
+from antlr4.atn.Transition import RuleTransition
+from .govdslListener import govdslListener
+from .govdslParser import govdslParser
+from .PolicyCreationListener import PolicyCreationListener
+
+
+def _rule_calls() -> list[set[int]]:
+    """Returns, for each parser rule, the indexes of the rules it invokes (read from the ATN)."""
+    calls = [set() for _ in govdslParser.ruleNames]
+    for state in govdslParser.atn.states:
+        if state is None:
+            continue
+        for transition in state.transitions:
+            if isinstance(transition, RuleTransition):
+                calls[state.ruleIndex].add(transition.target.ruleIndex)
+    return calls
+
+
+class PolicyBuilder(PolicyCreationListener):
+    """
+    Builds the governance model from a parse tree in a single targeted pass.
+
+    It runs the same handlers as PolicyCreationListener, and thus builds identical objects,
+    but dispatches on the rule index of each context instead of going through a
+    ParseTreeWalker: terminal nodes are never visited, handlers that are not overridden are
+    never called, and subtrees whose rules cannot contain any handled rule are skipped.
+    """
+    # Per builder class: (enter handlers, exit handlers, whether to visit the children), by rule index
+    _dispatch = {}
+
+    @classmethod
+    def _dispatch_table(cls) -> tuple:
+        table = PolicyBuilder._dispatch.get(cls)
+        if table is None:
+            enters, exits = [], []
+            for rule in govdslParser.ruleNames:
+                name = rule[0].upper() + rule[1:]
+                enter, exit = getattr(cls, "enter" + name), getattr(cls, "exit" + name)
+                enters.append(enter if enter is not getattr(govdslListener, "enter" + name) else None)
+                exits.append(exit if exit is not getattr(govdslListener, "exit" + name) else None)
+
+            # A subtree is only visited if some rule reachable from its root is handled
+            calls = _rule_calls()
+            descend = []
+            for rule_index in range(len(calls)):
+                reachable, pending = set(), list(calls[rule_index])
+                while pending:
+                    callee = pending.pop()
+                    if callee not in reachable:
+                        reachable.add(callee)
+                        pending.extend(calls[callee])
+                descend.append(any(enters[r] or exits[r] for r in reachable))
+            table = PolicyBuilder._dispatch[cls] = (enters, exits, descend)
+        return table
+
+    def build(self, tree: ParserRuleContext) -> list:
+        """Builds the model from a governance parse tree and returns the root policies."""
+        enters, exits, descend = self._dispatch_table()
+        # Entries are (context, True) to enter a context and (context, False) to exit it
+        stack = [(tree, True)]
+        while stack:
+            ctx, entering = stack.pop()
+            rule_index = ctx.getRuleIndex()
+            if not entering:
+                exits[rule_index](self, ctx)
+                continue
+            enter = enters[rule_index]
+            if enter is not None:
+                enter(self, ctx)
+            if exits[rule_index] is not None:
+                stack.append((ctx, False))
+            if descend[rule_index] and ctx.children:
+                stack.extend((child, True) for child in reversed(ctx.children)
+                             if isinstance(child, ParserRuleContext))
+        return self.get_policies()
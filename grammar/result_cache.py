@@ -0,0 +1,144 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from .dfa_cache import grammar_hash
+
+_ROOT = Path(__file__).parent.parent
+
+# Packages whose modules take part in turning a document into policy objects
+MODEL_PACKAGES = [_ROOT / "grammar", _ROOT / "metamodel", _ROOT / "utils"]
+
+
+def model_files() -> list[Path]:
+    """Returns every Python module of MODEL_PACKAGES, in a stable order."""
+    return sorted(path for package in MODEL_PACKAGES for path in package.rglob("*.py")
+                  if "__pycache__" not in path.parts)
+
+def model_version() -> str:
+    """
+    Returns the key identifying the current grammar and metamodel: a hash of grammar_hash()
+    and of every module of the grammar, metamodel and utils packages, so that cached models
+    are discarded as soon as either the parser or the model construction changes.
+    """
+    digest = hashlib.sha256(grammar_hash().encode("utf-8"))
+    for path in model_files():
+        digest.update(path.relative_to(_ROOT).as_posix().encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+class ParseResultCache:
+    """
+    Content-addressed cache of constructed policy models.
+
+    Entries are keyed by a hash of the document text and of model_version(), and are kept
+    in memory with least-recently-used eviction. With a directory, they are also pickled
+    to disk, so other processes parsing the same text can reuse them. Only load a directory
+    you trust, as unpickling can run arbitrary code.
+
+    Cached policies are shared between all callers asking for the same text, so they must be
+    treated as read-only.
+    """
+    def __init__(self, max_entries: int = 128, directory: str | os.PathLike = None):
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be at least 1, but got {max_entries}.")
+        self.__max_entries = max_entries
+        self.__directory = Path(directory) if directory is not None else None
+        self.__version = model_version()
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def max_entries(self) -> int:
+        return self.__max_entries
+
+    @property
+    def directory(self) -> Path:
+        return self.__directory
+
+    @property
+    def hits(self) -> int:
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        return self.__misses
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def key(self, text: str) -> str:
+        """Returns the cache key of a document text."""
+        digest = hashlib.sha256(self.__version.encode("utf-8"))
+        digest.update(text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.__directory / f"govdsl-model-{key}.pickle"
+
+    def get(self, text: str) -> list:
+        """Returns the cached policies of the document text, or None if it is not cached."""
+        key = self.key(text)
+        with self.__lock:
+            policies = self.__entries.get(key)
+            if policies is not None:
+                self.__entries.move_to_end(key)
+                self.__hits += 1
+                return list(policies)
+        if self.__directory is not None:
+            policies = self._load(key)
+            if policies is not None:
+                self._remember(key, policies)
+                with self.__lock:
+                    self.__hits += 1
+                return list(policies)
+        with self.__lock:
+            self.__misses += 1
+        return None
+
+    def put(self, text: str, policies: list):
+        """Stores the policies built from the document text."""
+        key = self.key(text)
+        self._remember(key, list(policies))
+        if self.__directory is not None:
+            self._store(key, policies)
+
+    def clear(self):
+        """Empties the in-memory cache. Files on disk are kept."""
+        with self.__lock:
+            self.__entries.clear()
+            self.__hits = 0
+            self.__misses = 0
+
+    def _remember(self, key: str, policies: list):
+        with self.__lock:
+            self.__entries[key] = policies
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_entries:
+                self.__entries.popitem(last=False)
+
+    def _load(self, key: str) -> list:
+        try:
+            with open(self._path(key), "rb") as file:
+                return pickle.load(file)
+        except Exception:
+            # A missing, truncated or otherwise unreadable entry is a miss and gets rewritten
+            return None
+
+    def _store(self, key: str, policies: list):
+        self.__directory.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so concurrent readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.__directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                pickle.dump(list(policies), file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
@@ -0,0 +1,120 @@
+from utils.exceptions import UndefinedAttributeException, DuplicateAttributeException
+from utils.validation import report
+from utils.chp_extension import Label, PullRequest, Repository, Issue, MemberLifecycle, Patch
+from utils.attribute_converters import str_to_status_enum, str_to_action_enum, str_to_member_action_enum
+from metamodel.governance import Scope, Project, Activity, Task
+from .govdslParser import govdslParser
+
+
+class ScopeBuilder:
+    """
+    Builds the scope hierarchy of a Scopes section (projects, activities, tasks, patches and
+    member lifecycle tasks) in a single pass over its parse tree.
+
+    Scopes are registered by name in the scopes map given (e.g., the one of a
+    PolicyCreationListener) and by parent in children, as they are created. A name defined
+    twice in the section is reported as a DuplicateAttributeException and the first scope
+    is kept; names already in the map beforehand (shared scopes) may be redefined.
+    """
+    def __init__(self, scopes: dict = None):
+        self.scopes = scopes if scopes is not None else {}
+        self.children = {}      # Parent scope name -> its activities or tasks
+        self.__defined = set()
+
+    def build(self, ctx: govdslParser.ScopesContext) -> list[Scope]:
+        """Builds the scopes of the section and returns the top-level ones."""
+        top_level = []
+        for child in ctx.getChildren():
+            if isinstance(child, govdslParser.ProjectsContext):
+                top_level.extend(self._project(p) for p in child.project())
+            elif isinstance(child, govdslParser.ActivitiesContext):
+                top_level.extend(self._activity(a, None) for a in child.activity())
+            elif isinstance(child, govdslParser.TasksContext):
+                top_level.extend(self._task(t, None) for t in child.task())
+        return top_level
+
+    def _register(self, scope: Scope, parent: Scope = None):
+        name = scope.name
+        if name in self.__defined:
+            report(DuplicateAttributeException, "scope", name, "name")
+            return
+        self.__defined.add(name)
+        self.scopes[name] = scope
+        if parent is not None:
+            self.children.setdefault(parent.name, []).append(scope)
+
+    def _project(self, ctx: govdslParser.ProjectContext) -> Project:
+        project = Project(name=ctx.ID().getText(), status=None)
+        if ctx.platform():
+            # The platform will be used when we define further platforms
+            repo_id = ctx.repoID().ID().getText()
+            if '/' in repo_id:
+                owner, repo = repo_id.split('/', 1)
+                repo_id = f"{owner}/{repo}"
+            project = Repository.from_project(project=project, repo_id=repo_id)
+        self._register(project)
+        activity_contexts = ctx.activity()
+        if activity_contexts:
+            project.activities = {self._activity(a, project) for a in activity_contexts}
+        return project
+
+    def _activity(self, ctx: govdslParser.ActivityContext, project: Project) -> Activity:
+        activity = Activity(name=ctx.ID().getText(), status=None)
+        activity.project = project
+        self._register(activity, project)
+        task_contexts = ctx.task()
+        if task_contexts:
+            activity.tasks = {self._task(t, activity) for t in task_contexts}
+        return activity
+
+    def _task(self, ctx: govdslParser.TaskContext, activity: Activity) -> Task:
+        """Creates the Task (or Patch / MemberLifecycle) declared by a task context."""
+        task_name = ctx.ID().getText()
+        status = None
+        patch_task = ctx.patchTask()
+        member_task = ctx.memberTask() if patch_task is None else None
+        if patch_task:
+            content = patch_task.patchTaskContent()
+            if content and content.status():
+                status = str_to_status_enum(content.status().statusEnum().getText())
+            task = self._patch(task_name, status, patch_task.patchTaskType().getText().lower(), content)
+        elif member_task:
+            action = None
+            member_content = member_task.memberTaskContent()
+            if member_content:
+                action = str_to_member_action_enum(member_content.memberAction().memberActionEnum().getText())
+            task = MemberLifecycle(name=task_name, status=status, action=action)
+        else:
+            task = Task(name=task_name, status=status)
+        if activity is not None:
+            task.activity = activity
+        self._register(task, activity)
+        return task
+
+    @staticmethod
+    def _patch(task_name: str, status, task_type: str, content: govdslParser.PatchTaskContentContext) -> Task:
+        """Creates the Patch of a pull request or issue task, or a plain Task for other task types."""
+        action_with_labels = content.actionWithLabels() if content else None
+        labels = None
+        if action_with_labels:
+            labels = {Label.intern(name=l_id.getText()) for l_id in action_with_labels.labels().ID()}
+
+        if task_type == "pull request":
+            element = PullRequest(name=task_name, labels=labels)
+        elif task_type == "issue":
+            element = Issue(name=task_name, labels=labels)
+        else:
+            element = None
+
+        patch_action = content.patchAction() if content else None
+        if patch_action:
+            action = str_to_action_enum(patch_action.patchActionEnum().getText())
+        elif action_with_labels:
+            action = str_to_action_enum(action_with_labels.patchAction().patchActionEnum().getText())
+        else:
+            raise UndefinedAttributeException("action", "This task must have an action defined.")
+
+        if element is None:
+            # Fallback if no matching CHP element type
+            return Task(name=task_name, status=status)
+        return Patch(name=task_name, status=status, action=action, element=element)
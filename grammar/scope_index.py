@@ -0,0 +1,130 @@
+from bisect import bisect_left
+from metamodel.governance import Policy, Scope, Project, Activity, Task
+
+
+class ScopeIndex:
+    """
+    Resolves the policies governing a scope: those defined on the scope itself and on its
+    ancestors (the activity of a task, the project of an activity), most specific first.
+
+    The scope trees below the scopes of the policies are numbered in depth-first order, so each
+    scope covers the contiguous range of positions of its subtree (an Euler tour), and the
+    governing policies of every scope are computed once. policies_for() is then a dictionary
+    lookup, and policies_for_tasks() finds, by bisection, the scopes with policies inside a scope
+    and whether they contain tasks of the requested type.
+    """
+    def __init__(self, policies: list[Policy]):
+        own = {}
+        for policy in policies:
+            if policy.scope is not None:
+                own.setdefault(policy.scope.name, []).append(policy)
+
+        # Roots of the trees containing a governed scope
+        roots = {}
+        for scopes in own.values():
+            root = scopes[0].scope
+            while _parent(root) is not None:
+                root = _parent(root)
+            roots.setdefault(root.name, root)
+
+        self.__own = own
+        self.__governing = {}
+        self.__range = {}
+        self.__governed = []    # (position, scope) of the scopes with policies, in order
+        self.__tasks = []       # (position, task), in order
+        self.__matching = {}    # positions of the tasks of a type and attributes, computed on first query
+        position = 0
+        # Scopes to number, with the governing policies of their parent (None once their subtree is numbered)
+        pending = [(root, ()) for root in sorted(roots.values(), key=_name, reverse=True)]
+        while pending:
+            scope, inherited = pending.pop()
+            if inherited is None:
+                self.__range[scope.name] = (self.__range[scope.name][0], position)
+                continue
+            if scope.name in self.__range:
+                continue
+            policies_here = own.get(scope.name)
+            governing = tuple(policies_here) + inherited if policies_here else inherited
+            self.__governing[scope.name] = governing
+            self.__range[scope.name] = (position, position)
+            if policies_here:
+                self.__governed.append((position, scope))
+            if isinstance(scope, Task):
+                self.__tasks.append((position, scope))
+            position += 1
+            pending.append((scope, None))
+            pending.extend((child, governing) for child in sorted(_children(scope), key=_name, reverse=True))
+
+    def policies_for(self, scope: Scope) -> tuple[Policy, ...]:
+        """Returns the policies governing a scope, from its own to those of its project."""
+        governing = self.__governing.get(scope.name)
+        while governing is None:
+            # A scope outside of the indexed trees is only governed through an indexed ancestor
+            scope = _parent(scope)
+            if scope is None:
+                return ()
+            governing = self.__governing.get(scope.name)
+        return governing
+
+    def policies_for_tasks(self, scope: Scope, task_type: type = Task, **attributes) -> list[Policy]:
+        """
+        Returns the policies governing any task of the given type (and subclasses) within a
+        scope, e.g. the Patch tasks of a repository with action=PatchAction.MERGE: the policies
+        governing the scope, then those of its activities and tasks containing such a task.
+        Tasks must have the given (hashable) attribute values to be considered.
+        """
+        if scope.name not in self.__range:
+            return list(self.policies_for(scope)) if isinstance(scope, task_type) else []
+        start, end = self.__range[scope.name]
+        positions = self.__matching_positions(task_type, attributes)
+        if not _contains(positions, start, end):
+            return []
+        policies = {id(policy): policy for policy in self.policies_for(scope)}
+        first = bisect_left(self.__governed, start + 1, key=_position)
+        last = bisect_left(self.__governed, end, key=_position)
+        for _, governed in self.__governed[first:last]:
+            if _contains(positions, *self.__range[governed.name]):
+                policies.update((id(policy), policy) for policy in self.__own[governed.name])
+        return list(policies.values())
+
+    def __matching_positions(self, task_type: type, attributes: dict) -> list[int]:
+        key = (task_type, tuple(sorted(attributes.items())))
+        positions = self.__matching.get(key)
+        if positions is None:
+            positions = [position for position, task in self.__tasks
+                         if isinstance(task, task_type)
+                         and all(getattr(task, name, None) == value for name, value in attributes.items())]
+            self.__matching[key] = positions
+        return positions
+
+    def __len__(self):
+        return len(self.__governing)
+
+    def __repr__(self):
+        return f"ScopeIndex({len(self.__governing)} scopes)"
+
+def _parent(scope: Scope) -> Scope | None:
+    """The activity of a task or the project of an activity, if defined."""
+    if isinstance(scope, Task):
+        return scope.activity
+    if isinstance(scope, Activity):
+        return scope.project
+    return None
+
+def _children(scope: Scope) -> set:
+    if isinstance(scope, Project):
+        return scope.activities or ()
+    if isinstance(scope, Activity):
+        return scope.tasks or ()
+    return ()
+
+def _name(scope: Scope) -> str:
+    return scope.name
+
+def _position(entry: tuple) -> int:
+    return entry[0]
+
+def _contains(positions: list[int], start: int, end: int) -> bool:
+    """Whether the sorted positions include one in [start, end)."""
+    index = bisect_left(positions, start)
+    return index < len(positions) and positions[index] < end
@@ -0,0 +1,354 @@
+import io
+import os
+import re
+from collections import deque
+from typing import Iterable, Iterator, TextIO
+from antlr4 import Token
+from utils.exceptions import (
+    InvalidSyntaxException, DuplicateAttributeException, CyclicReferenceException, UndefinedAttributeException
+)
+from .diagnostics import Diagnostic
+from .fast_lexer import _ID, _KEYWORDS
+from .govErrorListener import SyntaxErrorCode
+from .parsing import ParserPool, get_default_pool
+from .policy_builder import PolicyBuilder
+
+# Braces and identifiers (keywords included), the only tokens needed to split a document in blocks
+_SCAN = re.compile(r"[{}]|" + _ID.pattern)
+_POLICY_KEYWORDS = frozenset(("MajorityPolicy", "LeaderDrivenPolicy", "AbsoluteMajorityPolicy", "ConsensusPolicy",
+                              "LazyConsensusPolicy", "VotingPolicy", "ComposedPolicy"))
+
+
+class _Block:
+    """
+    A top-level section of a document being streamed: the Scopes or Participants section, or
+    one policy block. The kind is the parser rule for the block, line and column its position
+    in the document, and declared the names of the policies it defines (nested ones included).
+    """
+    def __init__(self, kind: str, line: int, column: int):
+        self.kind = kind
+        self.line = line
+        self.column = column
+        self.parts = []
+        self.declared = []
+
+    @property
+    def text(self) -> str:
+        return "".join(self.parts)
+
+
+def _iter_lines(source: str | os.PathLike | TextIO) -> Iterator[str]:
+    if isinstance(source, os.PathLike):
+        with open(source, "r", encoding="utf-8") as file:
+            yield from file
+    elif isinstance(source, str):
+        yield from io.StringIO(source)
+    else:
+        yield from source
+
+def _iter_blocks(lines: Iterable[str]) -> Iterator[_Block]:
+    """
+    Splits a document in its top-level blocks as its lines are read. govdsl has no comments
+    nor strings and its tokens never span lines, so braces and keywords can be found line by
+    line without running the lexer: a block ends where the next one starts, at 'Participants'
+    and then at each policy keyword, at depth 0. Errors are left for the parser to report.
+    """
+    block = _Block("scopes", 1, 0)
+    depth = 0
+    previous = None
+    for line_number, line in enumerate(lines, start=1):
+        start = 0
+        for match in _SCAN.finditer(line):
+            word = match.group()
+            if word == "{":
+                depth += 1
+            elif word == "}":
+                depth -= 1
+            elif depth == 0 and (word == "Participants" if block.kind == "scopes" else word in _POLICY_KEYWORDS):
+                block.parts.append(line[start:match.start()])
+                yield block
+                block = _Block("participants" if block.kind == "scopes" else "policy", line_number, match.start())
+                start = match.start()
+            if previous in _POLICY_KEYWORDS and word not in _KEYWORDS and word not in "{}":
+                block.declared.append(word)
+            previous = word
+        block.parts.append(line[start:])
+    yield block
+
+
+class _StreamingBuilder(PolicyBuilder):
+    """
+    PolicyBuilder fed one top-level block at a time. The policies of each block are built as
+    soon as every policy they refer to is built; references to policies that are not defined
+    yet wait for the block defining them, and are only reported as errors by finish().
+
+    With a diagnostics list, errors are appended to it instead of being raised: a policy that
+    cannot be built is left out, together with the policies referring to it.
+    """
+    def __init__(self, diagnostics: list = None):
+        super().__init__()
+        self.__diagnostics = diagnostics
+        self.__dependencies = {}    # Unbuilt node -> the nodes it needs
+        self.__dependents = {}      # Unbuilt node -> the nodes waiting for it
+        self.__pending = {}         # Unbuilt node -> number of unbuilt or undefined dependencies
+        self.__awaited = {}         # Undefined policy ID -> the nodes referring to it
+        self.__locations = {}       # Top-level policy name -> (line, column) of its block
+        self.__failed = set()       # Names of the top-level policies that could not be built
+
+    def _report(self, error: Exception, policy: str = None, location: tuple = None):
+        if self.__diagnostics is None:
+            raise error
+        line, column = location or self.__locations.get(policy, (None, None))
+        self.__diagnostics.append(Diagnostic.from_exception(error, line, column, policy))
+
+    @staticmethod
+    def _root(node):
+        while node.parent is not None:
+            node = node.parent
+        return node
+
+    def add_block(self, block: _Block, tree) -> list:
+        """Builds a parsed block and returns the top-level policies that could be completed."""
+        location = (block.line, block.column)
+        if block.kind != "policy":
+            try:
+                self.build(tree)
+            except Exception as e:
+                self._report(e, location=location)
+            return []
+        name = block.declared[0]
+        for i, declared in enumerate(block.declared):
+            if declared in self.policy_tree or declared in block.declared[:i]:
+                self._report(DuplicateAttributeException("policy", declared, "name"), name, location)
+                return []
+        self.__locations[name] = location
+        try:
+            self.build(tree)
+        except Exception as e:
+            self._discard(block)
+            self._report(e, name)
+            return []
+        return self._construct_block(self.policy_tree[name])
+
+    def _discard(self, block: _Block):
+        """Forgets the policies of a block whose walk failed half-way."""
+        for name in block.declared:
+            self.policy_tree.pop(name, None)
+            self.referenced_policies.discard(name)
+            self._release_policy_attributes(name)
+        self.policy_stack.clear()
+        self.composed_policy_stack.clear()
+
+    def _construct_block(self, root) -> list:
+        nodes = []
+        pending_nodes = [root]
+        while pending_nodes:
+            node = pending_nodes.pop()
+            nodes.append(node)
+            pending_nodes.extend(node.children)
+
+        # Earlier nodes referring to a policy of this block now wait for its node instead
+        for node in nodes:
+            for waiting in self.__awaited.pop(node.policy_id, ()):
+                self.__dependents.setdefault(node, []).append(waiting)
+                self.__dependencies[waiting].append(node)
+
+        ready = deque()
+        for node in nodes:
+            undefined = []
+            dependencies = self._policy_dependencies(node, undefined)
+            pending = len(undefined)
+            for policy_id in undefined:
+                self.__awaited.setdefault(policy_id, []).append(node)
+            for dependency in dependencies:
+                if dependency.policy_object is None:
+                    self.__dependents.setdefault(dependency, []).append(node)
+                    pending += 1
+            if pending:
+                self.__pending[node] = pending
+                self.__dependencies[node] = dependencies
+            else:
+                ready.append(node)
+
+        completed = []
+        while ready:
+            node = ready.popleft()
+            if not self._construct(node):
+                continue
+            for dependent in self.__dependents.pop(node, ()):
+                self.__pending[dependent] -= 1
+                if self.__pending[dependent] == 0:
+                    del self.__pending[dependent]
+                    del self.__dependencies[dependent]
+                    ready.append(dependent)
+            if node.parent is None and node.policy_id not in self.referenced_policies:
+                completed.append(node)
+
+        # Completed policies no longer need the attributes collected for them
+        for node in completed:
+            subtree = [node]
+            for child in subtree:
+                subtree.extend(child.children)
+                self._release_policy_attributes(child.policy_id)
+        return [node.policy_object for node in completed]
+
+    def _construct(self, node) -> bool:
+        """
+        Builds the object of a node and, for a top-level policy, validates the whole policy.
+        Returns False if that failed, in which case the policies waiting for it are never built.
+        """
+        root = self._root(node)
+        try:
+            self._construct_policy_object(node)
+            if node is root:
+                subtree = [node]
+                for child in subtree:
+                    subtree.extend(child.children)
+                for child in subtree:
+                    child.policy_object.validate()
+        except Exception as e:
+            node.policy_object = None
+            self.__failed.add(root.policy_id)
+            self._report(e, root.policy_id)
+            return False
+        return True
+
+    def finish(self):
+        """
+        Reports the policies that are still waiting for policies that were never built.
+
+        Raises:
+            UndefinedAttributeException: If a policy refers to a policy that was never defined.
+            CyclicReferenceException: If policies refer to each other in a cycle.
+        """
+        if self.__diagnostics is None:
+            if self.__awaited:
+                waiting = next(iter(self.__awaited.values()))[0]
+                self._policy_dependencies(waiting)
+            if self.__pending:
+                raise CyclicReferenceException(self._find_reference_cycle(self.__dependencies, self.__pending))
+            return
+
+        # Report each policy once, with the first reason found: an undefined reference, a reference
+        # to a policy that could not be built or, when only cycles are left, a cycle
+        reported = set(self.__failed)
+        remaining = list(self.__pending)
+        while remaining:
+            waiting = []
+            for node in remaining:
+                root = self._root(node).policy_id
+                if root in reported:
+                    continue
+                try:
+                    self._policy_dependencies(node)
+                except UndefinedAttributeException as e:
+                    reported.add(root)
+                    self._report(e, root)
+                    continue
+                broken = [d.policy_id for d in self.__dependencies[node]
+                          if d.policy_object is None and self._root(d).policy_id in reported]
+                if broken:
+                    reported.add(root)
+                    line, column = self.__locations.get(root, (None, None))
+                    self.__diagnostics.append(Diagnostic(
+                        Diagnostic.SEMANTIC, f"Referenced policy '{broken[0]}' could not be built.", line, column, root))
+                else:
+                    waiting.append(node)
+            if waiting and len(waiting) == len(remaining):
+                cycle = self._find_reference_cycle(self.__dependencies, dict.fromkeys(waiting, 1))
+                self._report(CyclicReferenceException(cycle), self._root(self.policy_tree[cycle[0]]).policy_id)
+                reported.update(self._root(self.policy_tree[policy_id]).policy_id for policy_id in cycle)
+            remaining = waiting
+
+
+def parse_streaming(source: str | os.PathLike | TextIO, pool: ParserPool = None, two_stage: bool = True,
+                    fast_lexer: bool = True, diagnostics: list = None) -> Iterator:
+    """
+    Parses a governance document block by block and yields its root policies as they are built.
+
+    The Scopes and Participants sections are parsed first; then each top-level policy block
+    is parsed on its own, built, and its parse tree dropped, so memory stays proportional to
+    the largest block rather than to the whole document. Files are read line by line.
+
+    A policy is yielded as soon as the policies it refers to are built: policies that refer to
+    policies defined further down are held back until then, so policies are yielded in
+    completion order, which is document order when there are no such forward references.
+    Valid documents yield the same policies as parse_governance.
+
+    Errors are raised while iterating, when the block containing them is reached, with
+    positions in the whole document. Policies yielded before an error are complete.
+
+    Args:
+        source: The DSL text, a path (pathlib.Path / os.PathLike) to a .gov file, or a text file.
+        pool: The ParserPool to take the parser from. Defaults to the process-wide pool.
+        two_stage: Whether to use the two-stage SLL/LL parse. Set to False to always use full LL.
+        fast_lexer: Whether to tokenize with govdslFastLexer.
+        diagnostics: If given, every error is appended to this list as a Diagnostic instead of
+            being raised. Blocks with syntax errors are skipped, as are policies that cannot be
+            built, and every other policy is still yielded (see parse_with_diagnostics).
+
+    Raises:
+        InvalidSyntaxException: If the document is not syntactically valid.
+        DuplicateAttributeException: If two policies have the same name.
+        CyclicReferenceException: If policies refer to each other in a cycle.
+    """
+    pool = pool or get_default_pool()
+    builder = _StreamingBuilder(diagnostics)
+    policies = 0
+    for block in _iter_blocks(_iter_lines(source)):
+        policy = block.declared[0] if block.kind == "policy" and block.declared else None
+        policies += block.kind == "policy"
+        with pool.checkout(block.text, fast_lexer, block.line, block.column) as pooled:
+            if two_stage:
+                tree, fallback = pooled.parse_two_stage(block.kind)
+                pool.statistics.record(fallback)
+            else:
+                tree = getattr(pooled.parser, block.kind)()
+            error_listener = pooled.error_listener
+            trailing = pooled.parser.getTokenStream().LT(1)
+        if error_listener.error_count:
+            if diagnostics is None:
+                raise InvalidSyntaxException(error_listener.error_message, error_listener.symbol)
+            diagnostics.extend(Diagnostic(Diagnostic.SYNTAX, error.description, error.line, error.column, policy,
+                                          error.symbol, code=error.code.value) for error in error_listener.errors)
+            if error_listener.truncated:
+                diagnostics.append(Diagnostic(Diagnostic.SYNTAX, f"{error_listener.error_count - len(error_listener.errors)} "
+                                              f"more syntax errors in this block were not recorded.", block.line,
+                                              block.column, policy))
+            continue
+        if trailing.type != Token.EOF:
+            # The block rule stopped before the end of the block, where the governance rule would have failed
+            message = f"extraneous input '{trailing.text}' after the {block.kind} block"
+            if diagnostics is None:
+                raise InvalidSyntaxException(f"line {trailing.line}:{trailing.column} {message}", trailing.text)
+            diagnostics.append(Diagnostic(Diagnostic.SYNTAX, message, trailing.line, trailing.column,
+                                          policy, trailing.text, code=SyntaxErrorCode.EXTRANEOUS_INPUT.value))
+            continue
+        yield from builder.add_block(block, tree)
+        # Drop the parse tree before reading the next block
+        del tree
+    if not policies:
+        if diagnostics is None:
+            raise InvalidSyntaxException("The document defines no policy.", "<EOF>")
+        diagnostics.append(Diagnostic(Diagnostic.SYNTAX, "The document defines no policy.", symbol="<EOF>"))
+    builder.finish()
+
+
+def parse_with_diagnostics(source: str | os.PathLike | TextIO, pool: ParserPool = None, two_stage: bool = True,
+                           fast_lexer: bool = True) -> tuple[list, list[Diagnostic]]:
+    """
+    Parses a governance document, collecting every syntax and semantic error instead of
+    stopping at the first one.
+
+    Each top-level policy block is parsed and built on its own, so an error only drops the
+    policy containing it (and the policies referring to that policy), while all other
+    policies are still built. See parse_streaming for the arguments.
+
+    Returns:
+        The root policies that could be built, in completion order, and the diagnostics
+        sorted by position.
+    """
+    diagnostics = []
+    policies = list(parse_streaming(source, pool, two_stage, fast_lexer, diagnostics))
+    diagnostics.sort(key=Diagnostic.sort_key)
+    return policies, diagnostics
@@ -0,0 +1,73 @@
+import os
+from types import MappingProxyType
+from utils.exceptions import InvalidSyntaxException
+from .govdslParser import govdslParser
+from .parsing import ParserPool, get_default_pool, read_source
+from .policy_builder import PolicyBuilder
+
+
+class SymbolTable:
+    """
+    Scopes, participants (roles, individuals and agents) and profiles, by name, built once
+    and shared by every document that refers to them.
+
+    Documents parsed with a SymbolTable (parse_governance(source, symbols=table)) may leave out
+    their Scopes and Participants sections: they only parse and build their own policies, which
+    refer to the objects of the table instead of copies. Sections they still define are added
+    to the table for that document only. The table itself is read-only, and so are its objects:
+    a document assigning members to one of its roles (or a role to one of its individuals in a
+    policy) gets its own copy of it.
+    """
+    def __init__(self, scopes: dict = None, participants: dict = None, profiles: dict = None):
+        self.__scopes = MappingProxyType(dict(scopes or {}))
+        self.__participants = MappingProxyType(dict(participants or {}))
+        self.__profiles = MappingProxyType(dict(profiles or {}))
+
+    @property
+    def scopes(self) -> MappingProxyType:
+        return self.__scopes
+
+    @property
+    def participants(self) -> MappingProxyType:
+        return self.__participants
+
+    @property
+    def profiles(self) -> MappingProxyType:
+        return self.__profiles
+
+    @classmethod
+    def from_listener(cls, listener) -> 'SymbolTable':
+        """Creates the table of the scopes and participants a PolicyCreationListener has built."""
+        return cls(listener.get_scopes(), listener.get_participants(), listener.get_profiles())
+
+    @classmethod
+    def from_document(cls, source: str | os.PathLike, pool: ParserPool = None,
+                      fast_lexer: bool = False, symbols: 'SymbolTable' = None) -> 'SymbolTable':
+        """
+        Builds the table of the Scopes and Participants sections of a document (the text or a
+        path to a .gov file). Either section may be missing; policies, if any, are ignored.
+        The sections may refer to the elements of another table given as symbols, which the
+        new table then also contains.
+
+        Raises:
+            InvalidSyntaxException: If the document is not syntactically valid.
+        """
+        pool = pool or get_default_pool()
+        with pool.checkout(read_source(source), fast_lexer) as pooled:
+            trees, _ = pooled.parse_blocks()
+            error_listener = pooled.error_listener
+        if error_listener.error_count:
+            raise InvalidSyntaxException(error_listener.error_message, error_listener.symbol)
+
+        builder = PolicyBuilder(symbols=symbols)
+        for tree in trees:
+            if not isinstance(tree, govdslParser.PolicyContext):
+                builder.build(tree)
+        return cls.from_listener(builder)
+
+    def __len__(self):
+        return len(self.__scopes) + len(self.__participants) + len(self.__profiles)
+
+    def __repr__(self):
+        return (f"SymbolTable({len(self.__scopes)} scopes, {len(self.__participants)} participants, "
+                f"{len(self.__profiles)} profiles)")
@@ -0,0 +1,84 @@
+from bisect import bisect_left
+from heapq import merge
+from antlr4.tree.Tree import ParseTree
+
+
+def iter_descendants(node: ParseTree, target_type):
+    """
+    Yields the node and its descendants that are instances of target_type (a class or a tuple
+    of classes), in document order (pre-order, children left to right). The tree is walked
+    with an explicit stack, so its depth is not limited by the recursion limit.
+    """
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, target_type):
+            yield node
+        children = getattr(node, "children", None)
+        if children:
+            stack.extend(reversed(children))
+
+
+class ParseTreeIndex:
+    """
+    Index of the nodes of a parse tree by type, built in a single walk.
+
+    find() then returns the nodes of a type in (a subtree of) the tree without walking it
+    again, so any number of queries over the same tree costs one walk plus the size of their
+    results. The tree must not be modified while the index is in use.
+    """
+    def __init__(self, tree: ParseTree):
+        self.tree = tree
+        self._start = {}        # Node -> its position in document order
+        self._end = {}          # Node with children -> position after its last descendant
+        self._by_type = {}      # Concrete type -> ([positions], [nodes]) in document order
+        self._types = {}        # Queried type -> concrete types of the tree that match it
+
+        position = 0
+        # Entries are (node, True) to visit a node and (node, False) once its subtree is done
+        stack = [(tree, True)]
+        while stack:
+            node, entering = stack.pop()
+            if not entering:
+                self._end[node] = position
+                continue
+            self._start[node] = position
+            positions, nodes = self._by_type.setdefault(type(node), ([], []))
+            positions.append(position)
+            nodes.append(node)
+            position += 1
+            children = getattr(node, "children", None)
+            if children:
+                stack.append((node, False))
+                stack.extend((child, True) for child in reversed(children))
+
+    def __len__(self):
+        return len(self._start)
+
+    def find(self, target_type, node: ParseTree = None) -> list:
+        """
+        Returns the nodes that are instances of target_type (a class or a tuple of classes)
+        among the given node and its descendants (the whole tree by default), in document order.
+
+        Raises:
+            KeyError: If the node is not part of the indexed tree.
+        """
+        types = self._types.get(target_type)
+        if types is None:
+            types = self._types[target_type] = [t for t in self._by_type if issubclass(t, target_type)]
+
+        if node is None or node is self.tree:
+            matches = [self._by_type[t][1] for t in types]
+        else:
+            start = self._start[node]
+            end = self._end.get(node, start + 1)
+            matches = []
+            for t in types:
+                positions, nodes = self._by_type[t]
+                matches.append(nodes[bisect_left(positions, start):bisect_left(positions, end)])
+
+        matches = [nodes for nodes in matches if nodes]
+        if len(matches) <= 1:
+            return list(matches[0]) if matches else []
+        # Several concrete types match: restore document order
+        return list(merge(*matches, key=self._start.__getitem__))
@@ -1,3 +1,4 @@
+import weakref
 from enum import Enum
 from datetime import timedelta, datetime  
 from besser.BUML.metamodel.structural import Element
@@ -6,6 +7,7 @@ from utils.exceptions import (
     InvalidValueException, InvalidTimeConditionException,
     UndefinedAttributeException
 )
+from utils.validation import report
 
 # Enums
 class StatusEnum(Enum):
@@ -18,19 +20,65 @@ class EvaluationMode(Enum):
     POST = 2
     CONCURRENT = 3
 
+class ModelElement:
+    """
+    Base class of the metamodel classes. Models may hold hundreds of thousands of objects, so they
+    keep their attributes in __slots__ instead of a per-instance __dict__: attributes without
+    validation are plain slots, the others are properties validating the value and storing it in
+    a private slot. besser's Element has a __dict__, so ModelElement is registered as a virtual
+    subclass of it instead of deriving from it (isinstance checks against Element still hold).
+    """
+    __slots__ = ()
+
+Element.register(ModelElement)
+
+class ValueElement(ModelElement):
+    """
+    Base class of immutable value objects (labels, communication channels, boolean decisions).
+    They are equal when they have the same type and field values, and intern() returns one
+    shared instance per value, so documents repeating them hold a single object each. Their
+    fields can only be set once (by the constructor), as an instance may be shared by many
+    conditions and policies. Interned instances are only referenced weakly by the intern table,
+    so values no model uses anymore are collected.
+    """
+    __slots__ = ('__weakref__',)
+    _fields: tuple[str, ...] = ()   # in the order of the constructor arguments
+    _interned: weakref.WeakValueDictionary[tuple, 'ValueElement'] = weakref.WeakValueDictionary()
+
+    @classmethod
+    def intern(cls, *args, **kwargs) -> 'ValueElement':
+        """Returns the shared instance of cls with the given constructor arguments."""
+        value = cls(*args, **kwargs)
+        return ValueElement._interned.setdefault((cls, value._value()), value)
+
+    def _value(self) -> tuple:
+        return tuple(getattr(self, field) for field in self._fields)
+
+    def __setattr__(self, name: str, value):
+        if hasattr(self, name):
+            raise AttributeError(f"{type(self).__name__} objects are immutable, cannot set {name}.")
+        super().__setattr__(name, value)
+
+    def __eq__(self, value):
+        if self is value:
+            return True
+        return type(value) is type(self) and value._value() == self._value()
+
+    def __hash__(self):
+        return hash((type(self), self._value()))
+
+    def __reduce__(self):
+        # Unpickled values are interned again, so they stay shared
+        return (type(self).intern, self._value())
+
 # Scope hierarchy
-class Scope(Element):
+class Scope(ModelElement):
+    __slots__ = ('name', '__status')
+    name: str
+
     def __init__(self, name: str, status: StatusEnum):
         self.name = name
         self.status = status
-    
-    @property
-    def name(self) -> str:
-        return self.__name
-    
-    @name.setter
-    def name(self, name: str):
-        self.__name = name
 
     @property
     def status(self) -> StatusEnum:
@@ -39,93 +87,55 @@ class Scope(Element):
     @status.setter
     def status(self, status: StatusEnum):
         if status is not None and not isinstance(status, StatusEnum): # We can have None values
-            raise UndefinedAttributeException("status", status)
+            report(UndefinedAttributeException, "status", status)
         self.__status = status
 
 class Project(Scope):
+    __slots__ = ('activities',)
+    activities: set['Activity']
+
     def __init__(self, name: str, status: StatusEnum):
         super().__init__(name, status)
         self.activities = None
-
-    @property
-    def activities(self) -> set['Activity']:
-        return self.__activities
-    
-    @activities.setter
-    def activities(self, activities: set['Activity']):
-        self.__activities = activities
     
 class Activity(Scope):
+    __slots__ = ('tasks', 'project')
+    tasks: set['Task']
+    project: Project
+
     def __init__(self, name: str, status: StatusEnum):
         super().__init__(name, status)
         self.tasks = None
         self.project = None
-
-    @property
-    def tasks(self) -> set['Task']:
-        return self.__tasks
-    
-    @tasks.setter
-    def tasks(self, tasks: set['Task']):
-        self.__tasks = tasks
-
-    @property
-    def project(self) -> Project:
-        return self.__project
-    
-    @project.setter
-    def project(self, project: Project):
-        self.__project = project
     
 
 class Task(Scope):
+    __slots__ = ('activity',)
+    activity: Activity
+
     def __init__(self, name: str, status: StatusEnum):
         super().__init__(name, status)
         self.activity = None
 
-    @property
-    def activity(self) -> Activity:
-        return self.__activity
-    
-    @activity.setter
-    def activity(self, activity: Activity):
-        self.__activity = activity
+class CommunicationChannel(ValueElement):
+    __slots__ = ('name', 'platform')
+    _fields = ('name', 'platform')
+    name: str
+    platform: str
 
-class CommunicationChannel(Element):
     def __init__(self, name: str, platform: str = None):
         self.name = name
         self.platform = platform
 
-    @property
-    def name(self) -> str:
-        return self.__name
-    
-    @name.setter
-    def name(self, name: str):
-        self.__name = name
-
-    @property
-    def platform(self) -> str:
-        return self.__platform
-
-    @platform.setter
-    def platform(self, platform: str):
-        self.__platform = platform
-
 # Participant
-class Participant(Element):
+class Participant(ModelElement):
+    __slots__ = ('name', '__vote_value')
+    name: str
+
     def __init__(self, name: str, vote_value: float = 1.0):
         self.name = name
         self.vote_value = vote_value
 
-    @property
-    def name(self) -> str:
-        return self.__name
-    
-    @name.setter
-    def name(self, name: str):
-        self.__name = name
-
     @property
     def vote_value(self) -> float:
         return self.__vote_value
@@ -133,7 +143,7 @@ class Participant(Element):
     @vote_value.setter
     def vote_value(self, vote_value: float):
         if vote_value < 0:
-            raise InvalidValueException("vote_value", vote_value)
+            report(InvalidValueException, "vote_value", vote_value)
         self.__vote_value = vote_value
 
     def __eq__(self, value):
@@ -143,8 +153,27 @@ class Participant(Element):
     
     def __hash__(self):
         return hash(self.name)
-    
-class Profile(Element):
+
+    def __reduce__(self):
+        # Roles and individuals reference each other through sets, so pickle may rebuild such a set
+        # before the participant's state is restored; create it with its name so it is hashable.
+        return (_new_participant, (type(self), self.name), self.__getstate__())
+
+def _new_participant(cls, name: str) -> Participant:
+    participant = cls.__new__(cls)
+    participant.name = name
+    return participant
+
+class Profile(ModelElement):
+    __slots__ = ('name', 'gender', '__age', 'race', 'ethnicity', 'language', 'disability', 'religion')
+    name: str
+    gender: str
+    race: str
+    ethnicity: str
+    language: str
+    disability: str
+    religion: str
+
     def __init__(self, name: str, gender: str, age: int, race: str, ethnicity: str, language: str, disability: str, religion: str):
         self.name = name
         self.gender = gender
@@ -155,22 +184,6 @@ class Profile(Element):
         self.disability = disability
         self.religion = religion
 
-    @property
-    def name(self) -> str:
-        return self.__name
-    
-    @name.setter
-    def name(self, name: str):
-        self.__name = name
-
-    @property
-    def gender(self) -> str:
-        return self.__gender
-    
-    @gender.setter
-    def gender(self, gender: str):
-        self.__gender = gender
-
     @property
     def age(self) -> int:
         return self.__age
@@ -178,99 +191,39 @@ class Profile(Element):
     @age.setter
     def age(self, age: int):
         if age is not None and (age < 0 or age > 120):
-            raise InvalidValueException("age", age, max_value=120)
+            report(InvalidValueException, "age", age, 0, 120)
         self.__age = age
 
-    @property
-    def race(self) -> str:
-        return self.__race
-    
-    @race.setter
-    def race(self, race: str):
-        self.__race = race
-
-    @property
-    def ethnicity(self) -> str:
-        return self.__ethnicity
-    
-    @ethnicity.setter
-    def ethnicity(self, ethnicity: str):
-        self.__ethnicity = ethnicity
-    
-    @property
-    def language(self) -> str:
-        return self.__language
-    
-    @language.setter
-    def language(self, language: str):
-        self.__language = language
-
-    @property
-    def disability(self) -> str:
-        return self.__disability
-    
-    @disability.setter
-    def disability(self, disability: str):
-        self.__disability = disability
-
-    @property
-    def religion(self) -> str:
-        return self.__religion
-    
-    @religion.setter
-    def religion(self, religion: str):
-        self.__religion = religion
-
 class Individual(Participant):
+    __slots__ = ('role_assignement', 'roles')
+    role_assignement: 'hasRole'
+    roles: set['Role']
+
     def __init__(self, name: str, vote_value: float = 1.0, roles: set['Role'] = None):
         super().__init__(name, vote_value)
         self.role_assignement = None
         self.roles = roles if roles is not None else set()
 
-    @property
-    def role_assignement(self) -> 'hasRole':
-        return self.__role_assignement
-    
-    @role_assignement.setter
-    def role_assignement(self, role_assignement: 'hasRole'):
-        self.__role_assignement = role_assignement
-
-    @property
-    def roles(self) -> set['Role']:
-        return self.__roles
-    
-    @roles.setter
-    def roles(self, roles: set['Role']):
-        self.__roles = roles
-
 class Role(Participant):
+    __slots__ = ('individuals',)
+    individuals: set[Individual]
+
     def __init__(self, name: str, vote_value: float = 1.0):
         super().__init__(name, vote_value)
         self.individuals = set()
-    
-    @property
-    def individuals(self) -> set[Individual]:
-        return self.__individuals
-    
-    @individuals.setter
-    def individuals(self, individuals: set[Individual]):
-        self.__individuals = individuals
 
 
 class Human(Individual):
+    __slots__ = ('profile',)
+    profile: Profile
+
     def __init__(self, name: str, vote_value: float = 1.0, profile: Profile = None, roles: set[Role] = None):
         super().__init__(name, vote_value, roles)
         self.profile = profile
 
-    @property
-    def profile(self) -> Profile:
-        return self.__profile
-    
-    @profile.setter
-    def profile(self, profile: Profile):
-        self.__profile = profile
-
 class Agent(Individual):
+    __slots__ = ('__confidence', '__autonomy_level', '__explainability')
+
     def __init__(self, name: str, vote_value: float = 1.0, confidence: float = 1.0, autonomy_level: float = 1.0, explainability: float = 1.0, roles: set[Role] = None):
         super().__init__(name, vote_value, roles)
         self.confidence = confidence
@@ -284,7 +237,7 @@ class Agent(Individual):
     @confidence.setter
     def confidence(self, confidence: float):
         if confidence < 0 or confidence > 1:
-            raise InvalidValueException("confidence", confidence)
+            report(InvalidValueException, "confidence", confidence)
         self.__confidence = confidence
 
     @property
@@ -294,7 +247,7 @@ class Agent(Individual):
     @autonomy_level.setter
     def autonomy_level(self, autonomy_level: float):
         if autonomy_level < 0 or autonomy_level > 1:
-            raise InvalidValueException("autonomy_level", autonomy_level)
+            report(InvalidValueException, "autonomy_level", autonomy_level)
         self.__autonomy_level = autonomy_level
 
     @property
@@ -304,25 +257,20 @@ class Agent(Individual):
     @explainability.setter
     def explainability(self, explainability: float):
         if explainability < 0 or explainability > 1:
-            raise InvalidValueException("explainability", explainability)
+            report(InvalidValueException, "explainability", explainability)
         self.__explainability = explainability
 
 
 
-class hasRole(Element):
+class hasRole(ModelElement):
+    __slots__ = ('name', '__role', '__individual', '__scope')
+    name: str
+
     def __init__(self, name: str, role: Role, individual: Individual, scope: Scope):
         self.name = name
         self.role = role
         self.individual = individual
         self.scope = scope
-
-    @property
-    def name(self) -> str:
-        return self.__name
-    
-    @name.setter
-    def name(self, name: str):
-        self.__name = name
     
     @property
     def role(self) -> Role:
@@ -331,7 +279,7 @@ class hasRole(Element):
     @role.setter
     def role(self, role: Role):
         if role is None:
-            raise UndefinedAttributeException("role", None)
+            report(UndefinedAttributeException, "role", None)
         self.__role = role
     
     @property
@@ -341,7 +289,7 @@ class hasRole(Element):
     @individual.setter
     def individual(self, individual: Individual):
         if individual is None:
-            raise UndefinedAttributeException("individual", None)
+            report(UndefinedAttributeException, "individual", None)
         self.__individual = individual
     
     @property
@@ -351,37 +299,27 @@ class hasRole(Element):
     @scope.setter
     def scope(self, scope: Scope):
         if scope is None:
-            raise UndefinedAttributeException("scope", None)
+            report(UndefinedAttributeException, "scope", None)
         self.__scope = scope
 
 
 # Condition
-class Condition(Element):
+class Condition(ModelElement):
+    __slots__ = ('name', 'evaluation_mode')
+    name: str
+    evaluation_mode: EvaluationMode
+
     def __init__(self, name: str, evaluation_mode: EvaluationMode = None):
         self.name = name
         self.evaluation_mode = evaluation_mode
 
-    @property
-    def name(self) -> str:
-        return self.__name
-    
-    @name.setter
-    def name(self, name: str):
-        self.__name = name
-
-    @property
-    def evaluation_mode(self) -> EvaluationMode:
-        return self.__evaluation_mode
-    
-    @evaluation_mode.setter
-    def evaluation_mode(self, evaluation_mode: EvaluationMode):
-        self.__evaluation_mode = evaluation_mode
-
 class Deadline(Condition):
+    __slots__ = ('__offset', '__date')
+
     def __init__(self, name: str, offset: timedelta, date: datetime):
         super().__init__(name)
         if offset is None and date is None:
-            raise InvalidTimeConditionException(name)
+            report(InvalidTimeConditionException, name)
         self.__offset = offset
         self.__date = date
 
@@ -392,7 +330,7 @@ class Deadline(Condition):
     @offset.setter
     def offset(self, offset: timedelta):
         if offset is None and self.date is None:
-            raise InvalidTimeConditionException(self.name)
+            report(InvalidTimeConditionException, self.name)
         self.__offset = offset
 
     @property
@@ -402,14 +340,16 @@ class Deadline(Condition):
     @date.setter
     def date(self, date: datetime):
         if date is None and self.offset is None:
-            raise InvalidTimeConditionException(self.name)
+            report(InvalidTimeConditionException, self.name)
         self.__date = date
 
 class MinDecisionTime(Condition):
+    __slots__ = ('__offset', '__date')
+
     def __init__(self, name: str, offset: timedelta, date: datetime):
         super().__init__(name)
         if offset is None and date is None:
-            raise InvalidTimeConditionException(name)
+            report(InvalidTimeConditionException, name)
         self.__offset = offset
         self.__date = date
 
@@ -420,7 +360,7 @@ class MinDecisionTime(Condition):
     @offset.setter
     def offset(self, offset: timedelta):
         if offset is None and self.date is None:
-            raise InvalidTimeConditionException(self.name)
+            report(InvalidTimeConditionException, self.name)
         self.__offset = offset
 
     @property
@@ -430,10 +370,12 @@ class MinDecisionTime(Condition):
     @date.setter
     def date(self, date: datetime):
         if date is None and self.offset is None:
-            raise InvalidTimeConditionException(self.name)
+            report(InvalidTimeConditionException, self.name)
         self.__date = date
 
 class ParticipantExclusion(Condition):
+    __slots__ = ('__excluded',)
+
     def __init__(self, name: str, excluded: set[Individual]): # TODO: Individual or Participant?
         super().__init__(name)
         self.excluded = excluded
@@ -445,10 +387,12 @@ class ParticipantExclusion(Condition):
     @excluded.setter
     def excluded(self, excluded: set[Individual]):
         if excluded is None:
-            raise UndefinedAttributeException("excluded", message="Participant relationship (excluded) must be defined.")
+            report(UndefinedAttributeException, "excluded", None, "Participant relationship (excluded) must be defined.")
         self.__excluded = excluded
 
 class MinimumParticipant(Condition):
+    __slots__ = ('__min_participants',)
+
     def __init__(self, name: str, min_participants: int):
         super().__init__(name)
         self.min_participants = min_participants
@@ -460,36 +404,26 @@ class MinimumParticipant(Condition):
     @min_participants.setter
     def min_participants(self, min_participants: int):
         if min_participants < 1:
-            raise InvalidParticipantException(min_participants)
+            report(InvalidParticipantException, min_participants)
         self.__min_participants = min_participants
 
 class VetoRight(Condition):
+    __slots__ = ('vetoers',)
+    vetoers: set[Participant]
+
     def __init__(self, name: str, vetoers: set[Participant]):
         super().__init__(name)
         self.vetoers = vetoers
-    
-    @property
-    def vetoers(self) -> set[Participant]:
-        return self.__vetoers
-    
-    @vetoers.setter
-    def vetoers(self, vetoers: set[Participant]):
-        self.__vetoers = vetoers
 
 class AppealRight(Condition):
+    __slots__ = ('appealers', '__policy')
+    appealers: set[Participant]
+
     def __init__(self, name: str, appealers: set[Participant], policy: 'Policy' = None):
         super().__init__(name)
         self.appealers = appealers
         self.__policy = policy # Avoid setter during init to prevent errors, validated later
 
-    @property
-    def appealers(self) -> set[Participant]:
-        return self.__appealers
-
-    @appealers.setter
-    def appealers(self, appealers: set[Participant]):
-        self.__appealers = appealers
-
     @property
     def policy(self) -> 'Policy':
         return self.__policy
@@ -497,31 +431,33 @@ class AppealRight(Condition):
     @policy.setter
     def policy(self, policy: 'Policy'):
         if policy is None:
-            raise UndefinedAttributeException("policy", message="Policy must be defined.")
+            report(UndefinedAttributeException, "policy", None, "Policy must be defined.")
         self.__policy = policy
 
 # DecisionType
-class DecisionType(Element):
+class DecisionType(ModelElement):
+    __slots__ = ('name',)
+    name: str
+
     def __init__(self, name: str):
         self.name = name
 
-    @property
-    def name(self) -> str:
-        return self.__name
-    
-    @name.setter
-    def name(self, name: str):
-        self.__name = name
+class BooleanDecision(ValueElement, DecisionType):
+    __slots__ = ()
+    _fields = ('name',)
 
-class BooleanDecision(DecisionType):
     def __init__(self, name: str):
         super().__init__(name)
 
 class CandidateChoice(DecisionType):
+    __slots__ = ()
+
     def __init__(self, name: str):
         super().__init__(name)
 
 class ElementList(CandidateChoice):
+    __slots__ = ('__elements',)
+
     def __init__(self, name: str, elements: set[Element]):
         super().__init__(name)
         self.elements = elements
@@ -533,10 +469,12 @@ class ElementList(CandidateChoice):
     @elements.setter
     def elements(self, elements: set[Element]):
         if not elements:
-            raise EmptySetException("elements")
+            report(EmptySetException, "elements")
         self.__elements = elements
 
 class StringList(CandidateChoice):
+    __slots__ = ('__options',)
+
     def __init__(self, name: str, options: set[str]):
         super().__init__(name)
         self.options = options
@@ -548,24 +486,20 @@ class StringList(CandidateChoice):
     @options.setter
     def options(self, options: set[str]):
         if not options:
-            raise EmptySetException("options")
+            report(EmptySetException, "options")
         self.__options = options
 
 # Policy hierarchy
-class Policy(Element):
+class Policy(ModelElement):
     """A Policy must have a scope, but it can be set after initialization."""
+    __slots__ = ('name', '__scope', 'parent')
+    name: str
+    parent: 'ComposedPolicy | None'
+
     def __init__(self, name: str, scope: Scope = None):
         self.name = name
         self.scope = scope
         self.parent = None
-
-    @property
-    def name(self) -> str:
-        return self.__name
-    
-    @name.setter
-    def name(self, name: str):
-        self.__name = name
         
     @property
     def scope(self) -> Scope:
@@ -574,37 +508,53 @@ class Policy(Element):
     @scope.setter
     def scope(self, scope: Scope):
         self.__scope = scope
-
-    @property
-    def parent(self) -> 'ComposedPolicy | None':  # String literal for forward reference
-        return self.__parent
-    
-    @parent.setter
-    def parent(self, parent: 'ComposedPolicy | None'):
-        self.__parent = parent
+        self.propagate_scope()
     
+    def _scope_targets(self) -> list[tuple['Policy', bool]]:
+        """
+        The policies this policy passes its scope on to, each with whether their scope is
+        replaced (phases) or only set if missing (default and fallback policies).
+        """
+        return []
+
+    def propagate_scope(self):
+        """
+        Propagates the scope of the policy down to the policies it contains: phases take it
+        over, default and fallback policies without a scope inherit it, and those with another
+        scope are reported (InvalidScopeException). The nested policies are visited
+        iteratively, so their depth is not limited by the recursion limit.
+        """
+        if not self.scope:
+            return
+        pending = [(target, replace, self.scope) for target, replace in reversed(self._scope_targets())]
+        visited = {id(self)}
+        while pending:
+            policy, replace, scope = pending.pop()
+            if replace or not policy.scope:
+                policy.__scope = scope
+                if id(policy) not in visited:
+                    visited.add(id(policy))
+                    pending.extend((target, replace, scope) for target, replace in reversed(policy._scope_targets()))
+            elif policy.scope != scope:
+                report(InvalidScopeException, policy.scope, scope)
+
     def validate(self):
         """Validates that the policy has all required properties before execution."""
         if not self.scope:
-            raise EmptySetException("Policy must have a scope before execution")
+            report(EmptySetException, "Policy must have a scope before execution")
 
 class SinglePolicy(Policy):
+    __slots__ = ('conditions', '__participants', '__decision_type', 'channel')
+    conditions: set[Condition]
+    channel: CommunicationChannel
+
     def __init__(self, name: str, conditions: set[Condition], participants: set[Participant], 
                  decision_type: DecisionType, scope: Scope = None, channel: CommunicationChannel = None):
         super().__init__(name, scope)
         self.conditions = conditions
         self.participants = participants
         self.decision_type = decision_type
-        self.scope = scope
         self.channel = channel
-    
-    @property
-    def conditions(self) -> set[Condition]:
-        return self.__conditions
-    
-    @conditions.setter
-    def conditions(self, conditions: set[Condition]):
-        self.__conditions = conditions
 
     @property
     def participants(self) -> set[Participant]:
@@ -613,7 +563,7 @@ class SinglePolicy(Policy):
     @participants.setter
     def participants(self, participants: set[Participant]):
         if not participants:  # Only check for None or empty
-            raise EmptySetException("Policy must have at least one participant")
+            report(EmptySetException, "Policy must have at least one participant")
         self.__participants = participants
     
     @property
@@ -623,26 +573,20 @@ class SinglePolicy(Policy):
     @decision_type.setter
     def decision_type(self, decision_type: DecisionType):
         if decision_type is None:
-            raise UndefinedAttributeException("decision_type", None)
+            report(UndefinedAttributeException, "decision_type", None)
         self.__decision_type = decision_type
 
-    @property
-    def channel(self) -> CommunicationChannel:
-        return self.__channel
-    
-    @channel.setter
-    def channel(self, channel: CommunicationChannel):
-        self.__channel = channel
-
     # Enforce AppealRight has a policy after construction finishes
     def validate(self):
         super().validate()
         for cond in (self.conditions or []):
             if isinstance(cond, AppealRight) and cond.policy is None:
-                raise UndefinedAttributeException("policy", message="AppealRight must reference a policy.")
+                report(UndefinedAttributeException, "policy", None, "AppealRight must reference a policy.")
             
 
 class ConsensusPolicy(SinglePolicy):
+    __slots__ = ('__fallback',)
+
     def __init__(self, name: str, conditions: set[Condition], participants: set[Participant], 
                  decision_type: DecisionType, scope: Scope, channel: CommunicationChannel, fallback: Policy):
         super().__init__(name, conditions, participants, decision_type, scope, channel)
@@ -668,28 +612,16 @@ class ConsensusPolicy(SinglePolicy):
                 self.fallback.scope = self.scope
             elif fallback.scope:
                 if fallback.scope != self.scope:
-                    raise InvalidScopeException(fallback.scope, self.scope)
+                    report(InvalidScopeException, fallback.scope, self.scope)
     
-    def propagate_scope(self):
-        """Propagates the current scope to the fallback policy if set."""
-        if self.scope and hasattr(self, '_ConsensusPolicy__fallback') and self.__fallback:
-            if self.__fallback.scope:
-                if self.__fallback.scope != self.scope:
-                    raise InvalidScopeException(self.__fallback.scope, self.scope)
-            else:
-                self.fallback.scope = self.scope
-
-    @property
-    def scope(self) -> Scope:
-        return super().scope
-    
-    @scope.setter
-    def scope(self, scope: Scope):
-        super(ConsensusPolicy, type(self)).scope.fset(self, scope)
-        self.propagate_scope()
+    def _scope_targets(self) -> list[tuple[Policy, bool]]:
+        fallback = getattr(self, '_ConsensusPolicy__fallback', None)
+        return [(fallback, False)] if fallback else []
     
 
 class LazyConsensusPolicy(ConsensusPolicy):
+    __slots__ = ()
+
     def __init__(self, name: str, conditions: set[Condition], participants: set[Participant], 
                  decision_type: DecisionType, scope: Scope, channel: CommunicationChannel, fallback: Policy):
         super().__init__(name, conditions, participants, decision_type, scope, channel, fallback)
@@ -703,6 +635,8 @@ class LazyConsensusPolicy(ConsensusPolicy):
 
 
 class VotingPolicy(SinglePolicy):
+    __slots__ = ('__ratio',)
+
     def __init__(self, name: str, conditions: set[Condition], participants: set[Participant], 
                  decision_type : DecisionType, scope: Scope, channel: CommunicationChannel, ratio: float = None):
         super().__init__(name, conditions, participants, decision_type, scope, channel)
@@ -722,12 +656,14 @@ class VotingPolicy(SinglePolicy):
     @ratio.setter
     def ratio(self, ratio: float):
         if ratio and (ratio < 0 or ratio > 1):
-            raise InvalidValueException("ratio", ratio)
+            report(InvalidValueException, "ratio", ratio)
         self.__ratio = ratio
 
 
 class MajorityPolicy(VotingPolicy):
     """MajorityPolicy extends VotingPolicy"""
+    __slots__ = ()
+
     def __init__(self, name: str, conditions: set[Condition], participants: set[Participant], 
                  decision_type: DecisionType, scope: Scope, channel: CommunicationChannel, ratio: float = None):
         super().__init__(name, conditions, participants, decision_type, scope, channel, ratio)
@@ -746,6 +682,8 @@ class MajorityPolicy(VotingPolicy):
 
 class AbsoluteMajorityPolicy(VotingPolicy):
     """AbsoluteMajorityPolicy extends VotingPolicy"""
+    __slots__ = ()
+
     def __init__(self, name: str, conditions: set[Condition], participants: set[Participant], 
                  decision_type: DecisionType, scope: Scope, channel: CommunicationChannel, ratio: float = None):
         super().__init__(name, conditions, participants, decision_type, scope, channel, ratio)
@@ -764,6 +702,8 @@ class AbsoluteMajorityPolicy(VotingPolicy):
 
 class LeaderDrivenPolicy(SinglePolicy):
     """LeaderDrivenPolicy extends SinglePolicy and references another SinglePolicy as default"""
+    __slots__ = ('__default',)
+
     def __init__(self, name: str, conditions: set[Condition], participants: set[Participant], 
                  decision_type: DecisionType, scope: Scope, channel: CommunicationChannel, default: Policy = None):
         # Initialize default first to avoid issues during object creation
@@ -792,30 +732,21 @@ class LeaderDrivenPolicy(SinglePolicy):
                 self.default.scope = self.scope
             elif default.scope:
                 if default.scope != self.scope:
-                    raise InvalidScopeException(default.scope, self.scope)
+                    report(InvalidScopeException, default.scope, self.scope)
     
     # # TODO: Review if applicable after alternative to inline policies is implemented
-    def propagate_scope(self):
-        """Propagates the current scope to the default policy if set."""
-        if self.scope and hasattr(self, '_LeaderDrivenPolicy__default') and self.__default:
-            if self.__default.scope:
-                if self.__default.scope != self.scope:
-                    raise InvalidScopeException(self.__default.scope, self.scope)
-            else:
-                self.default.scope = self.scope
-    
-    @property
-    def scope(self) -> Scope:
-        return super().scope
-    
-    @scope.setter
-    def scope(self, scope: Scope):
-        super(LeaderDrivenPolicy, type(self)).scope.fset(self, scope)
-        self.propagate_scope()
+    def _scope_targets(self) -> list[tuple[Policy, bool]]:
+        default = getattr(self, '_LeaderDrivenPolicy__default', None)
+        return [(default, False)] if default else []
 
 
 class ComposedPolicy(Policy):
     """A ComposedPolicy must have at least one phase."""
+    __slots__ = ('__phases', 'sequential', 'require_all', 'carry_over')
+    sequential: bool
+    require_all: bool
+    carry_over: bool
+
     def __init__(self, name: str, phases: list[Policy], sequential: bool, require_all: bool, carry_over: bool, scope: Scope = None):
         super().__init__(name, scope)
         self.phases = phases
@@ -831,48 +762,12 @@ class ComposedPolicy(Policy):
     @phases.setter
     def phases(self, phases: list[Policy]):
         if not phases:  # Only check for None or empty
-            raise EmptySetException("ComposedPolicy must have at least one phase.")
+            report(EmptySetException, "ComposedPolicy must have at least one phase.")
         self.__phases = phases
 
         # Set the parent reference for each phase
-        for phase in phases:
+        for phase in phases or ():
             phase.parent = self
     
-    @property
-    def sequential(self) -> bool:
-        return self.__sequential
-    
-    @sequential.setter
-    def sequential(self, sequential: bool):
-        self.__sequential = sequential
-
-    @property
-    def require_all(self) -> bool:
-        return self.__require_all
-    
-    @require_all.setter
-    def require_all(self, require_all: bool):
-        self.__require_all = require_all
-
-    @property
-    def carry_over(self) -> bool:
-        return self.__carry_over
-    
-    @carry_over.setter
-    def carry_over(self, carry_over: bool):
-        self.__carry_over = carry_over
-    
-    def propagate_scope(self):
-        """Propagates the current scope to all child phases if set."""
-        if self.scope and hasattr(self, '_ComposedPolicy__phases'):
-            for phase in self.phases:
-                phase.scope = self.scope
-    
-    @property
-    def scope(self) -> Scope:
-        return super().scope
-
-    @scope.setter
-    def scope(self, scope: Scope):
-        super(ComposedPolicy, type(self)).scope.fset(self, scope)
-        self.propagate_scope()
\ No newline at end of file
+    def _scope_targets(self) -> list[tuple[Policy, bool]]:
+        return [(phase, True) for phase in getattr(self, '_ComposedPolicy__phases', None) or ()]
@@ -0,0 +1,73 @@
+"""
+Compares the memory and time of building the governance model from the parse tree of the
+whole document (ParserPool.parse) and from its compact IR (parse(compact=True)), which only
+keeps the parse tree of one top-level block alive at a time. Also reports how much memory a
+parse tree and the IR lowered from it keep alive. Documents are generated with a growing
+number of policies that each have a decision type, participants, conditions and parameters.
+
+Run from the repository root:
+    python -m tests.benchmarks.bench_compact_ir
+"""
+import gc
+import time
+import tracemalloc
+from grammar.parsing import get_default_pool
+from grammar.ir import lower_policy
+
+SIZES = [250, 1000, 4000]
+
+
+def document(size: int) -> str:
+    blocks = ["Scopes:\n    Projects:\n        benchProject\n"
+              "Participants:\n    Roles: maintainers, reviewers\n    Individuals: alice, bob { role : reviewers }\n"]
+    for i in range(size):
+        blocks.append(f"MajorityPolicy policy{i} {{\n    Scope: benchProject\n"
+                      f"    DecisionType as StringList : accept, reject, abstain\n"
+                      f"    Participant list : maintainers, reviewers, alice\n"
+                      f"    Conditions:\n        Deadline review{i} : 7 days\n        MinParticipants : 2\n"
+                      f"        VetoRight : bob\n        LabelCondition pre not : wip, blocked\n"
+                      f"    Parameters:\n        ratio : 0.5\n}}\n")
+    return "".join(blocks)
+
+def measure(function) -> tuple:
+    """Returns the result, the elapsed time and the peak of memory allocated while running the function."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+def retained(function) -> tuple:
+    """Returns the result of the function and the memory it keeps allocated."""
+    gc.collect()
+    tracemalloc.start()
+    result = function()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+def main():
+    pool = get_default_pool()
+    mb = 1024 * 1024
+    print(f"{'policies':>10}{'tree peak':>12}{'IR peak':>12}{'tree time':>12}{'IR time':>12}"
+          f"{'tree size':>12}{'IR size':>12}")
+    for size in SIZES:
+        text = document(size)
+        policies, tree_time, tree_peak = measure(lambda: pool.parse(text, fast_lexer=True))
+        compact_policies, ir_time, ir_peak = measure(lambda: pool.parse(text, fast_lexer=True, compact=True))
+        assert len(policies) == len(compact_policies) == size
+
+        with pool.checkout(text, fast_lexer=True) as pooled:
+            blocks, tree_size = retained(lambda: pooled.parse_blocks()[0])
+        _, ir_size = retained(lambda: [lower_policy(block) for block in blocks[2:]])
+        del blocks
+        print(f"{size:>10}{tree_peak / mb:>9.1f} MB{ir_peak / mb:>9.1f} MB{tree_time:>10.2f} s{ir_time:>10.2f} s"
+              f"{tree_size / mb:>9.1f} MB{ir_size / mb:>9.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Measures the memory taken by metamodel objects and the cost of reading their attributes, on a
+model of organization-wide size (many participants, conditions and policies). Run it before and
+after a change to the metamodel classes to compare them.
+
+Run from the repository root:
+    python -m tests.benchmarks.bench_compact_metamodel
+"""
+import gc
+import timeit
+import tracemalloc
+from datetime import timedelta
+from metamodel.governance import (
+    Project, Individual, Role, Deadline, MinimumParticipant, VetoRight, BooleanDecision, MajorityPolicy
+)
+
+SIZES = [10000, 100000]
+READS = 1000000
+
+
+def build_model(size: int) -> list:
+    project = Project("benchProject", None)
+    roles = [Role(f"role{i}") for i in range(max(1, size // 100))]
+    individuals = [Individual(f"member{i}", roles={roles[i % len(roles)]}) for i in range(size)]
+    conditions = []
+    for i in range(size):
+        conditions.append(Deadline(f"deadline{i}", offset=timedelta(days=i % 30 + 1), date=None))
+        conditions.append(MinimumParticipant(f"minParticipants{i}", min_participants=i % 5 + 1))
+        conditions.append(VetoRight(f"veto{i}", vetoers={individuals[i]}))
+    policies = [MajorityPolicy(f"policy{i}", conditions=set(conditions[3 * i:3 * i + 3]),
+                               participants={roles[i % len(roles)]}, decision_type=BooleanDecision("booleanDecision"),
+                               scope=project, channel=None, ratio=0.5)
+                for i in range(size // 10)]
+    return roles + individuals + conditions + policies
+
+def measure_memory(size: int) -> tuple[int, float]:
+    gc.collect()
+    tracemalloc.start()
+    model = build_model(size)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(model), current
+
+def measure_reads() -> dict[str, float]:
+    individual = Individual("member", roles={Role("role")})
+    policy = MajorityPolicy("policy", conditions=set(), participants={individual},
+                            decision_type=BooleanDecision("booleanDecision"), scope=Project("benchProject", None),
+                            channel=None, ratio=0.5)
+    reads = {
+        "Individual.name": lambda: individual.name,
+        "Individual.vote_value": lambda: individual.vote_value,
+        "Policy.scope": lambda: policy.scope,
+        "SinglePolicy.participants": lambda: policy.participants,
+        "SinglePolicy.conditions": lambda: policy.conditions,
+    }
+    return {name: min(timeit.repeat(read, number=READS, repeat=3)) / READS * 1e9 for name, read in reads.items()}
+
+def main():
+    print(f"{'objects':>10}{'memory':>12}{'per object':>14}")
+    for size in SIZES:
+        objects, memory = measure_memory(size)
+        print(f"{objects:>10}{memory / 1e6:>9.1f} MB{memory / objects:>12.0f} B")
+    print()
+    print(f"{'attribute':<28}{'read':>10}")
+    for name, elapsed in measure_reads().items():
+        print(f"{name:<28}{elapsed:>7.1f} ns")
+
+
+if __name__ == "__main__":
+    main()
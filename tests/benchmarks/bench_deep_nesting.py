@@ -0,0 +1,83 @@
+"""
+Measures parsing, building and validating generated documents whose single top-level policy
+nests another one at every level: inline default policies (LeaderDrivenPolicy), inline
+fallback policies (ConsensusPolicy), phases of composed policies and inline appeal policies.
+The scope is only given at the top and is propagated down every level. The time per level
+should stay about constant, and no depth should hit the recursion limit.
+
+Run from the repository root:
+    python -m tests.benchmarks.bench_deep_nesting
+"""
+import sys
+import time
+from grammar.parsing import get_default_pool, validate_governance
+from grammar.policy_builder import PolicyBuilder
+
+DEPTHS = [250, 500, 1000, 2000]
+HEADER = "Scopes:\n    Projects:\n        benchProject\nParticipants:\n    Roles: maintainers\n"
+BODY = "    DecisionType as BooleanDecision\n    Participant list : maintainers\n"
+
+
+def _scope(level: int) -> str:
+    return "    Scope: benchProject\n" if level == 0 else ""
+
+def _innermost(depth: int) -> str:
+    return f"MajorityPolicy policy{depth} {{\n{BODY}}}"
+
+def default_chain(depth: int) -> str:
+    text = _innermost(depth)
+    for level in reversed(range(depth)):
+        text = (f"LeaderDrivenPolicy policy{level} {{\n{_scope(level)}{BODY}"
+                f"    Parameters:\n        default : {text}\n}}")
+    return HEADER + text
+
+def fallback_chain(depth: int) -> str:
+    text = _innermost(depth)
+    for level in reversed(range(depth)):
+        text = (f"ConsensusPolicy policy{level} {{\n{_scope(level)}{BODY}"
+                f"    Parameters:\n        fallback : {text}\n}}")
+    return HEADER + text
+
+def composed_chain(depth: int) -> str:
+    text = _innermost(depth)
+    for level in reversed(range(depth)):
+        text = (f"ComposedPolicy policy{level} {{\n{_scope(level)}"
+                f"    Order :\n        Execution : sequential\n        RequireAll : true\n        CarryOver : false\n"
+                f"    Phases {{\n{text}\n    }}\n}}")
+    return HEADER + text
+
+def appeal_chain(depth: int) -> str:
+    text = _innermost(depth)
+    for level in reversed(range(depth)):
+        text = (f"MajorityPolicy policy{level} {{\n{_scope(level)}{BODY}"
+                f"    Conditions:\n        AppealRight : {{\n            Appealers : maintainers,\n"
+                f"            Policy : {text}\n        }}\n}}")
+    return HEADER + text
+
+DOCUMENTS = {"default": default_chain, "fallback": fallback_chain,
+             "composed": composed_chain, "appeal": appeal_chain}
+
+
+def main():
+    pool = get_default_pool()
+    print(f"{'nesting':<10}{'levels':>8}{'parse':>12}{'build':>12}{'validate':>12}{'per level':>12}")
+    for kind, generate in DOCUMENTS.items():
+        for depth in DEPTHS:
+            text = generate(depth)
+            start = time.perf_counter()
+            with pool.checkout(text, fast_lexer=True) as pooled:
+                tree, _ = pooled.parse_two_stage()
+                assert not pooled.error_listener.error_count, pooled.error_listener.error_message
+            parsed = time.perf_counter()
+            policies = PolicyBuilder().build(tree)
+            built = time.perf_counter()
+            result = validate_governance(text, fast_lexer=True)
+            validated = time.perf_counter()
+            assert len(policies) == 1 and result.ok, result.messages()[:3]
+            print(f"{kind:<10}{depth:>8}{parsed - start:>10.3f} s{built - parsed:>10.3f} s"
+                  f"{validated - built:>10.3f} s{(validated - start) / depth * 1e3:>9.2f} ms")
+    print(f"recursion limit after the runs: {sys.getrecursionlimit()}")
+
+
+if __name__ == "__main__":
+    main()
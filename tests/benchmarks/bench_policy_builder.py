@@ -0,0 +1,50 @@
+"""
+Compares building the governance model with PolicyCreationListener (through ParseTreeWalker)
+and with PolicyBuilder, on the real-world examples that parse.
+
+Run from the repository root:
+    python -m tests.benchmarks.bench_policy_builder
+"""
+import timeit
+from pathlib import Path
+from antlr4 import ParseTreeWalker
+from grammar.parsing import get_default_pool
+from grammar.PolicyCreationListener import PolicyCreationListener
+from grammar.policy_builder import PolicyBuilder
+
+REAL_WORLD = Path(__file__).parent.parent / "test_cases" / "valid_examples" / "real_world"
+REPEAT = 5
+NUMBER = 200
+
+
+def parse_trees() -> dict:
+    trees = {}
+    pool = get_default_pool()
+    for path in sorted(REAL_WORLD.glob("*.gov")):
+        with pool.checkout(path.read_text()) as pooled:
+            tree = pooled.parser.governance()
+            if not pooled.error_listener.error_message:
+                trees[path.name] = tree
+    return trees
+
+def walk_listener(tree):
+    listener = PolicyCreationListener()
+    ParseTreeWalker.DEFAULT.walk(listener, tree)
+    return listener.get_policies()
+
+def build(tree):
+    return PolicyBuilder().build(tree)
+
+def main():
+    print(f"{'document':<32}{'listener walk':>16}{'PolicyBuilder':>16}{'speedup':>10}")
+    totals = [0.0, 0.0]
+    for name, tree in parse_trees().items():
+        times = [min(timeit.repeat(lambda: construct(tree), repeat=REPEAT, number=NUMBER)) / NUMBER
+                 for construct in (walk_listener, build)]
+        totals = [total + t for total, t in zip(totals, times)]
+        print(f"{name:<32}{times[0] * 1e6:>13.1f} us{times[1] * 1e6:>13.1f} us{times[0] / times[1]:>9.2f}x")
+    print(f"{'total':<32}{totals[0] * 1e6:>13.1f} us{totals[1] * 1e6:>13.1f} us{totals[0] / totals[1]:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Measures how building the policy objects scales with the number of policies, on generated
+documents where each policy uses the next one as its default (the worst case for resolving
+references in declaration order). The time per policy should stay about constant.
+It also compares building the objects of such a chain directly, as the parser does, with going
+through a SinglePolicy and from_policy().
+
+Run from the repository root:
+    python -m tests.benchmarks.bench_policy_construction
+"""
+import time
+from grammar.parsing import get_default_pool
+from grammar.policy_builder import PolicyBuilder
+from metamodel.governance import Project, Role, BooleanDecision, SinglePolicy, LeaderDrivenPolicy
+
+SIZES = [1000, 2500, 5000, 10000]
+
+
+def chained_document(size: int) -> str:
+    blocks = ["Scopes:\n    Projects:\n        benchProject\nParticipants:\n    Roles: maintainers\n"]
+    for i in range(size):
+        default = f"\n    Parameters:\n        default : policy{i + 1}" if i + 1 < size else ""
+        blocks.append(f"LeaderDrivenPolicy policy{i} {{\n    Scope: benchProject\n"
+                      f"    DecisionType as BooleanDecision\n    Participant list : maintainers{default}\n}}\n")
+    return "".join(blocks)
+
+def build_chain(size: int, from_policy: bool) -> LeaderDrivenPolicy:
+    project, participants, decision = Project("benchProject", None), {Role("maintainers")}, BooleanDecision("decision")
+    policy = None
+    for i in reversed(range(size)):
+        if from_policy:
+            base = SinglePolicy(f"policy{i}", set(), participants, decision, scope=project)
+            policy = LeaderDrivenPolicy.from_policy(base, default=policy)
+        else:
+            policy = LeaderDrivenPolicy(f"policy{i}", set(), participants, decision, project, None, default=policy)
+    return policy
+
+def main():
+    pool = get_default_pool()
+    print(f"{'policies':>10}{'build time':>14}{'per policy':>14}")
+    for size in SIZES:
+        with pool.checkout(chained_document(size), fast_lexer=True) as pooled:
+            tree, _ = pooled.parse_two_stage()
+        start = time.perf_counter()
+        policies = PolicyBuilder().build(tree)
+        elapsed = time.perf_counter() - start
+        assert len(policies) == size
+        print(f"{size:>10}{elapsed:>12.3f} s{elapsed / size * 1e6:>11.1f} us")
+
+    print()
+    print(f"{'policies':>10}{'from_policy':>14}{'direct':>14}")
+    for size in SIZES:
+        timings = []
+        for from_policy in (True, False):
+            start = time.perf_counter()
+            build_chain(size, from_policy)
+            timings.append(time.perf_counter() - start)
+        print(f"{size:>10}" + "".join(f"{elapsed:>12.3f} s" for elapsed in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Measures resolving the policies that govern a scope on a generated hierarchy of about 50,000
+scopes (repositories, activities and Patch tasks), with policies on some scopes of each level.
+A ScopeIndex is compared with scanning every policy for the scope and its ancestors.
+
+Run from the repository root:
+    python -m tests.benchmarks.bench_scope_resolution
+"""
+import random
+import time
+from grammar.scope_index import ScopeIndex
+from metamodel.governance import Activity, Role, BooleanDecision, MajorityPolicy
+from utils.chp_extension import Repository, Patch, PatchAction
+
+PROJECTS, ACTIVITIES, TASKS = 10, 50, 100
+QUERIES = 10000
+
+
+def build_scopes() -> tuple[list, list]:
+    projects, tasks = [], []
+    for p in range(PROJECTS):
+        project = Repository(f"repo{p}", None, f"owner/repo{p}")
+        project.activities = set()
+        for a in range(ACTIVITIES):
+            activity = Activity(f"repo{p}_activity{a}", None)
+            activity.project = project
+            activity.tasks = set()
+            for t in range(TASKS):
+                task = Patch(f"repo{p}_activity{a}_task{t}", None, list(PatchAction)[t % len(PatchAction)])
+                task.activity = activity
+                activity.tasks.add(task)
+                tasks.append(task)
+            project.activities.add(activity)
+        projects.append(project)
+    return projects, tasks
+
+def build_policies(projects: list, tasks: list) -> list:
+    roles, decision = {Role("maintainers")}, BooleanDecision("decision")
+    scopes = list(projects)
+    scopes += [activity for project in projects for activity in sorted(project.activities, key=lambda a: a.name)][::5]
+    scopes += tasks[::50]
+    return [MajorityPolicy(f"policy{i}", set(), roles, decision, scope, None) for i, scope in enumerate(scopes)]
+
+def scan(policies: list, scope) -> list:
+    ancestors = set()
+    while scope is not None:
+        ancestors.add(scope.name)
+        scope = getattr(scope, "activity", None) or getattr(scope, "project", None)
+    return [policy for policy in policies if policy.scope.name in ancestors]
+
+def main():
+    projects, tasks = build_scopes()
+    policies = build_policies(projects, tasks)
+    scopes = PROJECTS * (1 + ACTIVITIES * (1 + TASKS))
+    print(f"{scopes} scopes, {len(policies)} policies")
+
+    start = time.perf_counter()
+    index = ScopeIndex(policies)
+    print(f"index built in {time.perf_counter() - start:.3f} s")
+
+    queries = random.Random(0).choices(tasks, k=QUERIES)
+    for name, resolve in (("scan", lambda task: scan(policies, task)), ("ScopeIndex", index.policies_for)):
+        start = time.perf_counter()
+        for task in queries:
+            resolve(task)
+        print(f"{name:>12}: {(time.perf_counter() - start) / QUERIES * 1e6:8.2f} us per task")
+    assert all(set(index.policies_for(task)) == set(scan(policies, task)) for task in queries[:100])
+
+    index.policies_for_tasks(projects[0], Patch, action=PatchAction.MERGE)    # computes the matching tasks once
+    start = time.perf_counter()
+    for project in projects:
+        index.policies_for_tasks(project, Patch, action=PatchAction.MERGE)
+    print(f"merge policies of a repository: {(time.perf_counter() - start) / PROJECTS * 1e6:.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,685 @@
+import unittest
+import contextlib
+import io
+import json
+import tempfile
+import threading
+from pathlib import Path
+
+from antlr4 import InputStream, CommonTokenStream, Token, ParseTreeWalker, ParserRuleContext
+from antlr4.error.ErrorStrategy import DefaultErrorStrategy
+from antlr4.tree.Tree import TerminalNode
+from antlr4.error.ErrorListener import ErrorListener
+from grammar.govdslLexer import govdslLexer
+from grammar.fast_lexer import govdslFastLexer
+from grammar.govdslParser import govdslParser
+from grammar.dfa_cache import DFACache
+from grammar.PolicyCreationListener import PolicyCreationListener
+from grammar.policy_builder import PolicyBuilder
+from grammar.parsing import ParserPool, parse_governance
+from grammar.batch import parse_batch
+from grammar.result_cache import ParseResultCache, model_files
+from grammar.incremental import IncrementalParser
+from grammar.streaming import parse_streaming, parse_with_diagnostics
+from grammar.diagnostics import Diagnostic
+from grammar.govErrorListener import govErrorListener, SyntaxErrorCode, LazyErrorStrategy
+from grammar.symbols import SymbolTable
+from grammar.modules import ModuleLoader
+from grammar.tree_index import ParseTreeIndex
+from grammar.ir import PolicyIR, AppealRightIR
+from grammar.model import GovernanceModel
+from grammar.scope_index import ScopeIndex
+from utils.exceptions import InvalidSyntaxException, CyclicImportException
+from metamodel.governance import (
+    MajorityPolicy, LeaderDrivenPolicy, AppealRight, Condition, Individual, Role, Activity, Task, BooleanDecision
+)
+from utils.chp_extension import LabelCondition, Repository, Patch, PatchAction, MemberLifecycle, MemberAction
+
+class testParsing(unittest.TestCase):
+    def setUp(self):
+        self.test_cases_path = Path(__file__).parent / "test_cases"
+        self.basic_examples = sorted((self.test_cases_path / "valid_examples/basic_examples").glob("*.gov"))
+
+    def test_parse_governance_from_path_and_text(self):
+        """parse_governance accepts both a path and the document text."""
+        path = self.test_cases_path / "valid_examples/basic_examples/majority_policy.gov"
+        from_path = parse_governance(path)
+        from_text = parse_governance(path.read_text())
+        self.assertEqual(len(from_path), 1)
+        self.assertIsInstance(from_path[0], MajorityPolicy)
+        self.assertEqual(from_path[0].name, from_text[0].name)
+        self.assertEqual(from_path[0].scope.name, "myTask")
+
+    def test_parse_governance_syntax_error(self):
+        """A syntax error is surfaced as InvalidSyntaxException instead of a partial model."""
+        path = self.test_cases_path / "invalid_examples/invalid_appeal_inline_formatting.gov"
+        with self.assertRaises(InvalidSyntaxException) as raised_exception:
+            parse_governance(path)
+        self.assertIn("line", str(raised_exception.exception))
+
+    def test_parse_valid_examples(self):
+        """Every valid example accepted by the plain ANTLR parser is parsed, in each parsing mode."""
+        # Written against an older version of the grammar
+        rejected = {"flutter_pr_landing.gov", "golang_code_review.gov", "nodejs_pr_merge.gov"}
+        paths = sorted((self.test_cases_path / "valid_examples").rglob("*.gov"))
+        self.assertIn("ethicalsourcedev_governance.gov", {path.name for path in paths})
+        for path in paths:
+            if path.name in rejected:
+                continue
+            for options in ({}, {"fast_lexer": True}, {"two_stage": False}, {"compact": True}):
+                with self.subTest(path=path.name, **options):
+                    self.assertTrue(len(parse_governance(path, **options)) > 0)
+
+    def test_token_recognition_errors_are_not_fatal(self):
+        """Characters the lexer does not recognize are skipped, as by the plain ANTLR parser."""
+        text = (self.test_cases_path / "valid_examples/real_world/ethicalsourcedev_governance.gov").read_text()
+        self.assertIn("EthicalSource/ethicalsource.dev", text)
+        pool = ParserPool()
+        with pool.checkout(text) as pooled:
+            pooled.parser.governance()
+            self.assertEqual(pooled.error_listener.error_count, 0)
+            self.assertEqual([e.code for e in pooled.lexer_error_listener.errors], [SyntaxErrorCode.TOKEN_RECOGNITION])
+        self.assertEqual(len(pool.parse(text)), len(parse_governance(text, fast_lexer=True)))
+
+    def test_pool_reuses_parsers(self):
+        """Parsing documents sequentially keeps reusing the same pooled parser."""
+        pool = ParserPool(max_size=1)
+        with pool.checkout("") as first:
+            pass
+        for path in self.basic_examples:
+            policies = pool.parse(path.read_text())
+            self.assertTrue(len(policies) > 0)
+        with pool.checkout("") as last:
+            self.assertIs(first, last)
+
+    def test_pool_concurrent_parsing(self):
+        """A pool shared between threads builds the same policies as sequential parsing."""
+        pool = ParserPool(max_size=4)
+        texts = [path.read_text() for path in self.basic_examples] * 3
+        expected = [[p.name for p in pool.parse(text)] for text in texts]
+        results = [None] * len(texts)
+
+        def worker(index):
+            results[index] = [p.name for p in pool.parse(texts[index])]
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(texts))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, expected)
+
+    def test_two_stage_matches_ll(self):
+        """SLL-first parsing yields the same trees and errors as full LL over all test cases."""
+        pool = ParserPool()
+        for path in sorted(self.test_cases_path.rglob("*.gov")):
+            text = path.read_text()
+            with pool.checkout(text) as pooled:
+                ll_tree = pooled.parser.governance().toStringTree(recog=pooled.parser)
+                ll_error = pooled.error_listener.error_message
+            with pool.checkout(text) as pooled:
+                tree, _ = pooled.parse_two_stage()
+                self.assertEqual(tree.toStringTree(recog=pooled.parser), ll_tree, path.name)
+                self.assertEqual(pooled.error_listener.error_message, ll_error, path.name)
+
+    def test_two_stage_fallback_statistics(self):
+        """Valid documents are parsed with SLL only; a syntax error triggers the LL fallback."""
+        pool = ParserPool()
+        for path in self.basic_examples:
+            pool.parse(path.read_text())
+        self.assertEqual(pool.statistics.documents, len(self.basic_examples))
+        self.assertEqual(pool.statistics.ll_fallbacks, 0)
+
+        invalid = self.test_cases_path / "invalid_examples/invalid_appeal_inline_formatting.gov"
+        with self.assertRaises(InvalidSyntaxException):
+            pool.parse(invalid.read_text())
+        self.assertEqual(pool.statistics.ll_fallbacks, 1)
+        print(f"\nTwo-stage parsing: {pool.statistics}")
+
+    def test_dfa_cache_round_trip(self):
+        """A DFA restored from the cache parses every test case exactly like a freshly learned one."""
+        pool = ParserPool()
+        paths = sorted(self.test_cases_path.rglob("*.gov"))
+        expected = []
+        for path in paths:
+            with pool.checkout(path.read_text()) as pooled:
+                tree, _ = pooled.parse_two_stage()
+                expected.append((tree.toStringTree(recog=pooled.parser), pooled.error_listener.error_message))
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = DFACache(cache_dir)
+            self.assertTrue(cache.save())
+            self.assertTrue(cache.path.exists())
+            self.assertIn(cache.key[:16], cache.path.name)
+            learned_size = DFACache.dfa_size()
+
+            # Forget the DFA, as a new process would, and load it back from disk
+            for cls in (govdslLexer, govdslParser):
+                for dfa in cls.decisionsToDFA:
+                    dfa._states = {}
+                    dfa.s0 = None
+            self.assertEqual(DFACache.dfa_size(), 0)
+            self.assertTrue(cache.load())
+            self.assertEqual(DFACache.dfa_size(), learned_size)
+
+            for path, (tree_text, error) in zip(paths, expected):
+                with pool.checkout(path.read_text()) as pooled:
+                    tree, _ = pooled.parse_two_stage()
+                    self.assertEqual(tree.toStringTree(recog=pooled.parser), tree_text, path.name)
+                    self.assertEqual(pooled.error_listener.error_message, error, path.name)
+            # Nothing new had to be learned
+            self.assertEqual(DFACache.dfa_size(), learned_size)
+
+    def test_dfa_cache_invalidated_by_grammar_change(self):
+        """A cache file written for another grammar version is ignored."""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = DFACache(cache_dir)
+            self.assertFalse(cache.load())
+            ParserPool()
+            self.assertTrue(cache.save())
+            data = json.loads(cache.path.read_text())
+            data["grammar"] = "0" * 64
+            cache.path.write_text(json.dumps(data))
+            self.assertFalse(cache.load())
+
+    def tokenize(self, lexer_class, text: str):
+        """Returns the token stream and lexical errors produced by lexer_class on text."""
+        errors = []
+
+        class ErrorCollector(ErrorListener):
+            def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+                errors.append((line, column, msg))
+
+        lexer = lexer_class(InputStream(text))
+        lexer.removeErrorListeners()
+        lexer.addErrorListener(ErrorCollector())
+        tokens = []
+        while True:
+            token = lexer.nextToken()
+            tokens.append((token.type, token.text, token.start, token.stop, token.line, token.column))
+            if token.type == Token.EOF:
+                return tokens, errors
+
+    def test_fast_lexer_conformance(self):
+        """govdslFastLexer produces the same token stream and errors as govdslLexer on every test case."""
+        paths = sorted(self.test_cases_path.rglob("*.gov"))
+        self.assertTrue(paths)
+        for path in paths:
+            text = path.read_text()
+            self.assertEqual(self.tokenize(govdslFastLexer, text), self.tokenize(govdslLexer, text), path.name)
+        # Lexical errors and tokens that only share a prefix with a literal
+        for text in ["-x 12.x -3.25", "a\rb\r\n", "(Agentx Pull req", "@ vote valu", "Scope Scopes"]:
+            self.assertEqual(self.tokenize(govdslFastLexer, text), self.tokenize(govdslLexer, text), repr(text))
+
+    def test_parse_governance_fast_lexer(self):
+        """Selecting the fast lexer at parse time builds the same policies and reports the same errors."""
+        pool = ParserPool()
+        for path in self.basic_examples:
+            expected = [p.name for p in pool.parse(path.read_text())]
+            self.assertEqual([p.name for p in pool.parse(path.read_text(), fast_lexer=True)], expected)
+        invalid = self.test_cases_path / "invalid_examples/invalid_appeal_inline_formatting.gov"
+        with self.assertRaises(InvalidSyntaxException) as expected_error:
+            parse_governance(invalid)
+        with self.assertRaises(InvalidSyntaxException) as raised_exception:
+            parse_governance(invalid, fast_lexer=True)
+        self.assertEqual(str(raised_exception.exception), str(expected_error.exception))
+
+    def test_parse_batch(self):
+        """Batch parsing across processes returns one result per document, with structured errors."""
+        invalid = self.test_cases_path / "invalid_examples/invalid_appeal_inline_formatting.gov"
+        sources = self.basic_examples + [invalid, self.basic_examples[0].read_text()]
+        results = list(parse_batch(sources, workers=2, chunk_size=3))
+        self.assertEqual(sorted(r.index for r in results), list(range(len(sources))))
+
+        by_index = {r.index: r for r in results}
+        for index, path in enumerate(self.basic_examples):
+            self.assertTrue(by_index[index].ok, str(by_index[index]))
+            self.assertEqual(by_index[index].path, str(path))
+            self.assertEqual([p.name for p in by_index[index].policies], [p.name for p in parse_governance(path)])
+        failed = by_index[len(self.basic_examples)]
+        self.assertFalse(failed.ok)
+        self.assertIsNone(failed.policies)
+        self.assertEqual(failed.error_type, "InvalidSyntaxException")
+        self.assertIn("line", failed.error_message)
+        from_text = by_index[len(sources) - 1]
+        self.assertIsNone(from_text.path)
+        self.assertEqual([p.name for p in from_text.policies], [p.name for p in by_index[0].policies])
+
+    def test_result_cache(self):
+        """Unchanged documents are served from the cache, in memory with LRU eviction and from disk."""
+        cache = ParseResultCache(max_entries=2)
+        paths = self.basic_examples[:3]
+        first = parse_governance(paths[0], cache=cache)
+        again = parse_governance(paths[0].read_text(), cache=cache)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertIs(again[0], first[0])
+
+        parse_governance(paths[1], cache=cache)
+        parse_governance(paths[2], cache=cache)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(paths[0].read_text()))
+        self.assertNotEqual(cache.key("a"), cache.key("b"))
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            parse_governance(paths[0], cache=ParseResultCache(directory=cache_dir))
+            other_process = ParseResultCache(directory=cache_dir)
+            policies = other_process.get(paths[0].read_text())
+            self.assertEqual(other_process.hits, 1)
+            self.assertEqual([p.name for p in policies], [p.name for p in first])
+            self.assertEqual(policies[0].scope.name, first[0].scope.name)
+
+        # Cache keys change with any module taking part in building the policies
+        root = self.test_cases_path.parent.parent
+        hashed = {path.relative_to(root).as_posix() for path in model_files()}
+        for module in ("grammar/policy_builder.py", "grammar/parsing.py", "grammar/symbols.py",
+                       "grammar/PolicyCreationListener.py", "metamodel/governance.py", "utils/validation.py"):
+            self.assertIn(module, hashed)
+
+    def test_incremental_reparse(self):
+        """Only edited policy blocks and the policies referring to them are parsed and rebuilt again."""
+        path = self.test_cases_path / "valid_examples/basic_examples/leader_driven_and_consensus_referenced_default.gov"
+        text = path.read_text()
+        extra = "MajorityPolicy otherPolicy {\n    Scope: testProject\n    DecisionType as BooleanDecision\n" \
+                "    Participant list : leader as maintainers\n    Parameters:\n        ratio : 0.5\n}\n"
+        incremental = IncrementalParser()
+        first = incremental.parse(text + extra)
+        self.assertEqual(incremental.rebuilt_policies, ["referencedPolicy", "testPolicy", "testPolicy2", "otherPolicy"])
+
+        edited = text + extra.replace("0.5", "0.75")
+        policies = incremental.parse(edited)
+        self.assertEqual(incremental.reparsed_regions, 1)
+        self.assertEqual(incremental.rebuilt_policies, ["otherPolicy"])
+        self.assertEqual(policies[3].ratio, 0.75)
+        self.assertEqual([p.name for p in policies], [p.name for p in parse_governance(edited)])
+        self.assertIs(policies[0], first[0])
+        self.assertIs(policies[3].scope, policies[0].scope)
+
+        # The default of testPolicy and the fallback of testPolicy2 are rebuilt with their target
+        edited = edited.replace("Participant list : maintainers\n}", "Participant list : leader\n}", 1)
+        policies = incremental.parse(edited)
+        self.assertEqual(incremental.rebuilt_policies, ["referencedPolicy", "testPolicy", "testPolicy2"])
+        self.assertIs(policies[1].default, policies[0])
+        self.assertIs(policies[2].fallback, policies[0])
+        self.assertIs(policies[3], incremental.parse(edited)[3])
+
+        # Errors are reported as by a full parse, and later versions are still handled
+        broken = edited.replace("ratio : 0.75", "ratio 0.75")
+        with self.assertRaises(InvalidSyntaxException) as expected_error:
+            parse_governance(broken)
+        with self.assertRaises(InvalidSyntaxException) as raised_exception:
+            incremental.parse(broken)
+        self.assertEqual(str(raised_exception.exception), str(expected_error.exception))
+        self.assertEqual([p.name for p in incremental.parse(edited)], [p.name for p in policies])
+
+    def test_parse_streaming(self):
+        """Policies are yielded block by block, forward references are resolved once their target is built."""
+        path = self.test_cases_path / "valid_examples/basic_examples/leader_driven_and_consensus_referenced_default.gov"
+        text = path.read_text()
+        referenced_block = text[text.index("MajorityPolicy"):text.index("LeaderDrivenPolicy")]
+        forward = text.replace(referenced_block, "") + "\n" + referenced_block
+
+        lines_read = []
+        def lines():
+            for line in text.splitlines(keepends=True):
+                lines_read.append(line)
+                yield line
+        stream = parse_streaming(lines())
+        self.assertEqual(next(stream).name, "referencedPolicy")
+        self.assertLess(len(lines_read), len(text.splitlines()))
+        self.assertEqual([p.name for p in stream], ["testPolicy", "testPolicy2"])
+
+        policies = list(parse_streaming(forward))
+        self.assertEqual([p.name for p in policies], ["referencedPolicy", "testPolicy", "testPolicy2"])
+        self.assertIs(policies[1].default, policies[0])
+        self.assertIs(policies[2].fallback, policies[0])
+        self.assertEqual(sorted(p.name for p in parse_governance(forward)), sorted(p.name for p in policies))
+
+        # Syntax errors are located in the whole document
+        broken = forward.replace("fallback : referencedPolicy", "fallback referencedPolicy")
+        with self.assertRaises(InvalidSyntaxException) as expected_error:
+            parse_governance(broken)
+        with self.assertRaises(InvalidSyntaxException) as raised_exception:
+            list(parse_streaming(broken))
+        self.assertEqual(str(raised_exception.exception), str(expected_error.exception))
+
+    def test_parse_with_diagnostics(self):
+        """Every broken policy is reported in one pass, and the other policies are still built."""
+        path = self.test_cases_path / "invalid_examples/invalid_multiple_errors.gov"
+        policies, diagnostics = parse_with_diagnostics(path)
+        self.assertEqual([p.name for p in policies], ["goodPolicy"])
+        self.assertEqual([(d.kind, d.policy, d.line) for d in diagnostics], [
+            (Diagnostic.SYNTAX, "brokenSyntax", 15),
+            (Diagnostic.SEMANTIC, "unknownParticipant", 17),
+            (Diagnostic.SEMANTIC, "dependsOnBroken", 22),
+            (Diagnostic.SEMANTIC, "forwardPolicy", 29),
+            (Diagnostic.SEMANTIC, "lastPolicy", 36),
+        ])
+        self.assertEqual(str(diagnostics[0]), "line 15:21 in policy 'brokenSyntax' syntax error: missing ':' at 'maintainers'")
+        self.assertEqual(diagnostics[4].error_type, "InvalidValueException")
+
+        # Valid documents have no diagnostics
+        path = self.test_cases_path / "valid_examples/basic_examples/leader_driven_and_consensus_referenced_default.gov"
+        policies, diagnostics = parse_with_diagnostics(path)
+        self.assertEqual(diagnostics, [])
+        self.assertEqual(len(policies), 3)
+
+    def test_error_listener_records(self):
+        """Syntax errors are recorded with their code, position, offending token and expected tokens."""
+        path = self.test_cases_path / "invalid_examples/invalid_multiple_errors.gov"
+        text = path.read_text().replace("Scope: testProject", "Scope testProject").replace("ratio : 1.5", "ratio 1.5 %")
+        pool = ParserPool()
+        with pool.checkout(text) as pooled:
+            pooled.parser.governance()
+            error_listener = pooled.error_listener
+            lexer_error_listener = pooled.lexer_error_listener
+        errors = error_listener.errors
+        self.assertEqual(error_listener.error_count, len(errors))
+        self.assertEqual(error_listener.error_message, errors[-1].message)
+        self.assertEqual([e.line for e in errors[:2]], [8, 13])
+
+        missing = errors[0]
+        self.assertEqual(missing.code, SyntaxErrorCode.MISSING_TOKEN)
+        self.assertEqual((missing.line, missing.column, missing.symbol), (8, 10, "testProject"))
+        self.assertEqual(missing.token_type, govdslParser.ID)
+        self.assertEqual(missing.expected, {govdslParser.literalNames.index("':'")})
+        self.assertEqual(missing.message, "line 8:10 missing ':' at 'testProject'")
+
+        # Token recognition errors are recorded apart and do not count as syntax errors
+        self.assertNotIn(SyntaxErrorCode.TOKEN_RECOGNITION, {e.code for e in errors})
+        lexical, = lexer_error_listener.errors
+        self.assertEqual(lexical.code, SyntaxErrorCode.TOKEN_RECOGNITION)
+        self.assertEqual((lexical.symbol, lexical.token_index, lexical.token_type), ("%", -1, None))
+        self.assertEqual(lexical.expected, frozenset())
+
+        # Errors beyond max_errors are counted, and the last one is still described
+        capped = govErrorListener(max_errors=1)
+        with pool.checkout(text) as pooled:
+            pooled.parser.removeErrorListeners()
+            pooled.parser.addErrorListener(capped)
+            pooled.parser.governance()
+        self.assertEqual(len(capped.errors), 1)
+        self.assertTrue(capped.truncated)
+        self.assertEqual(capped.error_count, error_listener.error_count)
+        self.assertEqual(capped.error_message, errors[-1].message)
+
+    def test_lazy_error_strategy_with_other_listeners(self):
+        """Listeners other than govErrorListener receive the formatted message, as with the default strategy."""
+        text = "Scopes { Project x }"
+
+        def parse(strategy):
+            parser = govdslParser(CommonTokenStream(govdslLexer(InputStream(text))))
+            parser._errHandler = strategy
+            recorded, console = govErrorListener(), io.StringIO()
+            parser.addErrorListener(recorded)    # next to the default ConsoleErrorListener
+            with contextlib.redirect_stderr(console):
+                parser.governance()
+            return console.getvalue(), [(e.code, e.message, e.expected) for e in recorded.errors]
+
+        console, records = parse(LazyErrorStrategy())
+        self.assertTrue(console)
+        self.assertEqual((console, records), parse(DefaultErrorStrategy()))
+
+    def test_shared_symbol_table(self):
+        """Documents parsed with a SymbolTable only contain policies and reuse the table's objects."""
+        path = self.test_cases_path / "valid_examples/basic_examples/majority_policy.gov"
+        text = path.read_text()
+        policy_start = text.index("MajorityPolicy")
+        symbols = SymbolTable.from_document(text[:policy_start])
+        self.assertIn("myTask", symbols.scopes)
+        self.assertIn("joeProfile", symbols.profiles)
+        with self.assertRaises(TypeError):
+            symbols.participants["bob"] = symbols.participants["joe"]
+
+        expected = parse_governance(text)[0]
+        for two_stage in (True, False):
+            policy = parse_governance(text[policy_start:], symbols=symbols, two_stage=two_stage)[0]
+            self.assertEqual(policy.name, expected.name)
+            self.assertIs(policy.scope, symbols.scopes["myTask"])
+            self.assertEqual(sorted(p.name for p in policy.participants), sorted(p.name for p in expected.participants))
+            assigned = {p.name for p in policy.participants if isinstance(p, Individual) and p.role_assignement}
+            for participant in policy.participants:
+                shared = symbols.participants[participant.name]
+                if participant.name in assigned or assigned & {i.name for i in getattr(shared, "individuals", None) or ()}:
+                    # Assigning a role in a policy modifies the individual, so the document has its own copy,
+                    # and of the roles it is a member of
+                    self.assertIsNot(participant, shared)
+                    self.assertIsNone(getattr(shared, "role_assignement", None))
+                else:
+                    self.assertIs(participant, symbols.participants[participant.name])
+
+        # Sections of the document itself are added to the table for that document only
+        local = text[:policy_start].replace("alexander", "alex") + text[policy_start:].replace("reviewer\n", "alex\n")
+        self.assertIn("alex", [p.name for p in parse_governance(local, symbols=symbols)[0].participants])
+        self.assertNotIn("alex", symbols.participants)
+        with self.assertRaises(InvalidSyntaxException):
+            parse_governance(text[:policy_start], symbols=symbols)
+
+    def test_symbol_table_unchanged_by_documents(self):
+        """Documents assigning members to the table's roles, or roles to its individuals, work on copies."""
+        symbols = SymbolTable.from_document("Scopes:\n Projects:\n  project\n"
+                                            "Participants:\n Roles: reviewer, tester\n"
+                                            " Individuals: joe { role : reviewer }, ann { role : reviewer, tester }\n")
+        reviewer, joe = symbols.participants["reviewer"], symbols.participants["joe"]
+        policy_text = ("MajorityPolicy {0}Policy {{\n Scope: project\n DecisionType as BooleanDecision\n"
+                       " Participant list : reviewer, tester, joe as reviewer\n}}\n")
+        documents = [("alice", False, "Participants:\n Individuals: alice { role : reviewer }\n"),
+                     ("bob", True, "Participants:\n Individuals: bob { role : reviewer }\n"),
+                     ("carol", False, "")]
+        for name, compact, participants in documents:
+            policy = parse_governance(participants + policy_text.format(name), symbols=symbols, compact=compact)[0]
+            members = {p.name: p for p in policy.participants}
+            expected = {"joe", "ann", name} if participants else {"joe", "ann"}
+            self.assertEqual({i.name for i in members["reviewer"].individuals}, expected)
+            self.assertEqual(members["joe"].role_assignement.name, "joe_reviewer")
+            # Roles and their members point to each other, copies included
+            individuals = {i for role in (members["reviewer"], members["tester"]) for i in role.individuals}
+            roles = {r for i in individuals for r in i.roles} | {members["reviewer"], members["tester"]}
+            for role in roles:
+                for individual in individuals:
+                    self.assertEqual(any(i is individual for i in role.individuals),
+                                     any(r is role for r in individual.roles), (role.name, individual.name))
+            self.assertTrue(any(i is members["joe"] for i in members["reviewer"].individuals))
+        self.assertEqual({i.name for i in reviewer.individuals}, {"joe", "ann"})
+        self.assertEqual(joe.roles, {reviewer})
+        self.assertIsNone(joe.role_assignement)
+        self.assertIs(symbols.participants["reviewer"], reviewer)
+
+    def test_module_imports(self):
+        """Imported files are compiled once and re-compiled only when they change."""
+        path = self.test_cases_path / "valid_examples/basic_examples/majority_policy.gov"
+        text = path.read_text()
+        policy_start = text.index("MajorityPolicy")
+        with tempfile.TemporaryDirectory() as directory:
+            directory = Path(directory)
+            (directory / "shared").mkdir()
+            (directory / "shared" / "scopes.gov").write_text(text[:text.index("Participants:")])
+            (directory / "shared" / "participants.gov").write_text(
+                "Import : scopes.gov\n" + text[text.index("Participants:"):policy_start])
+            document = directory / "policy.gov"
+            document.write_text("Import : shared/participants.gov\n\n" + text[policy_start:])
+
+            loader = ModuleLoader()
+            policy = loader.parse(document)[0]
+            expected = parse_governance(text)[0]
+            self.assertEqual(policy.name, expected.name)
+            self.assertEqual(policy.scope.name, "myTask")
+            self.assertEqual(sorted(p.name for p in policy.participants), sorted(p.name for p in expected.participants))
+            self.assertEqual(loader.compiled, 2)
+
+            # Unchanged imports are not parsed again; a changed one is, with the files importing it
+            self.assertIs(loader.parse(document)[0].scope, policy.scope)
+            self.assertEqual(loader.compiled, 2)
+            (directory / "shared" / "scopes.gov").write_text(text[:text.index("Participants:")] + "\n")
+            self.assertIsNot(loader.parse(document)[0].scope, policy.scope)
+            self.assertEqual(loader.compiled, 4)
+
+            # Syntax errors keep their line numbers in the importing document
+            document.write_text(document.read_text().replace("DecisionType as", "DecisionType", 1))
+            with self.assertRaises(InvalidSyntaxException) as raised_exception:
+                loader.parse(document)
+            self.assertTrue(raised_exception.exception.error_message.startswith("line 5:"))
+
+            (directory / "shared" / "scopes.gov").write_text("Import : participants.gov\n")
+            with self.assertRaises(CyclicImportException):
+                loader.parse(document)
+
+    def test_descendant_queries(self):
+        """Type queries match a recursive walk, in document order, and work on trees deeper than the recursion limit."""
+        def recursive(node, target_type):
+            found = [node] if isinstance(node, target_type) else []
+            for i in range(node.getChildCount()):
+                found.extend(recursive(node.getChild(i), target_type))
+            return found
+
+        text = (self.test_cases_path / "valid_examples/basic_examples/maj_with_veto_right.gov").read_text()
+        with ParserPool().checkout(text) as pooled:
+            tree = pooled.parser.governance()
+        listener = PolicyCreationListener()
+        index = ParseTreeIndex(tree)
+        policy = recursive(tree, govdslParser.PolicyContext)[0]
+        for target_type in (govdslParser.PolicyContext, govdslParser.VetoRightContext, TerminalNode,
+                            ParserRuleContext, (govdslParser.PolicyContext, TerminalNode)):
+            expected = recursive(tree, target_type)
+            self.assertEqual(listener.find_descendant_nodes_by_type(tree, target_type), expected)
+            self.assertEqual(list(listener.iter_descendant_nodes_by_type(tree, target_type)), expected)
+            self.assertEqual(index.find(target_type), expected)
+            self.assertEqual(index.find(target_type, policy), recursive(policy, target_type))
+
+        root = node = ParserRuleContext()
+        for _ in range(5000):
+            node = node.addChild(ParserRuleContext(node))
+        self.assertEqual(len(listener.find_descendant_nodes_by_type(root, ParserRuleContext)), 5001)
+        self.assertEqual(ParseTreeIndex(root).find(ParserRuleContext, node), [node])
+
+    def test_compact_ir(self):
+        """Building through the compact IR gives the same policies, and raises the same errors, as the parse tree."""
+        def outcome(text, **options):
+            def describe(policy):
+                nested = [getattr(policy, name, None) for name in ("default", "fallback")]
+                nested += getattr(policy, "phases", [])
+                nested += [c.policy for c in getattr(policy, "conditions", ()) if isinstance(c, AppealRight)]
+                return (type(policy).__name__, policy.name, getattr(policy.scope, "name", None),
+                        sorted(p.name for p in getattr(policy, "participants", ())),
+                        sorted(type(c).__name__ for c in getattr(policy, "conditions", ())),
+                        [describe(p) for p in nested if p is not None])
+            try:
+                return [describe(p) for p in ParserPool().parse(text, **options)]
+            except Exception as e:
+                return type(e).__name__, str(e)
+
+        for path in sorted(self.test_cases_path.rglob("*.gov")):
+            text = path.read_text()
+            self.assertEqual(outcome(text, compact=True), outcome(text), path.name)
+        text = (self.test_cases_path / "valid_examples/basic_examples/majority_policy.gov").read_text()
+        policy_start = text.index("MajorityPolicy")
+        for invalid in (text[policy_start:] + text[:policy_start], text[:policy_start],
+                        text.replace("role : reviewer", "role : nobody").replace("as StringList", "as")):
+            self.assertEqual(outcome(invalid, compact=True), outcome(invalid))
+        symbols = SymbolTable.from_document(text[:policy_start])
+        self.assertEqual(outcome(text[policy_start:], symbols=symbols, compact=True),
+                         outcome(text[policy_start:], symbols=symbols))
+
+        document = ParserPool().lower(text)
+        self.assertIn("myTask", document.scopes)
+        policy = document.policies[0]
+        self.assertEqual((policy.kind, policy.name, policy.scope, policy.line), ("MajorityPolicy", "testPolicy", "myTask", 42))
+        self.assertIn(("joe", "maintainer"), policy.participants)
+        appeal = next(c for c in policy.conditions if isinstance(c, AppealRightIR))
+        self.assertIsInstance(appeal.policy, PolicyIR)
+        self.assertEqual((appeal.policy.name, appeal.policy.nested), ("appealPolicy", True))
+
+    def test_policy_builder_matches_listener(self):
+        """PolicyBuilder builds the same policies, and raises the same errors, as walking PolicyCreationListener."""
+        def outcome(construct, tree):
+            try:
+                return [(type(p).__name__, p.name, p.scope.name, sorted(type(c).__name__ for c in getattr(p, "conditions", ())))
+                        for p in construct(tree)]
+            except Exception as e:
+                return type(e).__name__, str(e)
+
+        def walk(tree):
+            listener = PolicyCreationListener()
+            ParseTreeWalker.DEFAULT.walk(listener, tree)
+            return listener.get_policies()
+
+        pool = ParserPool()
+        for path in sorted(self.test_cases_path.rglob("*.gov")):
+            with pool.checkout(path.read_text()) as pooled:
+                tree = pooled.parser.governance()
+                if pooled.error_listener.error_message:
+                    continue
+            self.assertEqual(outcome(lambda t: PolicyBuilder().build(t), tree), outcome(walk, tree), path.name)
+
+    def test_leader_driven_referenced_default(self):
+        """References between root policies are resolved through the public API."""
+        path = self.test_cases_path / "valid_examples/basic_examples/leader_driven_and_consensus_referenced_default.gov"
+        policies = {p.name: p for p in parse_governance(path)}
+        self.assertIsInstance(policies["testPolicy"], LeaderDrivenPolicy)
+        self.assertIs(policies["testPolicy"].default, policies["referencedPolicy"])
+
+    def test_governance_model_queries(self):
+        """The model answers scope, participant, condition and reference queries over nested policies."""
+        model = GovernanceModel.from_document(self.test_cases_path / "valid_examples/basic_examples/multi_policy.gov")
+        lc_policy, maj_policy = model.policies["lcPolicy"], model.policies["majPolicy"]
+        self.assertEqual(model.policies_in_scope(maj_policy.scope), [maj_policy, lc_policy])
+        self.assertEqual(model.policies_in_scope("myActivity"), [maj_policy])
+        appeal, = model.conditions_of_type(AppealRight)
+        self.assertIs(model.policy_of(appeal), maj_policy)
+        self.assertEqual(model.referrers(lc_policy), [(maj_policy, "appeal")])
+        self.assertEqual(model.referrers(maj_policy), [])
+
+        model = GovernanceModel.from_document(
+            self.test_cases_path / "valid_examples/real_world/kubernetes_pr_merge.gov", compact=True)
+        root, = model.roots
+        self.assertEqual(list(model.policies), ["pr_merge", "phase_1", "phase_2", "phase_3"])
+        self.assertEqual(len(model), 4)
+        phase_1, phase_2, phase_3 = root.phases
+        self.assertEqual(model.policies_of_participant("Reviewers"), [phase_1])
+        self.assertEqual(model.referrers(phase_2), [(root, "phase")])
+        self.assertEqual(model.policies_in_scope(root.scope), [root, phase_1, phase_2, phase_3])
+        self.assertEqual(len(model.conditions_of_type(LabelCondition)), 4)
+        self.assertEqual(len(model.conditions_of_type(Condition)), 5)
+
+        reviewer = Individual("reviewer", roles={next(iter(phase_1.participants))})
+        self.assertEqual(model.policies_of_participant(reviewer), [phase_1])
+        self.assertEqual(model.policies_of_participant(reviewer, through_roles=False), [])
+
+    def test_scope_index(self):
+        """Policies governing a scope come from the scope and its ancestors, and can be found per task type."""
+        project = Repository("repo", None, "owner/repo")
+        activities = [Activity(f"activity{i}", None) for i in range(2)]
+        project.activities = set(activities)
+        tasks = {}
+        for activity in activities:
+            activity.project = project
+            activity.tasks = {Patch(f"{activity.name}_{action.name}", None, action) for action in PatchAction}
+            activity.tasks.add(MemberLifecycle(f"{activity.name}_onboard", None, MemberAction.ONBOARD))
+            for task in activity.tasks:
+                task.activity = activity
+            tasks.update((task.name, task) for task in activity.tasks)
+        roles = {Role("maintainers")}
+        decision = BooleanDecision("decision")
+        on_project = MajorityPolicy("onProject", set(), roles, decision, project, None)
+        on_activity = MajorityPolicy("onActivity", set(), roles, decision, activities[1], None)
+        on_merge = MajorityPolicy("onMerge", set(), roles, decision, tasks["activity0_MERGE"], None)
+        index = ScopeIndex([on_project, on_activity, on_merge])
+
+        self.assertEqual(len(index), 11)
+        self.assertEqual(index.policies_for(project), (on_project,))
+        self.assertEqual(index.policies_for(tasks["activity0_MERGE"]), (on_merge, on_project))
+        self.assertEqual(index.policies_for(tasks["activity1_onboard"]), (on_activity, on_project))
+        self.assertEqual(index.policies_for(Task("elsewhere", None)), ())
+        self.assertEqual(index.policies_for_tasks(project, Patch, action=PatchAction.MERGE),
+                         [on_project, on_merge, on_activity])
+        self.assertEqual(index.policies_for_tasks(activities[0], MemberLifecycle), [on_project])
+        self.assertEqual(index.policies_for_tasks(activities[0], Patch, action=PatchAction.REVIEW), [on_project])
+
+        model = GovernanceModel.from_document(self.test_cases_path / "valid_examples/real_world/kubernetes_pr_merge.gov")
+        root, = model.roots
+        repository = root.scope.activity.project
+        self.assertEqual(model.scope_index.policies_for_tasks(repository, Patch, action=PatchAction.MERGE),
+                         [root, *root.phases])
+        self.assertEqual(model.scope_index.policies_for_tasks(repository, MemberLifecycle), [])
+
+if __name__ == '__main__':
+    unittest.main()
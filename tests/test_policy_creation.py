@@ -2,30 +2,39 @@ import unittest
 from datetime import timedelta
 import io
 from pathlib import Path
+import pickle
+import sys
+import threading
+import gc
+import weakref
 
 from antlr4 import (
     InputStream, CommonTokenStream, ParseTreeWalker
 )
 from antlr4.error.ErrorStrategy import BailErrorStrategy
 from antlr4.error.Errors import ParseCancellationException
+from besser.BUML.metamodel.structural import Element
 from grammar.govdslLexer import govdslLexer
 from grammar.govdslParser import govdslParser
 from grammar.PolicyCreationListener import PolicyCreationListener
 from grammar.govErrorListener import govErrorListener
+from grammar.parsing import parse_governance, validate_governance, run_nested
+from utils.validation import collect_errors, ValidationResult
 from utils.exceptions import (
     EmptySetException, InvalidParticipantException, InvalidScopeException, UndefinedAttributeException, 
-    InvalidValueException, DuplicateAttributeException
+    InvalidValueException, DuplicateAttributeException, CyclicReferenceException, InvalidSyntaxException
 )
 from metamodel.governance import (
     AppealRight, ConsensusPolicy, MinDecisionTime, Role, Deadline, MajorityPolicy, Task,
     Individual, ComposedPolicy, Project, Agent,
     AbsoluteMajorityPolicy, LeaderDrivenPolicy, ParticipantExclusion, EvaluationMode,
     LazyConsensusPolicy, MinimumParticipant, VetoRight, 
-    Activity, BooleanDecision, StringList, ElementList
+    Activity, BooleanDecision, StringList, ElementList, CommunicationChannel, VotingPolicy,
+    ValueElement
 )
 from utils.chp_extension import (
     PatchAction, MemberAction, PullRequest, Repository, Patch, CheckCiCd,
-    LabelCondition, MinTime, MemberLifecycle
+    LabelCondition, MinTime, MemberLifecycle, Label
 )
 
 class testPolicyCreation(unittest.TestCase):
@@ -132,6 +141,196 @@ class testPolicyCreation(unittest.TestCase):
                 walker.walk(listener, tree)
             print(f"\nException message: {str(raised_exception.exception)}")
 
+    def test_invalid_cyclic_default_reference(self):
+        """Policies that are each other's default should raise instead of looping forever."""
+        with open(self.test_cases_path / "invalid_examples/invalid_cyclic_default_reference.gov", "r") as file:
+            text = file.read()
+            parser = self.setup_parser(text)
+            tree = parser.governance()
+            listener = PolicyCreationListener()
+            walker = ParseTreeWalker()
+            with self.assertRaises(CyclicReferenceException) as raised_exception:
+                walker.walk(listener, tree)
+            self.assertEqual(sorted(set(raised_exception.exception.cycle)), ["firstPolicy", "secondPolicy"])
+            print(f"\nException message: {str(raised_exception.exception)}")
+
+    def test_scope_hierarchy(self):
+        """Scopes are indexed by name and by parent, and names defined twice are reported."""
+        text = (self.test_cases_path / "valid_examples/basic_examples/majority_policy.gov").read_text()
+        parser = self.setup_parser(text)
+        tree = parser.governance()
+        listener = PolicyCreationListener()
+        ParseTreeWalker().walk(listener, tree)
+        scopes = listener.get_scopes()
+        children = listener.get_scope_children()
+        self.assertEqual([s.name for s in children["testProjectGH"]], ["myActivity"])
+        self.assertEqual([s.name for s in children["myActivity"]], ["myTask"])
+        self.assertIs(scopes["myActivity"].project, scopes["testProjectGH"])
+        self.assertIs(scopes["myTask"].activity, scopes["myActivity"])
+        self.assertIsNone(scopes["myActivity2"].project)
+
+        duplicated = text.replace("myActivity2", "myActivity")
+        parser = self.setup_parser(duplicated)
+        tree = parser.governance()
+        with self.assertRaises(DuplicateAttributeException) as raised_exception:
+            ParseTreeWalker().walk(PolicyCreationListener(), tree)
+        self.assertEqual(raised_exception.exception.context_name, "myActivity")
+
+    def test_undeclared_vetoers_are_shared(self):
+        """An undeclared vetoer is the same Individual in every condition naming it."""
+        text = (self.test_cases_path / "valid_examples/basic_examples/maj_with_veto_right.gov").read_text()
+        second = text[text.index("MajorityPolicy"):].replace("testPolicy", "otherPolicy")
+        policies = parse_governance(text + "\n" + second)
+        vetoers = [{v.name: v for v in next(iter(p.conditions)).vetoers} for p in policies]
+        self.assertIs(vetoers[0]["diego"], vetoers[1]["diego"])
+        self.assertIs(vetoers[0]["projectOwner"], vetoers[1]["projectOwner"])
+        self.assertIsInstance(vetoers[0]["projectOwner"], Role)
+
+    def test_deeply_nested_policies(self):
+        """Scopes propagate through, and documents parse with, thousands of nesting levels."""
+        project, other = Project("project", None), Project("other", None)
+        decision = BooleanDecision("decision")
+        maintainers = {Role("maintainers")}
+        innermost = MajorityPolicy("p3000", set(), maintainers, decision, None, None)
+        policy = innermost
+        for level in reversed(range(3000)):
+            policy = LeaderDrivenPolicy(f"p{level}", set(), maintainers, decision, None, None, default=policy)
+        innermost.scope = other
+        with self.assertRaises(InvalidScopeException):
+            policy.scope = project
+        # Every default policy took the scope over, down to the innermost one, which has another scope
+        self.assertIs(policy.default.scope, project)
+        self.assertIs(innermost.scope, other)
+
+        phases = [MajorityPolicy("phase", set(), maintainers, decision, other, None)]
+        for level in range(3000):
+            phases = [ComposedPolicy(f"c{level}", phases, True, True, False)]
+        phases[0].scope = project
+        phase = phases[0]
+        while isinstance(phase, ComposedPolicy):
+            phase = phase.phases[0]
+        self.assertIs(phase.scope, project)
+
+        text = "MajorityPolicy p1000 {\n DecisionType as BooleanDecision\n Participant list : maintainers\n}"
+        for level in reversed(range(1000)):
+            scope = " Scope: project\n" if level == 0 else ""
+            text = (f"LeaderDrivenPolicy p{level} {{\n{scope} DecisionType as BooleanDecision\n"
+                    f" Participant list : maintainers\n Parameters:\n  default : {text}\n}}")
+        text = "Scopes:\n Projects:\n  project\nParticipants:\n Roles: maintainers\n" + text
+        policy = parse_governance(text)[0]
+        levels = 0
+        while isinstance(policy, LeaderDrivenPolicy):
+            self.assertEqual(policy.scope.name, "project")
+            policy, levels = policy.default, levels + 1
+        self.assertEqual((levels, policy.name, policy.scope.name), (1000, "p1000", "project"))
+        self.assertTrue(validate_governance(text).ok)
+
+        # Deep documents are parsed in a dedicated thread, and the recursion limit is restored afterwards
+        limit = sys.getrecursionlimit()
+        self.assertIsNot(run_nested(text, threading.current_thread), threading.current_thread())
+        self.assertIs(run_nested("MajorityPolicy p {}", threading.current_thread), threading.current_thread())
+        with self.assertRaises(InvalidSyntaxException):
+            parse_governance(text.replace("Parameters:", "Parameters", 1))
+        self.assertEqual(sys.getrecursionlimit(), limit)
+
+    def test_compact_metamodel_objects(self):
+        """Metamodel objects keep their attributes in slots, are still Elements and still validate."""
+        text = (self.test_cases_path / "valid_examples/basic_examples/maj_with_veto_right.gov").read_text()
+        policy = parse_governance(text)[0]
+        objects = [policy, policy.scope, policy.decision_type, *policy.participants, *policy.conditions]
+        for obj in objects:
+            self.assertIsInstance(obj, Element)
+            self.assertFalse(hasattr(obj, "__dict__"), type(obj).__name__)
+        with self.assertRaises(AttributeError):
+            policy.undeclared = True
+
+        copy = pickle.loads(pickle.dumps(policy))
+        self.assertEqual((copy.name, copy.scope.name, copy.ratio), (policy.name, policy.scope.name, policy.ratio))
+        self.assertEqual({p.name for p in copy.participants}, {p.name for p in policy.participants})
+
+        with self.assertRaises(InvalidValueException):
+            copy.ratio = 2
+        with self.assertRaises(EmptySetException):
+            copy.participants = set()
+
+    def test_interned_value_objects(self):
+        """Repeated labels and decision types are one shared, immutable instance."""
+        policy = parse_governance(self.test_cases_path / "valid_examples/real_world/kubernetes_pr_merge.gov")[0]
+        labels = {}
+        for phase in policy.phases:
+            for condition in phase.conditions:
+                for label in getattr(condition, "labels", ()):
+                    self.assertIs(labels.setdefault(label.name, label), label)
+        self.assertIs(labels["lgtm"], Label.intern("lgtm"))
+        self.assertIs(policy.phases[0].decision_type, policy.phases[2].decision_type)
+
+        self.assertEqual(Label("lgtm"), labels["lgtm"])
+        self.assertEqual({Label("lgtm"), Label("approved")}, {labels["approved"], labels["lgtm"]})
+        self.assertNotEqual(CommunicationChannel("Discord"), CommunicationChannel("Discord", "web"))
+        self.assertIs(pickle.loads(pickle.dumps(Label("lgtm"))), labels["lgtm"])
+        with self.assertRaises(AttributeError):
+            labels["lgtm"].name = "approved"
+
+        # Values no longer referenced are dropped from the intern table
+        label = Label.intern("unused-label")
+        self.assertIs(Label.intern("unused-label"), label)
+        unused = weakref.ref(label)
+        del label
+        gc.collect()
+        self.assertIsNone(unused())
+        self.assertNotIn((Label, ("unused-label",)), ValueElement._interned)
+        self.assertIs(Label.intern("lgtm"), labels["lgtm"])
+
+    def test_voting_policy_creation(self):
+        """Every policy type of the grammar, VotingPolicy included, builds its own class with its parameter."""
+        text = ("Scopes:\n Projects:\n  project\nParticipants:\n Roles: maintainers\n"
+                "VotingPolicy voting {\n Scope: project\n DecisionType as BooleanDecision\n"
+                " Participant list : maintainers\n Parameters:\n  ratio : 0.7\n}\n")
+        policy = parse_governance(text)[0]
+        self.assertIs(type(policy), VotingPolicy)
+        self.assertEqual((policy.ratio, policy.scope.name), (0.7, "project"))
+
+    def test_validate_collects_errors(self):
+        """Validation records every invalid value instead of raising the first one."""
+        path = self.test_cases_path / "invalid_examples/invalid_many_values.gov"
+        result = validate_governance(path)
+        self.assertFalse(result.ok)
+        self.assertEqual(result.counts(), {"InvalidValueException": 4, "InvalidParticipantException": 2,
+                                           "UndefinedAttributeException": 1})
+        self.assertEqual([issue.args for issue in result if issue.code == "InvalidParticipantException"], [(-1,), (0,)])
+        self.assertIn("InvalidValueException: ratio must be between 0 and 1, but got 1.5.", result.messages())
+        with self.assertRaises(InvalidValueException):
+            result.raise_first()
+
+        # Outside of validation, the first error is still raised
+        with self.assertRaises(InvalidValueException):
+            parse_governance(path)
+        with collect_errors() as collected:
+            Role(name="maintainers", vote_value=-1.0)
+        self.assertEqual(collected.counts(), {"InvalidValueException": 1})
+        with self.assertRaises(InvalidValueException):
+            Role(name="maintainers", vote_value=-1.0)
+
+        valid = validate_governance(self.test_cases_path / "valid_examples/basic_examples/majority_policy.gov")
+        self.assertTrue(valid.ok)
+
+        # Role assignments to undefined roles are all recorded, with the arguments they are raised with
+        text = ("Scopes:\n Projects:\n  project\nParticipants:\n Roles: maintainers\n Individuals: joe, ann\n"
+                "MajorityPolicy policy {\n Scope: project\n DecisionType as BooleanDecision\n"
+                " Participant list : joe as reviewers, ann as testers, maintainers\n}\n")
+        result = validate_governance(text)
+        self.assertEqual([(issue.code, issue.args) for issue in result],
+                         [("UndefinedAttributeException", ("role", None, "No role defined for this role assignment."))] * 2)
+        with self.assertRaises(UndefinedAttributeException):
+            parse_governance(text)
+
+        # Errors that were raised anyway keep the exception instead of constructor arguments
+        raised = InvalidValueException("ratio", 1.5)
+        result = ValidationResult()
+        result.add_exception(raised)
+        self.assertIsNone(result.issues[0].args)
+        self.assertIs(result.issues[0].exception(), raised)
+
     def test_invalid_appeal_inline_missing_blocks(self):
         """Inline AppealRight policy without required blocks should not parse cleanly."""
         with open(self.test_cases_path / "invalid_examples/invalid_appeal_inline_formatting.gov", "r") as file:
@@ -498,8 +697,8 @@ class testPolicyCreation(unittest.TestCase):
             # Verify vetoers set
             self.assertEqual(len(condition.vetoers), 2)
             po = next((v for v in condition.vetoers if v.name == "projectOwner"), None)
-            self.assertIsInstance(po, Individual)
-            self.assertEqual(po.name, "projectOwner")
+            # Declared participants are resolved to their objects
+            self.assertIs(po, projectOwner_role)
             # We check the default creation of individuals
             diego = next((v for v in condition.vetoers if v.name == "diego"), None)
             self.assertIsInstance(diego, Individual)
@@ -1,7 +1,6 @@
 from datetime import timedelta
 from enum import Enum
-from besser.BUML.metamodel.structural import Element
-from metamodel.governance import Task, StatusEnum, Project, Condition, EvaluationMode
+from metamodel.governance import ModelElement, ValueElement, Task, StatusEnum, Project, Condition, EvaluationMode
 from utils.exceptions import InvalidTimeConditionException
 
 class PatchAction(Enum):
@@ -14,52 +13,43 @@ class MemberAction(Enum):
     REMOVE = 2
     ALL = 3
 
-class Label(Element):
+class Label(ValueElement):
+    __slots__ = ('name',)
+    _fields = ('name',)
+    name: str
+
     def __init__(self, name: str):
         self.name = name
-    
-    @property
-    def name(self) -> str:
-        return self.__name
-    
-    @name.setter
-    def name(self, name: str):
-        self.__name = name
 
-class CHPElement(Element):
+class CHPElement(ModelElement):
     """Base class for code-hosting platform elements like PullRequest and Issue"""
+    __slots__ = ('name', 'labels')
+    name: str
+    labels: set[Label]
+
     def __init__(self, name: str, labels: set[Label] = None):
         self.name = name
         self.labels = labels
-    
-    @property
-    def name(self) -> str:
-        return self.__name
-    
-    @name.setter
-    def name(self, name: str):
-        self.__name = name
-        
-    @property
-    def labels(self):
-        return self.__labels
-    
-    @labels.setter
-    def labels(self, labels: set[Label]):
-        self.__labels = labels
 
 class PullRequest(CHPElement):
     """Represents a Pull Request in code-hosting platforms"""
+    __slots__ = ()
+
     def __init__(self, name: str, labels: set[Label] = None):
         super().__init__(name, labels)
 
 class Issue(CHPElement):
     """Represents an Issue in code-hosting platforms"""
+    __slots__ = ()
+
     def __init__(self, name: str, labels: set[Label] = None):
         super().__init__(name, labels)
 
 class Repository(Project):
     """Represents a code-hosting platform Repository"""
+    __slots__ = ('repo_id',)
+    repo_id: str
+
     def __init__(self, name: str, status: StatusEnum, repo_id: str):
         super().__init__(name, status)
         self.repo_id = repo_id
@@ -69,95 +59,55 @@ class Repository(Project):
         repo = cls(name=project.name, status=project.status, 
                         repo_id=repo_id)
         return repo
-    
-    @property
-    def repo_id(self) -> str:
-        return self.__repo_id
-    
-    @repo_id.setter
-    def repo_id(self, repo_id: str):
-        self.__repo_id = repo_id
 
 class MemberLifecycle(Task):
     """Represents the lifecycle of a member in a code-hosting platform"""
+    __slots__ = ('action',)
+    action: MemberAction
+
     def __init__(self, name: str, status: StatusEnum, action: MemberAction):
         super().__init__(name, status)
         self.action = action
-    
-    @property
-    def action(self) -> MemberAction:
-        return self.__action
-
-    @action.setter
-    def action(self, action: MemberAction):
-        self.__action = action
 
 class Patch(Task):
     """Represents an action (patch) that can be performed on a CHP element"""
+    __slots__ = ('action', 'element')
+    action: PatchAction
+    element: CHPElement
+
     def __init__(self, name: str, status: StatusEnum, action: PatchAction, element: CHPElement = None):
         super().__init__(name, status)
         self.action = action
         self.element = element
-    
-    @property
-    def action(self) -> PatchAction:
-        return self.__action
-    
-    @action.setter
-    def action(self, action: PatchAction):
-        self.__action = action
-    
-    @property
-    def element(self) -> CHPElement:
-        return self.__element
-    
-    @element.setter
-    def element(self, element: CHPElement):
-        self.__element = element
 
 class CheckCiCd(Condition):
     """Represents the condition of check CI/CD for a CHP element"""
+    __slots__ = ()
+
     def __init__(self, name: str, evaluation_mode: EvaluationMode):
         super().__init__(name, evaluation_mode)
 
 class LabelCondition(Condition):
     """Represents a condition based on labels for a CHP element"""
+    __slots__ = ('labels', 'inclusion')
+    labels: set[Label]
+    inclusion: bool
+
     def __init__(self, name: str, evaluation_mode: EvaluationMode, labels: set[Label], inclusion: bool = True):
         super().__init__(name, evaluation_mode)
         self.labels = labels
         self.inclusion = inclusion
-    
-    @property
-    def labels(self) -> set[Label]:
-        return self.__labels
-    
-    @labels.setter
-    def labels(self, labels: set[Label]):
-        self.__labels = labels
-
-    @property
-    def inclusion(self) -> bool:
-        return self.__inclusion
-    
-    @inclusion.setter
-    def inclusion(self, inclusion: bool):
-        self.__inclusion = inclusion
 
 class MinTime(Condition):
     """Represents the condition of minimum time of (in)activity"""
+    __slots__ = ('activity', '__offset')
+    activity: bool
+
     def __init__(self, name: str, evaluation_mode: EvaluationMode, activity: bool, offset: timedelta):
         super().__init__(name, evaluation_mode)
         self.activity = activity
         self.offset = offset
     
-    @property
-    def activity(self) -> bool:
-        return self.__activity
-    
-    @activity.setter
-    def activity(self, activity: bool):
-        self.__activity = activity
-    
     @property
     def offset(self) -> timedelta:
         return self.__offset
@@ -97,4 +97,35 @@ class DuplicateAttributeException(Exception):
         super().__init__(self.message)
 
     def __str__(self):
-        return f"Element {self.context_type}, name '{self.context_name}' -> {self.message}"
\ No newline at end of file
+        return f"Element {self.context_type}, name '{self.context_name}' -> {self.message}"
+
+class InvalidSyntaxException(Exception):
+    """Exception raised when the parser reports a syntax error in a governance document."""
+    def __init__(self, error_message: str, symbol: str = None):
+        self.error_message = error_message
+        self.symbol = symbol
+        self.message = "Syntax error in governance document."
+        super().__init__(self.message)
+
+    def __str__(self):
+        return f'{self.error_message} -> {self.message}'
+
+class CyclicReferenceException(Exception):
+    """Exception raised when policies refer to each other (as phases, default, fallback or appeal policies) in a cycle."""
+    def __init__(self, cycle: list[str]):
+        self.cycle = cycle
+        self.message = "Policies cannot refer to each other in a cycle."
+        super().__init__(self.message)
+
+    def __str__(self):
+        return f"{' -> '.join(self.cycle)} -> {self.message}"
+
+class CyclicImportException(Exception):
+    """Exception raised when governance documents import each other in a cycle."""
+    def __init__(self, cycle: list[str]):
+        self.cycle = cycle
+        self.message = "Documents cannot import each other in a cycle."
+        super().__init__(self.message)
+
+    def __str__(self):
+        return f"{' -> '.join(self.cycle)} -> {self.message}"
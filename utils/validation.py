@@ -0,0 +1,107 @@
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+class ValidationIssue:
+    """
+    A validation error recorded instead of raised: the exception type and the arguments it
+    would have been raised with. The exception, and so its message, is only created on demand.
+
+    Errors that were raised anyway (see ValidationResult.add_exception) keep the exception
+    itself instead: their args is None, as the arguments of its constructor are not known.
+    """
+    __slots__ = ("error_type", "args", "_exception")
+
+    def __init__(self, error_type: type, args: tuple | None, exception: Exception = None):
+        self.error_type = error_type
+        self.args = args
+        self._exception = exception
+
+    @property
+    def code(self) -> str:
+        return self.error_type.__name__
+
+    def exception(self) -> Exception:
+        if self._exception is None:
+            self._exception = self.error_type(*self.args)
+        return self._exception
+
+    @property
+    def message(self) -> str:
+        return str(self.exception())
+
+    def __str__(self):
+        return f"{self.code}: {self.message}"
+
+
+class ValidationResult:
+    """
+    The validation errors recorded while collect_errors() was active, in the order they were
+    found. Errors that were raised anyway (because construction could not go on) can be added
+    with add_exception.
+    """
+    def __init__(self):
+        self.issues = []
+
+    def add(self, error_type: type, *args):
+        self.issues.append(ValidationIssue(error_type, args))
+
+    def add_exception(self, e: Exception):
+        self.issues.append(ValidationIssue(type(e), None, e))
+
+    @property
+    def ok(self) -> bool:
+        return not self.issues
+
+    def counts(self) -> Counter:
+        """Number of errors per code (exception type name)."""
+        return Counter(issue.code for issue in self.issues)
+
+    def messages(self) -> list[str]:
+        return [str(issue) for issue in self.issues]
+
+    def raise_first(self):
+        """Raises the first recorded error, if any."""
+        if self.issues:
+            raise self.issues[0].exception()
+
+    def __len__(self):
+        return len(self.issues)
+
+    def __iter__(self):
+        return iter(self.issues)
+
+
+_collector: ContextVar[ValidationResult | None] = ContextVar("validation_collector", default=None)
+
+
+@contextmanager
+def collect_errors(result: ValidationResult = None):
+    """
+    Records the validation errors of the metamodel and of the policy creation listener in a
+    ValidationResult instead of raising them, for as long as the context is active. The invalid
+    values are kept (or the offending reference skipped), so construction carries on.
+
+    Usage:
+        with collect_errors() as result:
+            ...
+        result.counts()
+    """
+    result = result if result is not None else ValidationResult()
+    token = _collector.set(result)
+    try:
+        yield result
+    finally:
+        _collector.reset(token)
+
+
+def report(error_type: type, *args):
+    """
+    Raises error_type(*args), or records it if collect_errors() is active. Callers must be able
+    to carry on when this returns.
+    """
+    result = _collector.get()
+    if result is None:
+        raise error_type(*args)
+    result.add(error_type, *args)